@@ -0,0 +1,4 @@
+"""Microbenchmarks for hot paths.
+
+Run from the agent directory, e.g. ``python -m benchmarks.run_summary``.
+"""
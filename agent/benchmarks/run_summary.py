@@ -0,0 +1,102 @@
+"""Benchmark run post-processing against the previous inline code.
+
+The old code walked all_messages() (replayed history included) with
+hasattr checks and compiled the handoff pattern on every call. Both
+versions are timed on a synthetic run with a long history.
+
+Usage:
+    python -m benchmarks.run_summary [--history 20] [--number 20000]
+"""
+
+import argparse
+import re
+import timeit
+from typing import Optional
+
+from pydantic_ai.messages import (
+    ModelRequest,
+    ModelResponse,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+
+from core.run_summary import summarize_run
+
+
+class _Usage:
+    total_tokens = 900
+    cache_read_tokens = 600
+
+
+class SyntheticResult:
+    """Run result with `history` prior turns and one tool round."""
+
+    def __init__(self, history: int, output: str):
+        self.output = output
+        self._history = []
+        for i in range(history):
+            self._history.append(ModelRequest(parts=[UserPromptPart(content=f"question {i}")]))
+            self._history.append(ModelResponse(parts=[TextPart(content=f"answer {i} " * 20)]))
+        self._new = [
+            ModelRequest(parts=[UserPromptPart(content="Tell me about your apps")]),
+            ModelResponse(parts=[ToolCallPart(tool_name="search_knowledge_base", args={"query": "apps"}, tool_call_id="c1")]),
+            ModelRequest(parts=[ToolReturnPart(tool_name="search_knowledge_base", content="results " * 100, tool_call_id="c1")]),
+            ModelResponse(parts=[TextPart(content=output)]),
+        ]
+
+    def usage(self):
+        return _Usage()
+
+    def all_messages(self):
+        return self._history + self._new
+
+    def new_messages(self):
+        return self._new
+
+
+def legacy_summary(result) -> tuple[str, Optional[str], list[str], int]:
+    """The code respond() used before core.run_summary."""
+    usage = result.usage()
+    tools_called = []
+    for call in result.all_messages():
+        if hasattr(call, "parts"):
+            for part in call.parts:
+                if hasattr(part, "tool_name"):
+                    tools_called.append(part.tool_name)
+
+    pattern = r"\[HANDOFF_SUMMARY\](.*?)\[/HANDOFF_SUMMARY\]"
+    match = re.search(pattern, result.output, re.DOTALL)
+    if match:
+        summary = match.group(1).strip()
+        cleaned = re.sub(pattern, "", result.output, flags=re.DOTALL).strip()
+    else:
+        cleaned, summary = result.output, None
+    return cleaned, summary, tools_called, usage.total_tokens
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history", type=int, default=20, help="Prior turns in the run")
+    parser.add_argument("--number", type=int, default=20000, help="Calls per measurement")
+    args = parser.parse_args()
+
+    outputs = {
+        "plain": "Spending Insights tracks where your money goes. " * 5,
+        "handoff": "Perfect! Want me to pass this to the team?\n\n[HANDOFF_SUMMARY]Gym phone app[/HANDOFF_SUMMARY]",
+    }
+    for label, output in outputs.items():
+        result = SyntheticResult(args.history, output)
+        legacy = min(timeit.repeat(lambda: legacy_summary(result), number=args.number, repeat=5))
+        current = min(timeit.repeat(lambda: summarize_run(result), number=args.number, repeat=5))
+        per_call = 1e6 / args.number
+        print(
+            f"{label:8} legacy {legacy * per_call:7.2f}us  "
+            f"summarize_run {current * per_call:7.2f}us  "
+            f"({legacy / current:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
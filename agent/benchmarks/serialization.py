@@ -0,0 +1,122 @@
+"""Benchmark model construction and JSON encoding on the request path.
+
+Compares, per call:
+
+- validated constructors against model_construct() for the models built
+  on every request (pydantic-core validates in Rust; model_construct runs
+  in Python and is slower for these small models)
+- FastAPI's response_model serialization against an ORJSONResponse
+  response class
+- a tool return carried as a KnowledgeResult (re-encoded for every model
+  request in the run) against one serialized once
+- WebSocket events encoded with json.dumps against core.serialization
+
+Usage:
+    python -m benchmarks.serialization [--number 20000] [--requests 3]
+"""
+
+import argparse
+import asyncio
+import json
+import timeit
+import warnings
+
+from fastapi.responses import ORJSONResponse, Response
+from fastapi.routing import serialize_response
+from pydantic_ai.messages import ToolReturnPart
+
+from core.serialization import dumps
+from features.knowledge.models import KnowledgeResult, SearchResultItem
+from main import ChatResponse, LeadResponse, app
+
+
+ITEM = {
+    "title": "Spending Insights",
+    "content": "Track where your money goes with automatic categorisation. " * 5,
+    "relevance": "Matched on app name/description (score: 92)",
+    "source": "apps/spending-insights",
+    "score": 92.0,
+}
+CHAT = {
+    "response": "Spending Insights tracks where your money goes. " * 5,
+    "tokens_used": 900,
+    "cached_tokens": 600,
+    "tools_called": ["search_knowledge_base"],
+}
+LEAD = {"success": True, "reference_id": "SIPH-1A2B3C4D", "message": "Thanks! Your information has been saved."}
+
+
+def _per_call(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) * 1e6 / number
+
+
+def _row(label: str, before: float, after: float) -> None:
+    print(f"{label:34} {before:8.2f}us -> {after:8.2f}us  ({before / after:.1f}x)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000, help="Calls per measurement")
+    parser.add_argument("--requests", type=int, default=3, help="Model requests per run after the tool call")
+    args = parser.parse_args()
+    n = args.number
+
+    print("Construction: model_construct -> validated")
+    for label, model, data in (
+        ("SearchResultItem", SearchResultItem, ITEM),
+        ("ChatResponse", ChatResponse, CHAT),
+        ("LeadResponse", LeadResponse, LEAD),
+    ):
+        _row(label, _per_call(lambda: model.model_construct(**data), n), _per_call(lambda: model(**data), n))
+
+    print("\nResponse encoding: ORJSONResponse class -> response_model (pydantic-core)")
+    field = next(route.response_field for route in app.routes if getattr(route, "path", "") == "/chat")
+    chat = ChatResponse(**CHAT)
+    loop = asyncio.new_event_loop()
+
+    async def orjson_class():
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # Deprecated by FastAPI for this reason
+            return ORJSONResponse(await serialize_response(field=field, response_content=chat))
+
+    async def response_model():
+        body = await serialize_response(field=field, response_content=chat, dump_json=True)
+        return Response(body, media_type="application/json")
+
+    baseline = _per_call(lambda: loop.run_until_complete(asyncio.sleep(0)), n)
+    _row(
+        "/chat response",
+        _per_call(lambda: loop.run_until_complete(orjson_class()), n) - baseline,
+        _per_call(lambda: loop.run_until_complete(response_model()), n) - baseline,
+    )
+
+    print(f"\nTool return across {args.requests} model requests: model object -> serialized once")
+    result = KnowledgeResult(found=True, category="all", results=[SearchResultItem(**ITEM)] * 5, query="apps")
+    as_model = ToolReturnPart(tool_name="search_knowledge_base", content=result, tool_call_id="c1")
+
+    def serialized_once():
+        part = ToolReturnPart(tool_name="search_knowledge_base", content=result.model_dump_json(), tool_call_id="c1")
+        for _ in range(args.requests):
+            part.model_response_str()
+
+    def reencoded():
+        for _ in range(args.requests):
+            as_model.model_response_str()
+
+    _row("search_knowledge_base output", _per_call(reencoded, n), _per_call(serialized_once, n))
+
+    print("\nWebSocket events: json.dumps -> core.serialization.dumps")
+    _row(
+        "done event",
+        _per_call(lambda: json.dumps({"type": "done", "branch": "x", **chat.model_dump(mode="json")}), n),
+        _per_call(lambda: dumps({"type": "done", "branch": "x", **chat.model_dump()}), n),
+    )
+    _row(
+        "delta event",
+        _per_call(lambda: json.dumps({"type": "delta", "text": "Spending Insights "}), n),
+        _per_call(lambda: dumps({"type": "delta", "text": "Spending Insights "}), n),
+    )
+
+
+if __name__ == "__main__":
+    main()
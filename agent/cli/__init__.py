@@ -0,0 +1,4 @@
+"""Command-line tools for Siphio AI Agent.
+
+Run from the agent directory, e.g. ``python -m cli.replay --help``.
+"""
@@ -0,0 +1,44 @@
+"""Move leads past the retention window into the partitioned archive.
+
+Usage:
+    python -m cli.archive_leads
+    python -m cli.archive_leads --retention-days 180 --batch-size 10000
+
+Meant to run on a schedule, e.g. daily from cron:
+    0 3 * * * cd /srv/agent && python -m cli.archive_leads
+
+Requires the leads_archive migration. Each batch is a separate
+transaction, so an interrupted run can simply be started again.
+"""
+
+import argparse
+import sys
+from typing import Optional
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from core.config import settings
+    from features.leads.retention import archive_old_leads
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--retention-days", type=int, default=settings.LEAD_RETENTION_DAYS,
+        help="Archive leads created more than this many days ago",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.LEAD_ARCHIVE_BATCH_SIZE,
+        help="Leads moved per transaction",
+    )
+    parser.add_argument("--max-batches", type=int, help="Stop after this many batches")
+    args = parser.parse_args(argv)
+
+    try:
+        archive_old_leads(args.retention_days, args.batch_size, args.max_batches)
+    except Exception as e:
+        print(f"Archival failed: {type(e).__name__}: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
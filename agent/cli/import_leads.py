@@ -0,0 +1,71 @@
+"""Import leads from a CSV or JSONL file.
+
+Usage:
+    python -m cli.import_leads partners.csv
+    python -m cli.import_leads event.jsonl --rejects rejects.jsonl --batch-size 1000
+    python -m cli.import_leads partners.csv --dry-run
+
+Columns (CSV header or JSON keys): name, email, and optionally
+conversation_summary and inquiry_type. The file is streamed a batch at a
+time, so memory use does not grow with its size. Rows that fail
+validation, repeat an email within the file or match a lead captured in
+the last 24 hours are written to the rejects file (JSONL, one record per
+row with its line number and reason) as they are found.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Optional
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from core.config import settings
+    from features.leads.importer import import_leads, read_rows
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", type=Path, help="CSV or JSONL file of leads")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Input format (default: from the suffix)")
+    parser.add_argument(
+        "--rejects", type=Path,
+        help="JSONL reject report (default: <input>.rejects.jsonl; '-' for stdout)",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.LEAD_IMPORT_BATCH_SIZE,
+        help="Rows validated and inserted together",
+    )
+    parser.add_argument(
+        "--summary", default=None,
+        help="conversation_summary for rows without one (default: 'Imported from <file>')",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Validate and dedup without inserting")
+    args = parser.parse_args(argv)
+
+    rejects_path = args.rejects or args.input.with_name(args.input.name + ".rejects.jsonl")
+    out = sys.stdout if str(rejects_path) == "-" else open(rejects_path, "w", encoding="utf-8")
+    try:
+        stats = import_leads(
+            read_rows(args.input, args.format),
+            on_reject=lambda record: out.write(json.dumps(record) + "\n"),
+            batch_size=args.batch_size,
+            default_summary=args.summary or f"Imported from {args.input.name}",
+            dry_run=args.dry_run,
+        )
+    except Exception as e:
+        print(f"Import failed: {type(e).__name__}: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    verb = "Would import" if args.dry_run else "Imported"
+    print(
+        f"{verb} {stats.imported} of {stats.read} rows, {stats.rejected} rejected",
+        file=sys.stderr,
+    )
+    return 1 if stats.rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
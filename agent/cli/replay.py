@@ -0,0 +1,148 @@
+"""Replay recorded conversations and write per-turn results as JSONL.
+
+Usage:
+    python -m cli.replay conversations.jsonl -o results.jsonl
+    python -m cli.replay conversations.jsonl -o results.jsonl \\
+        --url http://localhost:8000 --admin-key $ADMIN_API_KEY
+
+Runs in-process by default; with --url the file is streamed to a running
+agent's /chat/batch endpoint instead. Re-running with the same output file
+resumes: conversations that already have a summary line are skipped and
+lines from unfinished conversations are discarded and replayed.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+
+def load_checkpoint(output: Path) -> set[str]:
+    """
+    Keep only fully replayed conversations in the output file.
+
+    Returns:
+        IDs of conversations that are already complete
+    """
+    if not output.exists():
+        return set()
+
+    completed: set[str] = set()
+    with open(output, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("type") == "conversation":
+                completed.add(record["conversation_id"])
+
+    # Drop partial results so resumed conversations aren't duplicated
+    tmp = output.with_suffix(output.suffix + ".tmp")
+    with open(output, "r", encoding="utf-8") as src, open(tmp, "w", encoding="utf-8") as dst:
+        for line in src:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("conversation_id") in completed:
+                dst.write(line)
+    os.replace(tmp, output)
+
+    return completed
+
+
+async def pending_lines(path: Path, completed: set[str]) -> AsyncIterator[str]:
+    """Stream input lines, skipping conversations already in the checkpoint."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if completed and line.strip():
+                try:
+                    if json.loads(line).get("id") in completed:
+                        continue
+                except json.JSONDecodeError:
+                    pass  # Reported as an error line by the runner
+            yield line
+
+
+async def replay_local(lines: AsyncIterator[str], concurrency: int) -> AsyncIterator[str]:
+    """Replay through the in-process chat pipeline."""
+    from features.replay import replay_conversations
+    from main import replay_turn
+
+    async for line in replay_conversations(lines, replay_turn, concurrency):
+        yield line
+
+
+async def replay_remote(
+    lines: AsyncIterator[str],
+    url: str,
+    admin_key: str,
+    concurrency: int,
+) -> AsyncIterator[str]:
+    """Replay through a running agent's /chat/batch endpoint."""
+    import httpx
+
+    async def body() -> AsyncIterator[bytes]:
+        async for line in lines:
+            yield line.encode("utf-8") if line.endswith("\n") else (line + "\n").encode("utf-8")
+
+    async with httpx.AsyncClient(timeout=None) as client:
+        async with client.stream(
+            "POST",
+            f"{url.rstrip('/')}/chat/batch",
+            params={"concurrency": concurrency},
+            headers={"X-Admin-Key": admin_key, "Content-Type": "application/x-ndjson"},
+            content=body(),
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line:
+                    yield line
+
+
+async def run(args: argparse.Namespace) -> int:
+    completed = load_checkpoint(args.output)
+    if completed:
+        print(f"Resuming: {len(completed)} conversations already replayed", file=sys.stderr)
+
+    lines = pending_lines(args.input, completed)
+    if args.url:
+        results = replay_remote(lines, args.url, args.admin_key or "", args.concurrency)
+    else:
+        results = replay_local(lines, args.concurrency)
+
+    turns = conversations = errors = 0
+    with open(args.output, "a", encoding="utf-8") as out:
+        async for line in results:
+            out.write(line + "\n")
+            record = json.loads(line)
+            if record.get("type") == "turn":
+                turns += 1
+                errors += record.get("error") is not None
+            elif record.get("type") == "conversation":
+                conversations += 1
+                out.flush()  # Checkpoint boundary
+            else:
+                errors += 1
+
+    print(f"Replayed {conversations} conversations, {turns} turns, {errors} errors", file=sys.stderr)
+    return 1 if errors else 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", type=Path, help="JSONL file of recorded conversations")
+    parser.add_argument("-o", "--output", type=Path, required=True, help="JSONL results file")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="Conversations in parallel")
+    parser.add_argument("--url", help="Replay through a running agent instead of in-process")
+    parser.add_argument("--admin-key", default=os.environ.get("ADMIN_API_KEY"), help="Admin key for --url")
+    args = parser.parse_args(argv)
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,14 @@
 """Core infrastructure for Siphio AI Agent."""
 
 from .config import settings
-from .agent import agent
 from .prompts import SYSTEM_PROMPT
 
 __all__ = ["settings", "agent", "SYSTEM_PROMPT"]
+
+
+def __getattr__(name: str):
+    # The agent is heavy to import and build; only do it when first accessed
+    if name == "agent":
+        from .agent import get_agent
+        return get_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,138 @@
+"""Admission control for outbound LLM calls.
+
+Caps the number of in-flight model requests and holds excess callers in a
+bounded FIFO queue with a deadline. When the queue is full (or a caller
+waits past its deadline) the call is rejected immediately so the API can
+answer 503 + Retry-After instead of piling more load onto the provider.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from .metrics import metrics
+
+
+class AdmissionRejected(Exception):
+    """Raised when a call cannot be admitted."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Admission rejected ({reason})")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Async semaphore with a bounded wait queue and queue deadline."""
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        queue_timeout: float,
+        name: str = "llm",
+    ):
+        """
+        Args:
+            max_concurrency: Maximum calls running at once
+            max_queue: Maximum callers waiting for a slot
+            queue_timeout: Seconds a caller may wait before being rejected
+            name: Metric name prefix
+        """
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.name = name
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def _update_gauges(self) -> None:
+        metrics.set_gauge(f"{self.name}_in_flight", self._in_flight)
+        metrics.set_gauge(f"{self.name}_queue_depth", len(self._waiters))
+
+    def retry_after(self) -> int:
+        """Estimate seconds until a slot frees up, from observed hold times."""
+        held = metrics.summary(f"{self.name}_hold_seconds")
+        mean_hold = held.mean if held else 1.0
+        waves = (len(self._waiters) + 1) / max(1, self.max_concurrency)
+        return max(1, math.ceil(mean_hold * waves))
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        metrics.incr(f"{self.name}_admission_rejected_total", reason=reason)
+        return AdmissionRejected(reason, self.retry_after())
+
+    async def _acquire(self) -> None:
+        if self._in_flight < self.max_concurrency and not self._waiters:
+            self._in_flight += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            raise self._reject("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._update_gauges()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was handed over just as we gave up: pass it on
+                self._release()
+            else:
+                waiter.cancel()
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            self._update_gauges()
+            if isinstance(e, asyncio.TimeoutError):
+                raise self._reject("queue_timeout") from None
+            raise
+
+    def _release(self) -> None:
+        # Hand the slot directly to the next live waiter (FIFO)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._in_flight -= 1
+
+    def try_acquire(self) -> bool:
+        """Take a slot only if one is free right now (never queues)."""
+        if self._in_flight >= self.max_concurrency or self._waiters:
+            return False
+        self._in_flight += 1
+        self._update_gauges()
+        return True
+
+    def release(self) -> None:
+        """Return a slot taken with try_acquire()."""
+        self._release()
+        self._update_gauges()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one concurrency slot for the duration of the block."""
+        queued_at = time.perf_counter()
+        await self._acquire()
+        admitted_at = time.perf_counter()
+        metrics.observe(f"{self.name}_queue_wait_seconds", admitted_at - queued_at)
+        self._update_gauges()
+        try:
+            yield
+        finally:
+            metrics.observe(f"{self.name}_hold_seconds", time.perf_counter() - admitted_at)
+            self._release()
+            self._update_gauges()
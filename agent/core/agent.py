@@ -1,38 +1,136 @@
-"""Pydantic AI agent configuration."""
+"""Pydantic AI agent configuration.
 
-from pydantic_ai import Agent
-from pydantic_ai.models.openrouter import OpenRouterModel
-from pydantic_ai.providers.openrouter import OpenRouterProvider
+Agents are kept per model tier: FULL runs OPENROUTER_MODEL for open-ended
+questions, FAST runs OPENROUTER_FAST_MODEL for turns whose wording is
+dictated by an instruction. Both share the system prompt and tools so the
+cached prompt prefix is the same. Without a fast model configured, FAST
+resolves to FULL and both get the same agent.
+
+Agents, their OpenRouter provider and HTTP client are built on first use
+by get_agent() rather than at import time: pydantic-ai and the OpenAI SDK
+it pulls in dominate the import cost of the whole process. The app's
+lifespan hook (and serve.py, before forking) calls warm_agents() during
+startup so the first request doesn't pay for it.
+"""
+
+import threading
+from enum import Enum
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
 from .config import settings
+from .http import get_async_client
 from .prompts import SYSTEM_PROMPT
 
+if TYPE_CHECKING:
+    from pydantic_ai import Agent
+    from pydantic_ai.messages import ModelMessage
+
+
+class ModelTier(str, Enum):
+    """Which configured model answers a turn."""
+
+    FAST = "fast"  # tightly instructed one-liners
+    FULL = "full"  # open-ended questions and tool use
+
+
+def resolve_tier(tier: ModelTier) -> ModelTier:
+    """The tier that actually answers (FAST is FULL without OPENROUTER_FAST_MODEL)."""
+    if tier == ModelTier.FAST and not settings.OPENROUTER_FAST_MODEL:
+        return ModelTier.FULL
+    return tier
+
+
+def model_name(tier: ModelTier) -> str:
+    """OpenRouter model id for a tier (FAST falls back to the full model)."""
+    if resolve_tier(tier) == ModelTier.FAST:
+        return settings.OPENROUTER_FAST_MODEL
+    return settings.OPENROUTER_MODEL
+
+
+_agents: dict[ModelTier, "Agent"] = {}
+_agent_lock = threading.Lock()
+
+
+def build_agent(model_id: str) -> "Agent":
+    """Create an agent for model_id and register the feature-slice tools."""
+    from pydantic_ai import Agent
+    from pydantic_ai.models.openrouter import OpenRouterModel
+    from pydantic_ai.providers.openrouter import OpenRouterProvider
+
+    # Initialize OpenRouter provider
+    provider = OpenRouterProvider(
+        api_key=settings.OPENROUTER_API_KEY,
+        app_title="Siphio Assistant",
+        http_client=get_async_client(),
+    )
+
+    # Initialize model
+    model = OpenRouterModel(
+        model_id,
+        provider=provider,
+    )
+
+    # Create agent
+    agent = Agent(
+        model,
+        system_prompt=SYSTEM_PROMPT,
+        retries=2,
+    )
+
+    # Register tools from feature slices
+
+    # Knowledge base search - answers questions about Siphio apps, services, blog, company
+    from features.knowledge.tool import search_knowledge_base
+
+    agent.tool(search_knowledge_base)
+
+    # NOTE: capture_lead tool is DISABLED - leads are now captured via the frontend form
+    # The agent uses [HANDOFF_SUMMARY] markers to trigger the form instead
+    # from features.leads.tool import capture_lead
+    # agent.tool(capture_lead)
+
+    return agent
+
+
+@lru_cache(maxsize=None)
+def system_prefix() -> tuple["ModelMessage", ...]:
+    """
+    The system prompt as a leading history message, built once per process.
+
+    pydantic-ai only sends the agent's system prompt when message_history is
+    empty, so follow-up turns would otherwise go out without it. Prepending
+    this one message to every non-empty history keeps each request starting
+    with the same system prompt and tool definitions (tool schemas are
+    generated once, when build_agent() registers them), which is the prefix
+    OpenRouter's prompt caching matches on.
+    """
+    from pydantic_ai.messages import ModelRequest, SystemPromptPart
+
+    return (ModelRequest(parts=[SystemPromptPart(content=SYSTEM_PROMPT)]),)
 
-# Initialize OpenRouter provider
-provider = OpenRouterProvider(
-    api_key=settings.OPENROUTER_API_KEY,
-    app_title="Siphio Assistant",
-)
 
-# Initialize model
-model = OpenRouterModel(
-    settings.OPENROUTER_MODEL,
-    provider=provider,
-)
+def get_agent(tier: ModelTier = ModelTier.FULL) -> "Agent":
+    """Return the process-wide agent for a tier, building it on first call."""
+    tier = resolve_tier(tier)
+    agent = _agents.get(tier)
+    if agent is None:
+        with _agent_lock:
+            agent = _agents.get(tier)
+            if agent is None:
+                agent = build_agent(model_name(tier))
+                _agents[tier] = agent
+    return agent
 
-# Create agent
-agent = Agent(
-    model,
-    system_prompt=SYSTEM_PROMPT,
-    retries=2,
-)
 
-# Register tools from feature slices
-# Tool registration happens via @agent.tool decorator when imported
+def warm_agents() -> None:
+    """Build every configured tier's agent ahead of the first request."""
+    for tier in dict.fromkeys(resolve_tier(tier) for tier in ModelTier):
+        get_agent(tier)
 
-# Knowledge base search - answers questions about Siphio apps, services, blog, company
-from features.knowledge.tool import search_knowledge_base  # noqa: F401, E402
 
-# NOTE: capture_lead tool is DISABLED - leads are now captured via the frontend form
-# The agent uses [HANDOFF_SUMMARY] markers to trigger the form instead
-# from features.leads.tool import capture_lead  # noqa: F401, E402
+def __getattr__(name: str):
+    # Keeps `from core.agent import agent` working without an eager build
+    if name == "agent":
+        return get_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
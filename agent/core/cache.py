@@ -0,0 +1,242 @@
+"""Pluggable cache backends.
+
+Every in-process cache is duplicated (and cold) in each uvicorn worker.
+Callers go through get_cache(), which returns the backend chosen by
+CACHE_BACKEND:
+
+- "memory": LRU dict with per-entry TTL, private to the worker.
+- "sqlite": WAL-mode SQLite file that every worker on the host shares.
+
+Values must be JSON-serializable so both backends behave the same. The
+memory backend keeps the objects themselves, so a hit costs no decoding:
+callers must treat what they set and get as read-only. The SQLite backend
+blocks on disk I/O and locks, so async code uses get_async() and
+set_async(), which run it in a worker thread.
+
+Keys are namespaced by a "<namespace>:" prefix, which is also the label
+on the hit/miss metrics.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+
+from .metrics import metrics
+
+
+def _namespace(key: str) -> str:
+    return key.split(":", 1)[0] if ":" in key else "default"
+
+
+class CacheBackend(ABC):
+    """Key/value cache with TTL and a size bound."""
+
+    # Whether calls block on I/O (and should be kept off the event loop)
+    blocking: bool = False
+
+    def __init__(self, max_entries: int, default_ttl: float):
+        """
+        Args:
+            max_entries: Entries kept before least-recently-used ones are evicted
+            default_ttl: Seconds an entry lives when set() gets no ttl
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        value = self._get(key, time.time())
+        metrics.incr(
+            "cache_hits_total" if value is not None else "cache_misses_total",
+            namespace=_namespace(key),
+        )
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value under key for ttl seconds (default_ttl if omitted)."""
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        now = time.time()
+        self._set(key, value, now + ttl, now)
+
+    async def get_async(self, key: str) -> Optional[Any]:
+        """get() from async code, in a worker thread when the backend blocks."""
+        if self.blocking:
+            return await asyncio.to_thread(self.get, key)
+        return self.get(key)
+
+    async def set_async(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """set() from async code, in a worker thread when the backend blocks."""
+        if self.blocking:
+            await asyncio.to_thread(self.set, key, value, ttl)
+        else:
+            self.set(key, value, ttl)
+
+    @abstractmethod
+    def _get(self, key: str, now: float) -> Optional[Any]:
+        """Backend lookup."""
+
+    @abstractmethod
+    def _set(self, key: str, value: Any, expires_at: float, now: float) -> None:
+        """Backend store."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove key if present."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry."""
+
+
+class MemoryCache(CacheBackend):
+    """Worker-local LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 10000, default_ttl: float = 300):
+        super().__init__(max_entries, default_ttl)
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: str, now: float) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key: str, value: Any, expires_at: float, now: float) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                metrics.incr("cache_evictions_total")
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache(CacheBackend):
+    """File-backed cache shared by all workers on the same host."""
+
+    # Trim expired and over-limit rows once every N writes
+    CLEANUP_EVERY = 500
+    blocking = True
+
+    def __init__(self, path: str, max_entries: int = 10000, default_ttl: float = 300):
+        super().__init__(max_entries, default_ttl)
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+        # A forked worker must open its own connection, never reuse the parent's
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+
+    def _reset_after_fork(self) -> None:
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _get(self, key: str, now: float) -> Optional[Any]:
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT value FROM cache WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def _set(self, key: str, value: Any, expires_at: float, now: float) -> None:
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), expires_at, now),
+        )
+        self._writes += 1
+        if self._writes % self.CLEANUP_EVERY == 0:
+            self.cleanup(now)
+
+    def cleanup(self, now: Optional[float] = None) -> None:
+        """Drop expired rows, then least-recently-used rows beyond max_entries."""
+        now = time.time() if now is None else now
+        conn = self._connect()
+        conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+        evicted = conn.execute(
+            "DELETE FROM cache WHERE key IN ("
+            " SELECT key FROM cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        ).rowcount
+        if evicted > 0:
+            metrics.incr("cache_evictions_total", evicted)
+
+    def delete(self, key: str) -> None:
+        self._connect().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM cache")
+
+
+def build_cache(settings) -> CacheBackend:
+    """Create the cache backend configured by Settings."""
+    if settings.CACHE_BACKEND == "sqlite":
+        return SQLiteCache(
+            settings.CACHE_SQLITE_PATH,
+            max_entries=settings.CACHE_MAX_ENTRIES,
+            default_ttl=settings.CACHE_DEFAULT_TTL_SECONDS,
+        )
+    return MemoryCache(
+        max_entries=settings.CACHE_MAX_ENTRIES,
+        default_ttl=settings.CACHE_DEFAULT_TTL_SECONDS,
+    )
+
+
+_backend: Optional[CacheBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_cache() -> CacheBackend:
+    """Process-wide cache backend (created on first use)."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                from .config import settings
+
+                _backend = build_cache(settings)
+    return _backend
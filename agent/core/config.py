@@ -9,17 +9,127 @@ class Settings(BaseSettings):
     # OpenRouter Configuration
     OPENROUTER_API_KEY: str
     OPENROUTER_MODEL: str = "x-ai/grok-4.1-fast"
+    # Cheaper model for tightly instructed turns; empty = use OPENROUTER_MODEL
+    OPENROUTER_FAST_MODEL: str = ""
 
     # Server Configuration
     AGENT_PORT: int = 8000
+    AGENT_HOST: str = "0.0.0.0"
+    AGENT_WORKERS: int = 0  # serve.py worker processes; 0 = one per core
+    SHUTDOWN_GRACE_SECONDS: float = 30.0  # drain time for in-flight requests on SIGTERM
 
-    # Rate Limiting
+    # LLM Admission Control
+    LLM_MAX_CONCURRENCY: int = 32
+    LLM_MAX_QUEUE: int = 64
+    LLM_QUEUE_TIMEOUT_SECONDS: float = 10.0
+
+    # LLM Deadlines, Hedging and Circuit Breaker
+    LLM_ATTEMPT_TIMEOUT_SECONDS: float = 20.0
+    LLM_TOTAL_TIMEOUT_SECONDS: float = 45.0
+    LLM_MAX_ATTEMPTS: int = 2
+    LLM_HEDGING_ENABLED: bool = False  # fire a second request once p95 latency passes
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    LLM_CIRCUIT_RESET_SECONDS: float = 30.0
+
+    # Deterministic fast path for simple informational questions
+    FAST_PATH_ENABLED: bool = True
+    FAST_PATH_MIN_SCORE: float = 85.0
+
+    # Search informational questions up front and send results with the turn
+    KNOWLEDGE_PREFETCH_ENABLED: bool = True
+    KNOWLEDGE_PREFETCH_MAX_RESULTS: int = 3
+    # Approximate tokens of knowledge results sent to the model per search;
+    # 0 sends the tool's full JSON result
+    KNOWLEDGE_TOOL_TOKEN_BUDGET: int = 600
+
+    # Canned replies for app-building questions the model would only reword
+    RESPONSE_TEMPLATES_ENABLED: bool = True
+
+    # Conversation transcripts (buffered, flushed to the conversations table)
+    TRANSCRIPTS_ENABLED: bool = True
+    TRANSCRIPT_BUFFER_SIZE: int = 10000  # turns held in memory; oldest dropped beyond this
+    TRANSCRIPT_BATCH_SIZE: int = 200
+    TRANSCRIPT_FLUSH_SECONDS: float = 5.0
+    TRANSCRIPT_SPOOL_DIR: str = "/tmp/siphio-transcripts"  # gzip JSONL when the DB is down
+    # Keys the client_id HMAC; empty = SESSION_SIGNING_KEY, else a random key per
+    # process (ids then don't match across restarts)
+    TRANSCRIPT_HASH_KEY: str = ""
+
+    # WebSocket chat (/ws/chat)
+    WS_MAX_HISTORY_MESSAGES: int = 40  # server-held messages per connection
+    WS_IDLE_TIMEOUT_SECONDS: float = 300.0
+
+    # Batch replay (/chat/batch and cli.replay)
+    BATCH_MAX_CONCURRENCY: int = 4
+
+    # Rate Limiting (keyed by X-Session-Id header, else client IP)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_REQUESTS_PER_MINUTE: float = 20.0
+    RATE_LIMIT_BURST: int = 20
     MAX_TOKENS_PER_SESSION: int = 15000
+    RATE_LIMIT_TOKEN_WINDOW_SECONDS: float = 3600.0
+    RATE_LIMIT_MAX_KEYS: int = 10000
+    RATE_LIMIT_IDLE_SECONDS: float = 3600.0
+    RATE_LIMIT_SESSIONS_PER_IP_PER_HOUR: int = 10  # beyond this an IP stays keyed by IP
+    RATE_LIMIT_STORE: str = "memory"  # "memory" or "sqlite" (shared across workers)
+    RATE_LIMIT_SQLITE_PATH: str = "/tmp/siphio-rate-limits.db"
+    # Peers whose X-Forwarded-For is honoured (comma-separated IPs, e.g. the Next.js proxy)
+    RATE_LIMIT_TRUSTED_PROXIES: str = "127.0.0.1,::1"
+    # Signs the session ids the agent issues; X-Session-Id is ignored while unset
+    SESSION_SIGNING_KEY: str = ""
+
+    # Shared cache (knowledge results, chat answers, lead dedup)
+    CACHE_BACKEND: str = "memory"  # "memory" (per worker) or "sqlite" (shared across workers)
+    CACHE_SQLITE_PATH: str = "/tmp/siphio-cache.db"
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_DEFAULT_TTL_SECONDS: float = 300.0
+    KNOWLEDGE_CACHE_TTL_SECONDS: float = 600.0  # 0 disables
+    CHAT_CACHE_TTL_SECONDS: float = 300.0  # first-turn informational answers; 0 disables
+    LEAD_DEDUP_CACHE_TTL_SECONDS: float = 86400.0  # matches the 24h duplicate window
+    LEAD_LOOKUP_CACHE_TTL_SECONDS: float = 60.0  # GET /lead/{reference_id}; 0 disables
+
+    # Idempotency-Key on POST /lead
+    LEAD_IDEMPOTENCY_STORE: str = "memory"  # "memory" (bounded, per worker) or "cache" (shared cache backend)
+    LEAD_IDEMPOTENCY_MAX_KEYS: int = 10000
+    LEAD_IDEMPOTENCY_TTL_SECONDS: float = 86400.0
+
+    # Lead retention (cli.archive_leads moves older leads to leads_archive)
+    LEAD_RETENTION_DAYS: int = 365
+    LEAD_ARCHIVE_BATCH_SIZE: int = 5000
+    LEAD_LIST_PAGE_SIZE: int = 500  # rows per query for /admin/leads
+    LEAD_IMPORT_BATCH_SIZE: int = 500  # rows validated and inserted together by cli.import_leads
+
+    # Dependency probes behind /ready and /health/deep
+    HEALTH_PROBES: str = "knowledge,postgrest,model"  # probes to run
+    # Probes that must pass for /ready. Upstreams stay out of it: the fast path
+    # and knowledge fallback keep serving while OpenRouter or PostgREST is down
+    HEALTH_READY_PROBES: str = "knowledge"
+    HEALTH_PROBE_INTERVAL_SECONDS: float = 10.0
+    HEALTH_PROBE_TTL_SECONDS: float = 30.0
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 3.0
+    OPENROUTER_HEALTH_URL: str = "https://openrouter.ai/api/v1/key"
+
+    # Shared HTTP clients (OpenRouter, PostgREST, health probes)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 90.0
+    HTTP_TIMEOUT_SECONDS: float = 60.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    HTTP2_ENABLED: bool = True  # used when the h2 package is installed
+    HTTP_PREWARM_ENABLED: bool = True  # connect to upstreams during startup
+    HTTP_KEEPALIVE_REFRESH_SECONDS: float = 60.0  # re-touch upstreams; 0 disables
+    OPENROUTER_BASE_URL: str = "https://openrouter.ai/api/v1"
 
     # Supabase Configuration
     SUPABASE_URL: str = "http://127.0.0.1:54321"
     SUPABASE_ANON_KEY: str = ""
 
+    # Admin / Diagnostics (admin endpoints are disabled while the key is empty)
+    ADMIN_API_KEY: str = ""
+    PROFILE_MAX_SECONDS: int = 60
+    LOOP_STALL_THRESHOLD_MS: float = 200.0  # 0 disables the stall monitor
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -0,0 +1,122 @@
+"""Background dependency probes for readiness and deep health checks.
+
+Probes run on a fixed interval in a background task; /ready and
+/health/deep only read the cached results, so any number of load
+balancers polling them never adds outbound traffic or latency. A result
+older than the TTL counts as failed (the prober itself may be stuck).
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional
+
+from pydantic import BaseModel, Field
+
+from .metrics import metrics
+
+
+# A probe raises (or times out) when its dependency is unhealthy
+Probe = Callable[[], Awaitable[None]]
+
+
+class ProbeResult(BaseModel):
+    """Latest outcome of one dependency probe."""
+
+    name: str
+    ok: bool
+    latency_ms: float = 0.0
+    checked_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    error: Optional[str] = None
+    stale: bool = False
+
+
+class HealthProber:
+    """Runs probes periodically and caches their results."""
+
+    def __init__(self, probes: dict[str, Probe], interval: float, ttl: float, timeout: float):
+        """
+        Args:
+            probes: Probe callables by dependency name
+            interval: Seconds between probe rounds
+            ttl: Seconds a result stays valid before it is reported stale
+            timeout: Seconds each probe may take
+        """
+        self.probes = probes
+        self.interval = interval
+        self.ttl = ttl
+        self.timeout = timeout
+        self._results: dict[str, tuple[float, ProbeResult]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run_probe(self, name: str, probe: Probe) -> ProbeResult:
+        started = time.perf_counter()
+        error = None
+        try:
+            await asyncio.wait_for(probe(), self.timeout)
+        except asyncio.TimeoutError:
+            error = f"timed out after {self.timeout}s"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        latency_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        metrics.set_gauge("health_probe_ok", 0 if error else 1, probe=name)
+        metrics.observe("health_probe_seconds", latency_ms / 1000, probe=name)
+        return ProbeResult(name=name, ok=error is None, latency_ms=latency_ms, error=error)
+
+    async def probe_once(self) -> None:
+        """Run every probe concurrently and store the results."""
+        results = await asyncio.gather(
+            *(self._run_probe(name, probe) for name, probe in self.probes.items())
+        )
+        now = time.monotonic()
+        for result in results:
+            self._results[result.name] = (now, result)
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.probe_once()
+            except Exception as e:
+                print(f"HEALTH: probe round failed: {type(e).__name__}: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start probing in the background (must be called inside the event loop)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Stop the background task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def results(self) -> dict[str, ProbeResult]:
+        """Cached results; missing or expired probes are reported as failed."""
+        now = time.monotonic()
+        report = {}
+        for name in self.probes:
+            entry = self._results.get(name)
+            if entry is None:
+                report[name] = ProbeResult(name=name, ok=False, error="not probed yet")
+                continue
+            checked, result = entry
+            if now - checked > self.ttl:
+                result = result.model_copy(update={"ok": False, "stale": True})
+            report[name] = result
+        return report
+
+    def healthy(self, names: Optional[list[str]] = None) -> bool:
+        """
+        True if every named probe (default: all) has a fresh passing result.
+
+        A name without a probe counts as failing, so a typo in the list
+        can't make the check pass unconditionally.
+        """
+        results = self.results()
+        return all(name in results and results[name].ok for name in (names or list(results)))
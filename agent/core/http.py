@@ -0,0 +1,160 @@
+"""Shared, pooled HTTP clients.
+
+One async client (OpenRouter, health probes) and one sync client
+(PostgREST, which runs in worker threads) per process, with tuned pool
+limits, keep-alive and HTTP/2 when the h2 package is installed. The async
+client is an httpx2 client, which pydantic-ai requires for
+OpenAI-compatible providers; postgrest needs a plain httpx client.
+
+A fresh TLS connection to OpenRouter or Supabase costs a few round trips,
+which shows up as tail latency on the first request after a quiet period.
+The app's lifespan calls prewarm() at startup and keep_warm() touches each
+origin every HTTP_KEEPALIVE_REFRESH_SECONDS, shorter than the keep-alive
+expiry, so idle connections are reused instead of reopened.
+
+Clients are created on first use. serve.py builds the agents (and so the
+async client) before forking, but no connection is opened until a worker's
+lifespan prewarms, so nothing is shared across processes.
+"""
+
+import asyncio
+import threading
+from typing import TYPE_CHECKING, Optional
+
+from .config import settings
+from .metrics import metrics
+
+if TYPE_CHECKING:
+    import httpx
+    import httpx2
+
+
+_async_client: Optional["httpx2.AsyncClient"] = None
+_sync_client: Optional["httpx.Client"] = None
+_lock = threading.Lock()
+
+
+def http2_available() -> bool:
+    """True if HTTP/2 is enabled and the h2 package is installed."""
+    if not settings.HTTP2_ENABLED:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _client_options(httpx) -> dict:
+    # httpx and httpx2 share this API
+    return {
+        "limits": httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        "timeout": httpx.Timeout(
+            settings.HTTP_TIMEOUT_SECONDS, connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS
+        ),
+        "http2": http2_available(),
+    }
+
+
+def get_async_client() -> "httpx2.AsyncClient":
+    """Process-wide async client (created on first call)."""
+    global _async_client
+    if _async_client is None:
+        with _lock:
+            if _async_client is None:
+                import httpx2
+
+                _async_client = httpx2.AsyncClient(**_client_options(httpx2))
+    return _async_client
+
+
+def get_sync_client() -> "httpx.Client":
+    """Process-wide sync client (created on first call)."""
+    global _sync_client
+    if _sync_client is None:
+        with _lock:
+            if _sync_client is None:
+                import httpx
+
+                _sync_client = httpx.Client(**_client_options(httpx))
+    return _sync_client
+
+
+def pool_stats() -> dict[str, dict[str, int]]:
+    """Open, idle and in-use connections per shared client."""
+    stats = {}
+    for name, client in (("async", _async_client), ("sync", _sync_client)):
+        if client is None:
+            continue
+        # httpx exposes no public pool API; read the httpcore pool
+        pool = getattr(client._transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        idle = sum(1 for conn in connections if conn.is_idle())
+        stats[name] = {
+            "connections": len(connections),
+            "idle": idle,
+            "active": len(connections) - idle,
+        }
+    return stats
+
+
+def record_pool_metrics() -> None:
+    """Publish pool_stats() as gauges."""
+    for name, counts in pool_stats().items():
+        for state, value in counts.items():
+            metrics.set_gauge("http_pool_connections", value, client=name, state=state)
+
+
+def warm_targets() -> dict[str, list[str]]:
+    """URLs touched on each client to open (or keep open) its upstream connections."""
+    supabase = [f"{settings.SUPABASE_URL}/rest/v1/"] if settings.SUPABASE_URL else []
+    return {"async": [settings.OPENROUTER_BASE_URL], "sync": supabase}
+
+
+async def _touch_async(url: str) -> None:
+    try:
+        await get_async_client().head(url)
+    except Exception as e:
+        metrics.incr("http_prewarm_failures_total", client="async")
+        print(f"HTTP: prewarm of {url} failed: {type(e).__name__}: {e}")
+
+
+def _touch_sync(url: str) -> None:
+    try:
+        get_sync_client().head(url)
+    except Exception as e:
+        metrics.incr("http_prewarm_failures_total", client="sync")
+        print(f"HTTP: prewarm of {url} failed: {type(e).__name__}: {e}")
+
+
+async def prewarm() -> None:
+    """Open a connection to every upstream on both clients."""
+    targets = warm_targets()
+    await asyncio.gather(
+        *(_touch_async(url) for url in targets["async"]),
+        *(asyncio.to_thread(_touch_sync, url) for url in targets["sync"]),
+    )
+    record_pool_metrics()
+
+
+async def keep_warm(interval: float) -> None:
+    """Re-touch upstreams every interval so pooled connections never expire idle."""
+    while True:
+        await asyncio.sleep(interval)
+        await prewarm()
+
+
+async def close_clients() -> None:
+    """Close both shared clients (lifespan shutdown)."""
+    global _async_client, _sync_client
+    with _lock:
+        async_client, sync_client = _async_client, _sync_client
+        _async_client = _sync_client = None
+    if async_client is not None:
+        await async_client.aclose()
+    if sync_client is not None:
+        sync_client.close()
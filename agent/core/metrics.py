@@ -0,0 +1,149 @@
+"""In-process metrics registry with Prometheus text exposition.
+
+Counters, gauges and summaries are keyed by name plus optional labels:
+
+    metrics.incr("chat_branch_total", branch="informational")
+    metrics.observe("llm_queue_wait_seconds", 0.012)
+
+Summaries keep a bounded reservoir of recent observations so quantiles
+(p50/p95/p99) stay cheap and memory-bounded.
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Optional
+
+
+def _key(name: str, labels: dict[str, str]) -> str:
+    """Build a Prometheus-style series key: name{a="1",b="2"}."""
+    if not labels:
+        return name
+    rendered = ",".join(f'{k}="{v}"' for k, v in sorted(labels.items()))
+    return f"{name}{{{rendered}}}"
+
+
+class Summary:
+    """Count, sum, max and a sliding reservoir for quantiles."""
+
+    def __init__(self, reservoir_size: int = 1024):
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._recent: deque[float] = deque(maxlen=reservoir_size)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        self._recent.append(value)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return the q-quantile of recent observations, or None if empty."""
+        if not self._recent:
+            return None
+        ordered = sorted(self._recent)
+        index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return ordered[index]
+
+    @property
+    def sample_size(self) -> int:
+        return len(self._recent)
+
+
+class MetricsRegistry:
+    """Thread-safe registry of counters, gauges and summaries."""
+
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = {}
+        self._gauges: dict[str, float] = {}
+        self._summaries: dict[str, Summary] = {}
+
+    def incr(self, name: str, value: float = 1.0, **labels: str) -> None:
+        """Increment a counter."""
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        """Set a gauge to an absolute value."""
+        with self._lock:
+            self._gauges[_key(name, labels)] = value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record an observation in a summary."""
+        key = _key(name, labels)
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is None:
+                summary = self._summaries[key] = Summary()
+            summary.observe(value)
+
+    def counter(self, name: str, **labels: str) -> float:
+        """Current value of a counter (0 if never incremented)."""
+        return self._counters.get(_key(name, labels), 0.0)
+
+    def gauge(self, name: str, **labels: str) -> float:
+        """Current value of a gauge (0 if never set)."""
+        return self._gauges.get(_key(name, labels), 0.0)
+
+    def summary(self, name: str, **labels: str) -> Optional[Summary]:
+        """Summary for a series, or None if nothing was observed."""
+        return self._summaries.get(_key(name, labels))
+
+    def snapshot(self) -> dict:
+        """Return all series as plain data (for JSON endpoints and tests)."""
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "summaries": {
+                    key: {
+                        "count": s.count,
+                        "sum": s.sum,
+                        "max": s.max,
+                        **{f"p{int(q * 100)}": s.quantile(q) for q in self.QUANTILES},
+                    }
+                    for key, s in self._summaries.items()
+                },
+            }
+
+    def render_prometheus(self) -> str:
+        """Render all series in the Prometheus text exposition format."""
+        lines: list[str] = []
+        with self._lock:
+            for key, value in sorted(self._counters.items()):
+                lines.append(f"{key} {value:g}")
+            for key, value in sorted(self._gauges.items()):
+                lines.append(f"{key} {value:g}")
+            for key, s in sorted(self._summaries.items()):
+                name, _, labels = key.partition("{")
+                labels = labels.rstrip("}")
+                for q in self.QUANTILES:
+                    value = s.quantile(q)
+                    if value is None:
+                        continue
+                    q_labels = f'quantile="{q}"' + (f",{labels}" if labels else "")
+                    lines.append(f"{name}{{{q_labels}}} {value:g}")
+                suffix = f"{{{labels}}}" if labels else ""
+                lines.append(f"{name}_sum{suffix} {s.sum:g}")
+                lines.append(f"{name}_count{suffix} {s.count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Clear all series (used by tests)."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._summaries.clear()
+
+
+# Process-wide registry
+metrics = MetricsRegistry()
@@ -0,0 +1,173 @@
+"""Live sampling profiler and event-loop stall detection.
+
+Both tools run on plain background threads so they can observe the event
+loop while it is blocked:
+
+- StackSampler walks ``sys._current_frames()`` at a fixed interval and
+  aggregates stacks in flamegraph "collapsed" format (``a;b;c 42``).
+- LoopStallMonitor keeps a heartbeat task on the loop and records the
+  loop thread's stack whenever the heartbeat falls behind the threshold.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from types import FrameType
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+def _frame_label(frame: FrameType) -> str:
+    """Format a frame as ``qualname (file:line)`` for collapsed stacks."""
+    code = frame.f_code
+    filename = code.co_filename.rsplit("/", 1)[-1]
+    # Semicolons and spaces are separators in the collapsed format
+    label = f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+    return label.replace(";", ":")
+
+
+def collapse_stack(frame: Optional[FrameType]) -> str:
+    """Render a frame chain root-first, joined with ';'."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """Statistical sampler producing flamegraph-compatible collapsed stacks."""
+
+    def __init__(
+        self,
+        interval: float = 0.005,
+        thread_ids: Optional[set[int]] = None,
+    ):
+        """
+        Args:
+            interval: Seconds between samples
+            thread_ids: Threads to sample; None samples every thread
+        """
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.samples: Counter[str] = Counter()
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start sampling on a daemon thread."""
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+
+        while not self._stop.is_set():
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if self.thread_ids is not None and thread_id not in self.thread_ids:
+                    continue
+                thread_name = names.get(thread_id, str(thread_id))
+                self.samples[f"{thread_name};{collapse_stack(frame)}"] += 1
+            self.sample_count += 1
+            self._stop.wait(self.interval)
+
+    def collapsed(self) -> str:
+        """Return samples as collapsed-stack text, heaviest stacks first."""
+        return "\n".join(
+            f"{stack} {count}" for stack, count in self.samples.most_common()
+        )
+
+
+class LoopStall(BaseModel):
+    """A single detected event-loop stall."""
+
+    detected_at: datetime
+    blocked_ms: float = Field(ge=0)
+    stack: str
+
+
+class LoopStallMonitor:
+    """Detect event-loop blocking using a heartbeat task and a watchdog thread."""
+
+    def __init__(self, threshold_ms: float = 200.0, max_stalls: int = 100):
+        """
+        Args:
+            threshold_ms: Minimum blocking time to report
+            max_stalls: Number of most recent stalls kept in memory
+        """
+        self.threshold = threshold_ms / 1000
+        self.stalls: deque[LoopStall] = deque(maxlen=max_stalls)
+        self._beat_interval = self.threshold / 4
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._pending: Optional[LoopStall] = None
+        self._stop = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start monitoring the running event loop."""
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(
+            target=self._watch, name="loop-stall-monitor", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self) -> None:
+        """Stop the heartbeat task and the watchdog thread."""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._thread is not None:
+            self._thread.join()
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self._beat_interval)
+            now = time.monotonic()
+            pending = self._pending
+            if pending is not None:
+                # The loop is running again: record how long it was blocked
+                blocked = (now - self._last_beat - self._beat_interval) * 1000
+                pending.blocked_ms = max(pending.blocked_ms, blocked)
+                self.stalls.append(pending)
+                self._pending = None
+            self._last_beat = now
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self._beat_interval):
+            behind = time.monotonic() - self._last_beat - self._beat_interval
+            if behind < self.threshold or self._pending is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            self._pending = LoopStall(
+                detected_at=datetime.now(timezone.utc),
+                blocked_ms=behind * 1000,
+                stack=collapse_stack(frame),
+            )
+
+    def recent(self) -> list[LoopStall]:
+        """Return recorded stalls, most recent first."""
+        return list(reversed(self.stalls))
@@ -0,0 +1,358 @@
+"""Per-client rate limiting and token budgets.
+
+Each client key (server-signed session id or client IP) gets:
+- a token bucket on requests (steady rate + burst), and
+- a token budget: total LLM tokens spent in a rolling window, capped at
+  MAX_TOKENS_PER_SESSION.
+
+Checks are O(1). The in-memory store is an LRU bounded by max_keys that
+also drops entries idle for longer than idle_seconds. The SQLite store
+keeps the same state in a file so every uvicorn worker on a host shares it;
+its calls block on disk I/O and locks, so async code uses check_async()
+and record_tokens_async(), which run them in a worker thread.
+
+Each session starts with a fresh budget, so minting sessions is limited
+too: build_session_mint_limiter() caps new sessions per IP.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from .metrics import metrics
+
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of a rate-limit check."""
+
+    allowed: bool
+    reason: Optional[str] = None  # "rate" or "token_budget" when rejected
+    retry_after: int = 0
+
+
+@dataclass
+class _Entry:
+    """Limiter state for one client key."""
+
+    bucket: float
+    updated: float
+    tokens_used: int
+    window_start: float
+
+
+class RateLimitStore(ABC):
+    """Storage for per-key limiter state."""
+
+    _lock: threading.Lock
+    # Whether calls block on I/O (and should be kept off the event loop)
+    blocking: bool = False
+
+    @abstractmethod
+    def load(self, key: str) -> Optional[_Entry]:
+        """Return state for key, or None if unknown/evicted."""
+
+    @abstractmethod
+    def save(self, key: str, entry: _Entry) -> None:
+        """Persist state for key."""
+
+    def transaction(self):
+        """Context manager making a load/save pair atomic."""
+        return self._lock
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    """LRU-bounded dict with idle-entry eviction."""
+
+    def __init__(self, max_keys: int = 10000, idle_seconds: float = 3600):
+        self.max_keys = max_keys
+        self.idle_seconds = idle_seconds
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self, key: str) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def save(self, key: str, entry: _Entry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._evict(entry.updated)
+
+    def _evict(self, now: float) -> None:
+        # Oldest entries are at the front; amortized O(1) per call
+        while self._entries:
+            oldest_key, oldest = next(iter(self._entries.items()))
+            if len(self._entries) > self.max_keys or now - oldest.updated > self.idle_seconds:
+                del self._entries[oldest_key]
+                metrics.incr("rate_limit_evictions_total")
+            else:
+                break
+
+
+class SQLiteRateLimitStore(RateLimitStore):
+    """File-backed store shared by all workers on the same host."""
+
+    # Run idle-row cleanup once every N saves
+    CLEANUP_EVERY = 1000
+    blocking = True
+
+    def __init__(self, path: str, idle_seconds: float = 3600):
+        self.path = path
+        self.idle_seconds = idle_seconds
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._saves = 0
+        # A forked worker must open its own connection, never reuse the parent's
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                " key TEXT PRIMARY KEY,"
+                " bucket REAL NOT NULL,"
+                " updated REAL NOT NULL,"
+                " tokens_used INTEGER NOT NULL,"
+                " window_start REAL NOT NULL)"
+            )
+
+    def _reset_after_fork(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def transaction(self):
+        return _SQLiteTransaction(self._lock, self._connect())
+
+    def load(self, key: str) -> Optional[_Entry]:
+        row = self._connect().execute(
+            "SELECT bucket, updated, tokens_used, window_start FROM rate_limits WHERE key = ?",
+            (key,),
+        ).fetchone()
+        return _Entry(*row) if row else None
+
+    def save(self, key: str, entry: _Entry) -> None:
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO rate_limits VALUES (?, ?, ?, ?, ?)",
+            (key, entry.bucket, entry.updated, entry.tokens_used, entry.window_start),
+        )
+        self._saves += 1
+        if self._saves % self.CLEANUP_EVERY == 0:
+            conn.execute(
+                "DELETE FROM rate_limits WHERE updated < ?",
+                (entry.updated - self.idle_seconds,),
+            )
+
+
+class _SQLiteTransaction:
+    """Serialize a load/save pair across threads (lock) and processes (BEGIN IMMEDIATE)."""
+
+    def __init__(self, lock: threading.Lock, conn: sqlite3.Connection):
+        self._lock = lock
+        self._conn = conn
+
+    def __enter__(self):
+        self._lock.acquire()
+        self._conn.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._lock.release()
+
+
+class RateLimiter:
+    """Token bucket on requests plus an LLM token budget per client key."""
+
+    def __init__(
+        self,
+        store: RateLimitStore,
+        requests_per_minute: float,
+        burst: int,
+        token_budget: int,
+        budget_window: float,
+        name: str = "requests",
+    ):
+        """
+        Args:
+            store: Backing state store
+            requests_per_minute: Steady-state request refill rate
+            burst: Bucket capacity (max back-to-back requests)
+            token_budget: Max LLM tokens per key within budget_window
+            budget_window: Seconds before a key's token budget resets
+            name: Metrics label telling limiters that share a store apart
+        """
+        self.store = store
+        self.name = name
+        self.rate = requests_per_minute / 60
+        self.burst = burst
+        self.token_budget = token_budget
+        self.budget_window = budget_window
+
+    def _refresh(self, entry: Optional[_Entry], now: float) -> _Entry:
+        if entry is None:
+            return _Entry(bucket=self.burst, updated=now, tokens_used=0, window_start=now)
+        entry.bucket = min(self.burst, entry.bucket + (now - entry.updated) * self.rate)
+        entry.updated = now
+        if now - entry.window_start >= self.budget_window:
+            entry.tokens_used = 0
+            entry.window_start = now
+        return entry
+
+    def check(self, key: str, now: Optional[float] = None) -> RateLimitDecision:
+        """Consume one request for key if allowed."""
+        now = time.time() if now is None else now
+
+        with self.store.transaction():
+            entry = self._refresh(self.store.load(key), now)
+
+            if entry.tokens_used >= self.token_budget:
+                decision = RateLimitDecision(
+                    allowed=False,
+                    reason="token_budget",
+                    retry_after=max(1, int(entry.window_start + self.budget_window - now)),
+                )
+            elif entry.bucket < 1:
+                decision = RateLimitDecision(
+                    allowed=False,
+                    reason="rate",
+                    retry_after=max(1, int((1 - entry.bucket) / self.rate) + 1),
+                )
+            else:
+                entry.bucket -= 1
+                decision = RateLimitDecision(allowed=True)
+
+            self.store.save(key, entry)
+
+        if not decision.allowed:
+            metrics.incr("rate_limit_rejected_total", reason=decision.reason or "", limiter=self.name)
+        return decision
+
+    async def check_async(self, key: str) -> RateLimitDecision:
+        """check() from async code, in a worker thread when the store blocks."""
+        if self.store.blocking:
+            return await asyncio.to_thread(self.check, key)
+        return self.check(key)
+
+    def record_tokens(self, key: str, tokens: int, now: Optional[float] = None) -> None:
+        """Charge LLM tokens spent on behalf of key against its budget."""
+        if tokens <= 0:
+            return
+        now = time.time() if now is None else now
+
+        with self.store.transaction():
+            entry = self._refresh(self.store.load(key), now)
+            entry.tokens_used += tokens
+            self.store.save(key, entry)
+
+    async def record_tokens_async(self, key: str, tokens: int) -> None:
+        """record_tokens() from async code, in a worker thread when the store blocks."""
+        if self.store.blocking and tokens > 0:
+            await asyncio.to_thread(self.record_tokens, key, tokens)
+        else:
+            self.record_tokens(key, tokens)
+
+
+def _sign(session_id: str, secret: str) -> str:
+    return hmac.new(secret.encode(), session_id.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def issue_session_token(secret: str) -> str:
+    """Create a new signed session token ("<id>.<signature>")."""
+    session_id = secrets.token_urlsafe(16)
+    return f"{session_id}.{_sign(session_id, secret)}"
+
+
+def verify_session_token(token: str, secret: str) -> Optional[str]:
+    """Return the session id if token was issued with secret, else None."""
+    if not secret:
+        return None
+    session_id, _, signature = token.partition(".")
+    if not session_id or not hmac.compare_digest(signature, _sign(session_id, secret)):
+        return None
+    return session_id
+
+
+def client_ip(peer: Optional[str], forwarded_for: Optional[str], trusted_proxies: set[str]) -> str:
+    """
+    Resolve the client IP without trusting anything the client can set.
+
+    X-Forwarded-For is only read when the socket peer is a trusted proxy,
+    and then from the right: each proxy appends the address it saw, so the
+    rightmost entry that is not itself a trusted proxy is the real client.
+    Left-hand entries are client-supplied and ignored.
+    """
+    if not peer:
+        return "unknown"
+    if not forwarded_for or peer not in trusted_proxies:
+        return peer
+
+    for hop in reversed([h.strip() for h in forwarded_for.split(",") if h.strip()]):
+        if hop not in trusted_proxies:
+            return hop
+    return peer
+
+
+def build_rate_limiter(settings) -> RateLimiter:
+    """Create the limiter configured by Settings."""
+    store: RateLimitStore
+    if settings.RATE_LIMIT_STORE == "sqlite":
+        store = SQLiteRateLimitStore(
+            settings.RATE_LIMIT_SQLITE_PATH,
+            idle_seconds=settings.RATE_LIMIT_IDLE_SECONDS,
+        )
+    else:
+        store = InMemoryRateLimitStore(
+            max_keys=settings.RATE_LIMIT_MAX_KEYS,
+            idle_seconds=settings.RATE_LIMIT_IDLE_SECONDS,
+        )
+
+    return RateLimiter(
+        store=store,
+        requests_per_minute=settings.RATE_LIMIT_REQUESTS_PER_MINUTE,
+        burst=settings.RATE_LIMIT_BURST,
+        token_budget=settings.MAX_TOKENS_PER_SESSION,
+        budget_window=settings.RATE_LIMIT_TOKEN_WINDOW_SECONDS,
+    )
+
+
+def build_session_mint_limiter(settings, store: RateLimitStore) -> RateLimiter:
+    """
+    Limit how many sessions one IP can be issued per hour.
+
+    Every session gets its own request burst and token budget, so without
+    this a client could drop its session on each request and start fresh.
+    Keys are "mint:<ip key>" in the request limiter's store.
+    """
+    per_hour = settings.RATE_LIMIT_SESSIONS_PER_IP_PER_HOUR
+    return RateLimiter(
+        store=store,
+        requests_per_minute=per_hour / 60,
+        burst=per_hour,
+        token_budget=1,  # Unused: no tokens are charged to mint keys
+        budget_window=3600,
+        name="session_mint",
+    )
@@ -0,0 +1,215 @@
+"""Deadlines, hedging and circuit breaking for upstream model calls."""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from .admission import AdmissionController
+from .metrics import metrics
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker is rejecting calls."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Circuit breaker is open")
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a call misses its per-attempt or total deadline."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker (closed -> open -> half-open)."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float, name: str = "llm"):
+        """
+        Args:
+            failure_threshold: Consecutive failures that trip the breaker
+            reset_timeout: Seconds to stay open before allowing a trial call
+            name: Metric name prefix
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.name = name
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def retry_after(self) -> int:
+        """Seconds until the breaker will allow a trial call."""
+        if self._opened_at is None:
+            return 0
+        remaining = self.reset_timeout - (time.monotonic() - self._opened_at)
+        return max(1, int(remaining) + 1)
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed (admits one trial when half-open)."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def release_trial(self) -> None:
+        """Give back a half-open trial that ended without a recorded outcome."""
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        metrics.set_gauge(f"{self.name}_circuit_open", 0)
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_in_flight = False
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            # Trip (or re-trip after a failed trial)
+            self._opened_at = time.monotonic()
+            metrics.incr(f"{self.name}_circuit_trips_total")
+            metrics.set_gauge(f"{self.name}_circuit_open", 1)
+
+
+async def _hedged_attempt(
+    call: Callable[[], Awaitable[T]],
+    hedge_delay: Optional[float],
+    metric_prefix: str,
+    hedge_admission: Optional[AdmissionController],
+    on_discarded: Optional[Callable[[T], None]],
+) -> T:
+    """Run call, firing a second copy if the first is still pending after hedge_delay."""
+    first = asyncio.ensure_future(call())
+    if hedge_delay is None:
+        return await first
+
+    pending: set[asyncio.Future] = {first}
+    hedged = False
+    try:
+        done, pending = await asyncio.wait(pending, timeout=hedge_delay)
+        if not done:
+            # The hedge needs a slot of its own; never queue for one
+            if hedge_admission is None or hedge_admission.try_acquire():
+                metrics.incr(f"{metric_prefix}_hedges_total")
+                hedged = True
+                hedge = asyncio.ensure_future(call())
+                if hedge_admission is not None:
+                    hedge.add_done_callback(lambda _: hedge_admission.release())
+                pending.add(hedge)
+            else:
+                metrics.incr(f"{metric_prefix}_hedges_skipped_total")
+
+        while True:
+            error: Optional[BaseException] = None
+            winner: Optional[asyncio.Future] = None
+            for task in done:
+                if task.exception() is not None:
+                    error = task.exception()
+                elif winner is None:
+                    winner = task
+                elif on_discarded is not None:
+                    # Both copies finished: the loser's usage was still spent
+                    on_discarded(task.result())
+            if winner is not None:
+                if winner is not first:
+                    metrics.incr(f"{metric_prefix}_hedge_wins_total")
+                return winner.result()
+            if not pending:
+                assert error is not None
+                raise error
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        if hedged and pending:
+            # Cancelled copies may already have spent upstream tokens
+            metrics.incr(f"{metric_prefix}_hedge_cancelled_total", len(pending))
+        for task in pending:
+            task.cancel()
+
+
+async def call_with_deadlines(
+    call: Callable[[], Awaitable[T]],
+    attempt_timeout: float,
+    total_timeout: float,
+    max_attempts: int = 1,
+    hedge_delay: Optional[float] = None,
+    is_retryable: Callable[[BaseException], bool] = lambda e: True,
+    metric_prefix: str = "llm",
+    hedge_admission: Optional[AdmissionController] = None,
+    on_discarded: Optional[Callable[[T], None]] = None,
+) -> T:
+    """
+    Await call() with per-attempt and total deadlines.
+
+    Args:
+        call: Factory returning a fresh awaitable per attempt
+        attempt_timeout: Seconds allowed for each attempt
+        total_timeout: Seconds allowed across all attempts
+        max_attempts: Attempts before giving up
+        hedge_delay: If set, fire a duplicate call when an attempt is still
+            pending after this many seconds and keep whichever finishes first
+        is_retryable: Decides whether a failed attempt may be retried
+        metric_prefix: Metric name prefix
+        hedge_admission: If set, a hedge only fires when it can take a free
+            slot here, so hedging never exceeds the concurrency bound
+        on_discarded: Called with a hedged copy's result when it also
+            finished but lost (e.g. to charge its token usage)
+
+    Returns:
+        Result of the first successful attempt
+
+    Raises:
+        DeadlineExceeded: If the deadlines were hit
+    """
+    deadline = time.monotonic() + total_timeout
+
+    for attempt in range(1, max_attempts + 1):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(
+                _hedged_attempt(call, hedge_delay, metric_prefix, hedge_admission, on_discarded),
+                timeout=min(attempt_timeout, remaining),
+            )
+        except asyncio.TimeoutError:
+            metrics.incr(f"{metric_prefix}_timeouts_total")
+            if attempt == max_attempts:
+                break
+            metrics.incr(f"{metric_prefix}_retries_total")
+            continue
+        except Exception as e:
+            if attempt == max_attempts or not is_retryable(e):
+                raise
+            metrics.incr(f"{metric_prefix}_retries_total")
+            continue
+
+        metrics.observe(f"{metric_prefix}_latency_seconds", time.perf_counter() - started)
+        return result
+
+    raise DeadlineExceeded(f"No response within deadline after {attempt} attempt(s)")
+
+
+def p95_hedge_delay(metric_prefix: str = "llm", min_samples: int = 20) -> Optional[float]:
+    """Hedge delay from the observed p95 latency, or None until enough samples exist."""
+    summary = metrics.summary(f"{metric_prefix}_latency_seconds")
+    if summary is None or summary.sample_size < min_samples:
+        return None
+    return summary.quantile(0.95)
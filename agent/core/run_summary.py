@@ -0,0 +1,93 @@
+"""Post-processing of agent run results.
+
+Every chat path needs the same few facts from a run: the reply text with
+any handoff markers removed, the handoff summary, the tools the model
+called and the token counts. summarize_run() collects them in one pass
+over the run's own messages (new_messages(), not the replayed history)
+and only looks at tool-call parts, so each call is counted once.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+HANDOFF_PATTERN = re.compile(r"\[HANDOFF_SUMMARY\](.*?)\[/HANDOFF_SUMMARY\]", re.DOTALL)
+
+
+@dataclass
+class RunSummary:
+    """What a chat response needs from one agent run."""
+
+    text: str
+    handoff_summary: Optional[str] = None
+    tools_called: list[str] = field(default_factory=list)
+    tokens_used: int = 0
+    cached_tokens: int = 0
+
+    @property
+    def handoff_ready(self) -> bool:
+        return self.handoff_summary is not None
+
+
+def parse_handoff_summary(response: str) -> tuple[str, Optional[str]]:
+    """
+    Extract handoff summary from agent response if present.
+
+    Agent uses format: [HANDOFF_SUMMARY]...summary...[/HANDOFF_SUMMARY]
+
+    Returns: (cleaned_response, summary_or_none)
+    """
+    # Most replies carry no marker; skip the regex for them
+    if "[HANDOFF_SUMMARY]" not in response:
+        return response, None
+
+    match = HANDOFF_PATTERN.search(response)
+    if match is None:
+        return response, None
+    cleaned = HANDOFF_PATTERN.sub("", response).strip()
+    return cleaned, match.group(1).strip()
+
+
+def run_usage(result):
+    """
+    Token usage of a run.
+
+    Older pydantic-ai releases expose usage() as a method, newer ones as a
+    property; accept both.
+    """
+    usage = result.usage
+    return usage() if callable(usage) else usage
+
+
+def tool_calls(messages) -> list[str]:
+    """Names of the tools called in messages, in call order."""
+    return [
+        part.tool_name
+        for message in messages
+        if message.kind == "response"
+        for part in message.parts
+        if part.part_kind == "tool-call"
+    ]
+
+
+def summarize_run(result, output: Optional[str] = None) -> RunSummary:
+    """
+    Summarize a finished run.
+
+    Args:
+        result: AgentRunResult or StreamedRunResult
+        output: Final text when the caller already has it (streamed runs)
+
+    Returns:
+        RunSummary for the response
+    """
+    text, handoff_summary = parse_handoff_summary(result.output if output is None else output)
+    usage = run_usage(result)
+    return RunSummary(
+        text=text,
+        handoff_summary=handoff_summary,
+        tools_called=tool_calls(result.new_messages()),
+        tokens_used=usage.total_tokens if usage else 0,
+        cached_tokens=usage.cache_read_tokens if usage else 0,
+    )
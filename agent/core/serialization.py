@@ -0,0 +1,31 @@
+"""JSON encoding for payloads the app builds itself.
+
+Endpoints with a response_model are already serialized straight to bytes
+by pydantic-core inside FastAPI, which is faster than any response class
+(ORJSONResponse included) that re-encodes a dict. dumps() covers the
+places that hand-build JSON instead: WebSocket events and NDJSON streams.
+It uses orjson when installed and the standard library otherwise.
+"""
+
+import json
+from datetime import date, datetime
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    # Matches orjson for the types the app sends (model_dump() output)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> str:
+    """Encode value as compact JSON text."""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, default=_default, separators=(",", ":"))
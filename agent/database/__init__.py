@@ -2,9 +2,15 @@
 
 Uses Supabase for:
 - Lead storage
-- Conversation logging (future)
+- Conversation transcripts (features.transcripts)
 """
 
-from .client import postgrest, get_postgrest_client
+from .client import get_postgrest, get_postgrest_client
 
-__all__ = ["postgrest", "get_postgrest_client"]
+__all__ = ["postgrest", "get_postgrest", "get_postgrest_client"]
+
+
+def __getattr__(name: str):
+    if name == "postgrest":
+        return get_postgrest()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
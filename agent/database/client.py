@@ -1,24 +1,53 @@
 """Supabase/PostgREST client initialization."""
 
-from postgrest import SyncPostgrestClient
+import threading
+from typing import TYPE_CHECKING, Optional
 
 from core.config import settings
+from core.http import get_sync_client
 
+if TYPE_CHECKING:
+    from postgrest import SyncPostgrestClient
 
-def get_postgrest_client() -> SyncPostgrestClient:
+
+def get_postgrest_client() -> "SyncPostgrestClient":
     """Get PostgREST client instance.
 
+    Requests go through the process-wide pooled sync client.
+
     Returns:
         Configured PostgREST client for Supabase
     """
+    from postgrest import SyncPostgrestClient
+
     return SyncPostgrestClient(
         base_url=f"{settings.SUPABASE_URL}/rest/v1",
         headers={
             "apikey": settings.SUPABASE_ANON_KEY,
             "Authorization": f"Bearer {settings.SUPABASE_ANON_KEY}",
         },
+        http_client=get_sync_client(),
     )
 
 
-# Singleton client instance
-postgrest: SyncPostgrestClient = get_postgrest_client()
+# Singleton client instance, created on first use so workers that never
+# touch the database don't import postgrest or open a client
+_postgrest: Optional["SyncPostgrestClient"] = None
+_postgrest_lock = threading.Lock()
+
+
+def get_postgrest() -> "SyncPostgrestClient":
+    """Return the shared PostgREST client, creating it on first call."""
+    global _postgrest
+    if _postgrest is None:
+        with _postgrest_lock:
+            if _postgrest is None:
+                _postgrest = get_postgrest_client()
+    return _postgrest
+
+
+def __getattr__(name: str):
+    # Keeps `from database.client import postgrest` working lazily
+    if name == "postgrest":
+        return get_postgrest()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
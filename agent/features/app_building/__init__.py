@@ -0,0 +1,19 @@
+"""App-building conversation feature slice.
+
+Gathers what a visitor wants built (type, features, platform) and hands it
+off to the team, driven by a table-driven state machine.
+"""
+
+from .models import AppBuildingState, Phase
+from .state_machine import Action, Transition, advance, derive_state
+from .templates import render_template
+
+__all__ = [
+    "Action",
+    "AppBuildingState",
+    "Phase",
+    "Transition",
+    "advance",
+    "derive_state",
+    "render_template",
+]
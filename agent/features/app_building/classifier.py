@@ -0,0 +1,91 @@
+"""Keyword classification of user messages in the app-building flow."""
+
+from dataclasses import dataclass
+
+
+NEW_REQUEST_KEYWORDS = (
+    'i want to build', 'i want a', 'i need a', 'i need an app',
+    'can you build', 'can you make', 'can you create',
+    'build me a', 'create a', 'make a', 'develop a',
+    'looking for an app', 'need an app for',
+)
+
+APP_TYPE_WORDS = (
+    'gym', 'restaurant', 'fitness', 'food', 'delivery', 'booking', 'scheduling',
+    'todo', 'task', 'finance', 'health', 'social', 'ecommerce', 'shopping',
+)
+
+# Feature words recognised in earlier turns
+HISTORY_FEATURE_KEYWORDS = (
+    'track', 'manage', 'show', 'workout', 'subscription', 'member', 'book',
+    'order', 'schedule', 'display', 'list', 'monitor',
+)
+
+# The current turn may be answering "what should it do?", so accept more
+CURRENT_FEATURE_KEYWORDS = HISTORY_FEATURE_KEYWORDS + (
+    'busy', 'notification', 'alert', 'remind',
+)
+
+PLATFORM_KEYWORDS = ('phone', 'mobile', 'ios', 'android', 'website', 'web')
+PHONE_KEYWORDS = ('phone', 'mobile', 'ios', 'android')
+
+AFFIRMATIVE_REPLIES = frozenset({
+    'yes', 'yeah', 'sure', 'yep', 'ok', 'okay', 'yes please', 'yes, please', 'y', 'yea',
+})
+
+
+@dataclass(frozen=True)
+class MessageSignals:
+    """Everything the state machine needs to know about one user message."""
+
+    is_new_request: bool
+    is_affirmative: bool
+    app_type: str
+    features: str
+    platform: str
+
+
+def is_new_app_building_request(message: str) -> bool:
+    """
+    Detect if the CURRENT message is starting a new app-building request.
+
+    Only the current message is checked, so a user switching topics
+    resets the flow.
+    """
+    message_lower = message.lower()
+    return any(keyword in message_lower for keyword in NEW_REQUEST_KEYWORDS)
+
+
+def detect_app_type(text_lower: str) -> str:
+    """e.g. "i want to build a gym app" -> "gym app"."""
+    for word in APP_TYPE_WORDS:
+        if word in text_lower:
+            return word + " app"
+    return ""
+
+
+def detect_platform(text_lower: str) -> str:
+    """Return "phone", "website" or "" for a lowercased message."""
+    if not any(word in text_lower for word in PLATFORM_KEYWORDS):
+        return ""
+    return "phone" if any(word in text_lower for word in PHONE_KEYWORDS) else "website"
+
+
+def detect_features(text: str, keywords: tuple[str, ...]) -> str:
+    """Return the message itself if it describes features, else ""."""
+    text_lower = text.lower()
+    return text if any(word in text_lower for word in keywords) else ""
+
+
+def classify_message(message: str) -> MessageSignals:
+    """Extract app-building signals from the current user message."""
+    message_lower = message.lower()
+    is_new_request = is_new_app_building_request(message)
+
+    return MessageSignals(
+        is_new_request=is_new_request,
+        is_affirmative=message_lower.strip() in AFFIRMATIVE_REPLIES,
+        app_type=detect_app_type(message_lower) if is_new_request else "",
+        features=detect_features(message, CURRENT_FEATURE_KEYWORDS),
+        platform=detect_platform(message_lower),
+    )
@@ -0,0 +1,28 @@
+"""Data models for the app-building flow."""
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+# Conversation phases, in the order a visitor normally moves through them
+Phase = Literal[
+    "collecting_type",
+    "collecting_features",
+    "collecting_platform",
+    "awaiting_confirmation",
+    "handed_off",
+]
+
+
+class AppBuildingState(BaseModel):
+    """App-building progress carried between chat turns."""
+
+    phase: Phase = Field("collecting_type", description="Current conversation phase")
+    app_type: str = Field("", description='Detected app type, e.g. "gym app"')
+    features: str = Field("", description="User's description of what the app should do")
+    platform: str = Field("", description='"phone" or "website"')
+
+    def summary(self) -> str:
+        """Handoff summary passed to the team."""
+        return f"App for {self.platform or 'phone'} - {self.features or 'custom app'}"
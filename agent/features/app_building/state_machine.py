@@ -0,0 +1,190 @@
+"""Table-driven state machine for the app-building flow.
+
+Each turn the user message is classified into candidate events (in
+priority order). The first (phase, event) pair present in TRANSITIONS
+decides the next phase and the action. Forced actions carry their full
+response and never touch the model; the others carry an instruction for
+the LLM to phrase the question.
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+from .classifier import (
+    HISTORY_FEATURE_KEYWORDS,
+    MessageSignals,
+    classify_message,
+    detect_features,
+    detect_platform,
+)
+from .models import AppBuildingState, Phase
+
+
+class Event(str, Enum):
+    """Classified meaning of a user message."""
+
+    NEW_REQUEST = "new_request"
+    AFFIRM = "affirm"
+    HAS_PLATFORM = "has_platform"  # platform known (features may be too)
+    HAS_FEATURES = "has_features"  # features known, platform still missing
+    NO_DETAILS = "no_details"
+
+
+class Action(str, Enum):
+    """What to do in response to a transition."""
+
+    ASK_FEATURES = "ask_features"  # LLM: "A gym app, nice! What would you want it to do?"
+    ASK_WHAT_IT_DOES = "ask_what_it_does"  # LLM: what should the app do?
+    ASK_PLATFORM = "ask_platform"  # LLM: "Phone app or website?"
+    OFFER_HANDOFF = "offer_handoff"  # forced
+    CONFIRM_HANDOFF = "confirm_handoff"  # forced
+
+
+FORCED_ACTIONS = frozenset({Action.OFFER_HANDOFF, Action.CONFIRM_HANDOFF})
+
+# LLM actions whose instruction dictates the reply; a small model phrases them fine
+CONSTRAINED_ACTIONS = frozenset({Action.ASK_FEATURES, Action.ASK_WHAT_IT_DOES, Action.ASK_PLATFORM})
+
+PHASES: tuple[Phase, ...] = (
+    "collecting_type",
+    "collecting_features",
+    "collecting_platform",
+    "awaiting_confirmation",
+    "handed_off",
+)
+
+# (phase, event) -> (next phase, action)
+TRANSITIONS: dict[tuple[Phase, Event], tuple[Phase, Action]] = {
+    **{(phase, Event.NEW_REQUEST): ("collecting_features", Action.ASK_FEATURES) for phase in PHASES},
+    **{(phase, Event.HAS_PLATFORM): ("awaiting_confirmation", Action.OFFER_HANDOFF) for phase in PHASES},
+    **{(phase, Event.HAS_FEATURES): ("collecting_platform", Action.ASK_PLATFORM) for phase in PHASES},
+    **{(phase, Event.NO_DETAILS): ("collecting_features", Action.ASK_WHAT_IT_DOES) for phase in PHASES},
+    ("awaiting_confirmation", Event.AFFIRM): ("handed_off", Action.CONFIRM_HANDOFF),
+}
+
+OFFER_HANDOFF_RESPONSE = "Want me to pass this to the team?"
+CONFIRM_HANDOFF_RESPONSE = "Great, I'll let the team know!"
+
+
+@dataclass
+class Transition:
+    """Outcome of one turn through the state machine."""
+
+    state: AppBuildingState
+    action: Action
+
+    @property
+    def is_forced(self) -> bool:
+        """True if the response is fixed and no model call is needed."""
+        return self.action in FORCED_ACTIONS
+
+    @property
+    def is_constrained(self) -> bool:
+        """True if the model only has to phrase a fixed one-line question."""
+        return self.action in CONSTRAINED_ACTIONS
+
+    @property
+    def forced_response(self) -> Optional[str]:
+        if self.action == Action.OFFER_HANDOFF:
+            return OFFER_HANDOFF_RESPONSE
+        if self.action == Action.CONFIRM_HANDOFF:
+            return CONFIRM_HANDOFF_RESPONSE
+        return None
+
+    @property
+    def handoff_summary(self) -> Optional[str]:
+        return self.state.summary() if self.is_forced else None
+
+    def instruction(self) -> Optional[str]:
+        """Instruction prefix for the LLM, or None for forced actions."""
+        if self.action == Action.ASK_FEATURES:
+            return (
+                f"[INSTRUCTION: The user wants to build a {self.state.app_type or 'new app'}. "
+                "In ONE friendly short sentence, ask what features they want it to have. "
+                'Example: "A gym app, nice! What would you want it to do?"]'
+            )
+        if self.action == Action.ASK_PLATFORM:
+            return '[INSTRUCTION: Say ONLY this: "Phone app or website?" - nothing else]'
+        if self.action == Action.ASK_WHAT_IT_DOES:
+            return "[INSTRUCTION: You are a receptionist. ONE short sentence. Ask what the app should do.]"
+        return None
+
+
+def derive_state(history: list) -> AppBuildingState:
+    """
+    Rebuild state from conversation history for clients that don't carry it.
+
+    Args:
+        history: MessageHistoryItem-like objects with role and content
+
+    Returns:
+        Best-effort AppBuildingState
+    """
+    state = AppBuildingState()
+
+    for msg in history:
+        if msg.role == "user" and len(msg.content) > 5:
+            if not state.features:
+                state.features = detect_features(msg.content, HISTORY_FEATURE_KEYWORDS)
+            if not state.platform:
+                state.platform = detect_platform(msg.content.lower())
+
+    last = history[-1] if history else None
+    if last is not None and last.role == "assistant":
+        content_lower = last.content.lower()
+        if "pass" in content_lower and "team" in content_lower:
+            state.phase = "awaiting_confirmation"
+            return state
+
+    if state.features:
+        state.phase = "collecting_platform"
+    elif history:
+        state.phase = "collecting_features"
+    return state
+
+
+def _candidate_events(signals: MessageSignals, state: AppBuildingState) -> list[Event]:
+    """Events for this message, highest priority first."""
+    if signals.is_new_request:
+        return [Event.NEW_REQUEST]
+
+    events = [Event.AFFIRM] if signals.is_affirmative else []
+    if state.platform:
+        events.append(Event.HAS_PLATFORM)
+    elif state.features:
+        events.append(Event.HAS_FEATURES)
+    else:
+        events.append(Event.NO_DETAILS)
+    return events
+
+
+def advance(state: AppBuildingState, message: str) -> Transition:
+    """
+    Apply one user message to the state machine.
+
+    Args:
+        state: State carried from the previous turn (or derived from history)
+        message: The user's current message
+
+    Returns:
+        Transition with the new state and the action to take
+    """
+    signals = classify_message(message)
+
+    if signals.is_new_request:
+        # Topic switch: start over with only what this message says
+        next_state = AppBuildingState(app_type=signals.app_type)
+    else:
+        next_state = state.model_copy()
+        next_state.features = next_state.features or signals.features
+        next_state.platform = next_state.platform or signals.platform
+
+    for event in _candidate_events(signals, next_state):
+        entry = TRANSITIONS.get((state.phase, event))
+        if entry is not None:
+            next_state.phase, action = entry
+            return Transition(state=next_state, action=action)
+
+    # Every phase has a row for every details event, so this is unreachable
+    raise RuntimeError(f"No transition from {state.phase!r}")
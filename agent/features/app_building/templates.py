@@ -0,0 +1,72 @@
+"""Canned phrasings for the app-building questions.
+
+ASK_FEATURES, ASK_WHAT_IT_DOES and ASK_PLATFORM tell the model exactly
+what to say, so for most turns a template gives the same answer without a
+model call. The variant is picked from a hash of the user's message:
+replies vary between visitors but a replayed turn always gets the same
+text.
+
+Messages that ask something themselves ("a gym app - how long would that
+take?") still go to the model, which can acknowledge the question.
+"""
+
+import zlib
+from typing import Optional
+
+from .state_machine import Action, Transition
+
+
+# {app_type} is filled with the detected type, e.g. "gym app"
+TEMPLATES: dict[Action, tuple[str, ...]] = {
+    Action.ASK_FEATURES: (
+        "{article} {app_type}, nice! What would you want it to do?",
+        "Ooh, {article_lower} {app_type}! What should it do?",
+        "{article} {app_type} sounds great. What would you want it to do?",
+    ),
+    Action.ASK_WHAT_IT_DOES: (
+        "Nice! What would you want the app to do?",
+        "Love it! What should the app do?",
+        "Sounds great! What would you want it to do?",
+    ),
+    # The instruction says to say only this, so there is a single variant
+    Action.ASK_PLATFORM: ("Phone app or website?",),
+}
+
+
+def _article(word: str) -> str:
+    return "An" if word[:1].lower() in "aeiou" else "A"
+
+
+def _pick(variants: tuple[str, ...], message: str) -> str:
+    return variants[zlib.crc32(message.encode()) % len(variants)]
+
+
+def render_template(transition: Transition, message: str) -> Optional[str]:
+    """
+    Templated reply for a transition, or None if the model should answer.
+
+    Args:
+        transition: Outcome of advance() for this turn
+        message: The user's message
+
+    Returns:
+        Reply text, or None for forced actions, unknown actions and
+        messages that contain a question of their own
+    """
+    if "?" in message:
+        return None
+
+    action = transition.action
+    app_type = transition.state.app_type
+    if action == Action.ASK_FEATURES and not app_type:
+        # Nothing to interpolate; same question without the type
+        action = Action.ASK_WHAT_IT_DOES
+
+    variants = TEMPLATES.get(action)
+    if not variants:
+        return None
+
+    article = _article(app_type)
+    return _pick(variants, message).format(
+        app_type=app_type, article=article, article_lower=article.lower()
+    )
@@ -5,16 +5,22 @@ Siphio's business information from structured JSON files.
 """
 
 from .models import KnowledgeResult, SearchResultItem
+from .prefetch import render_context
+from .render import RenderedResults, count_tokens, render_results
 from .search import execute_search
 
-# Note: search_knowledge_base is registered directly on the agent
-# via @agent.tool decorator in tool.py. Import it separately to avoid
-# circular imports when importing just models/search.
+# Note: search_knowledge_base is registered on the agent by
+# core.agent.build_agent(). Import it separately to avoid pulling in
+# pydantic-ai when importing just models/search.
 
 __all__ = [
     "KnowledgeResult",
     "SearchResultItem",
+    "RenderedResults",
+    "count_tokens",
     "execute_search",
+    "render_context",
+    "render_results",
 ]
 
 
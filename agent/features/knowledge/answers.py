@@ -0,0 +1,56 @@
+"""Answers rendered directly from knowledge search results (no LLM)."""
+
+import re
+
+from .models import KnowledgeResult
+
+
+# Matches the "no info" guardrail phrasing in the system prompt
+NO_INFO_ANSWER = (
+    "Hmm, I don't have that info handy. "
+    "Want me to connect you with the team so they can help?"
+)
+
+
+_SENTENCE_END = re.compile(r"[.!?](?=\s)")
+
+
+def trim_snippet(text: str) -> str:
+    """
+    Cut a possibly truncated snippet back to its last complete sentence.
+
+    Search snippets are sliced at a fixed length, so they can end mid-word.
+    Falls back to the last whole word plus an ellipsis when no sentence ends.
+    """
+    text = text.replace("**", "").strip()
+    if text.endswith("..."):
+        # Ellipsis added by the slicing, not the content
+        text = text[:-3].rstrip()
+    if not text or text[-1] in ".!?":
+        return text
+
+    ends = list(_SENTENCE_END.finditer(text))
+    if ends:
+        return text[: ends[-1].end()]
+    head, _, _ = text.rpartition(" ")
+    return f"{head or text}..."
+
+
+def render_fallback_answer(result: KnowledgeResult) -> str:
+    """
+    Build a canned answer from the top search result.
+
+    Used when the model is unavailable, so it must read naturally without
+    any rewording step.
+
+    Args:
+        result: Search result for the user's question
+
+    Returns:
+        Short plain-text answer
+    """
+    if not result.found or not result.results:
+        return NO_INFO_ANSWER
+
+    top = result.results[0]
+    return f"Here's what I found on {top.title}: {trim_snippet(top.content)}"
@@ -0,0 +1,174 @@
+"""Deterministic answers for simple informational questions.
+
+A question qualifies when its normalized text matches one of the template
+classes below AND the lookup for that class returns the expected entries
+with a high score. Qualifying questions are answered from a short
+prerendered template, with zero model calls.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+from .models import CategoryType, SearchResultItem
+from .search import _load_data, execute_search
+
+
+@dataclass(frozen=True)
+class FastPathTemplate:
+    """One class of question answerable without the LLM."""
+
+    name: str
+    patterns: tuple[re.Pattern, ...]
+    lookup: Callable[[], Awaitable[list[SearchResultItem]]]
+    source_prefix: str
+    render: Callable[[list[SearchResultItem]], str]
+
+
+@dataclass
+class FastPathAnswer:
+    """Answer produced by the fast path."""
+
+    template: str
+    response: str
+    score: float
+
+
+def _join_names(names: list[str]) -> str:
+    if len(names) <= 1:
+        return "".join(names)
+    return f"{', '.join(names[:-1])} and {names[-1]}"
+
+
+def _render_about(results: list[SearchResultItem]) -> str:
+    return f"{results[0].content} Want to hear about our apps or services?"
+
+
+def _render_apps(results: list[SearchResultItem]) -> str:
+    names = [r.title for r in results]
+    return (
+        f"We've got {len(names)} apps right now: {_join_names(names)}. "
+        "Want to hear more about any of them?"
+    )
+
+
+def _render_pricing(results: list[SearchResultItem]) -> str:
+    return (
+        f"{results[0].content} "
+        "Want me to pass your idea to the team for a quote?"
+    )
+
+
+def _search(query: str, category: CategoryType) -> Callable[[], Awaitable[list[SearchResultItem]]]:
+    async def lookup() -> list[SearchResultItem]:
+        return (await execute_search(query, category)).results
+
+    return lookup
+
+
+async def _catalog_apps() -> list[SearchResultItem]:
+    # Every app in the catalog, not just those a search term happens to hit
+    apps = _load_data().get("apps", {}).get("apps", [])
+    return [
+        SearchResultItem(
+            title=app["name"],
+            content=app["tagline"],
+            relevance="Listed from the app catalog",
+            source=f"apps/{app['slug']}",
+            score=100.0,
+        )
+        for app in apps
+    ]
+
+
+def _patterns(*sources: str) -> tuple[re.Pattern, ...]:
+    # Patterns are matched against the whole normalized message
+    return tuple(re.compile(rf"^(?:(?:hi|hey|hello|so|and|ok|okay) )*(?:{s})$") for s in sources)
+
+
+TEMPLATES: tuple[FastPathTemplate, ...] = (
+    FastPathTemplate(
+        name="about",
+        patterns=_patterns(
+            r"what is siphio(?: ai)?",
+            r"who is siphio(?: ai)?",
+            r"(?:tell me|can you tell me) about siphio(?: ai)?",
+            r"what (?:does siphio|do you) do",
+        ),
+        lookup=_search("about siphio mission", "company"),
+        source_prefix="company/about",
+        render=_render_about,
+    ),
+    FastPathTemplate(
+        name="apps",
+        patterns=_patterns(
+            r"what apps do you (?:have|make|offer)",
+            r"what (?:are )?your (?:apps|products)",
+            r"what products do you (?:have|make|offer)",
+            r"(?:show me|list) your apps",
+        ),
+        lookup=_catalog_apps,
+        source_prefix="apps/",
+        render=_render_apps,
+    ),
+    FastPathTemplate(
+        name="pricing",
+        patterns=_patterns(
+            r"how much does (?:it|an app|a project|this) cost",
+            r"how much do you charge",
+            r"what (?:is|are) your (?:pricing|prices|rates)",
+            r"(?:pricing|price|prices|cost)",
+        ),
+        lookup=_search("pricing", "services"),
+        source_prefix="services/pricing",
+        render=_render_pricing,
+    ),
+)
+
+
+_NON_WORD = re.compile(r"[^a-z0-9' ]+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_question(message: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace."""
+    text = _NON_WORD.sub(" ", message.lower()).replace("'", "")
+    return _SPACES.sub(" ", text).strip()
+
+
+def match_template(message: str) -> Optional[FastPathTemplate]:
+    """Return the template class a message belongs to, if any."""
+    normalized = normalize_question(message)
+    for template in TEMPLATES:
+        if any(pattern.match(normalized) for pattern in template.patterns):
+            return template
+    return None
+
+
+async def answer_fast_path(message: str, min_score: float) -> Optional[FastPathAnswer]:
+    """
+    Answer a simple informational question without the model.
+
+    Args:
+        message: The user's message
+        min_score: Search score every used result must reach
+
+    Returns:
+        FastPathAnswer, or None if the model should handle the message
+    """
+    template = match_template(message)
+    if template is None:
+        return None
+
+    confident = [
+        r for r in await template.lookup()
+        if r.source.startswith(template.source_prefix) and r.score >= min_score
+    ]
+    if not confident:
+        return None
+
+    return FastPathAnswer(
+        template=template.name,
+        response=template.render(confident),
+        score=confident[0].score,
+    )
@@ -0,0 +1,45 @@
+"""Speculative knowledge search for informational turns.
+
+Informational questions almost always make the model call
+search_knowledge_base first, which costs a second model round trip.
+Searching the user's message up front and sending the top results with
+the turn lets the model answer in one pass; the tool stays registered
+for questions the prefetched results don't cover.
+"""
+
+from typing import Optional
+
+from .models import KnowledgeResult
+from .render import record_render, render_results
+
+
+def render_context(result: KnowledgeResult, max_results: int = 3, budget: int = 600) -> Optional[str]:
+    """
+    Format prefetched results as a per-turn instruction for the model.
+
+    Args:
+        result: execute_search() result for the user's message
+        max_results: Results to include, best first
+        budget: Approximate token budget for the results (see
+            render_results); 0 sends the top results as full JSON
+
+    Returns:
+        Instruction text, or None if nothing was found
+    """
+    if not result.found or not result.results:
+        return None
+
+    if budget <= 0:
+        # No compaction, matching the tool's full JSON result
+        top = sorted(result.results, key=lambda item: item.score, reverse=True)[:max_results]
+        text = result.model_copy(update={"results": top}).model_dump_json()
+    else:
+        rendered = render_results(result, budget, max_results=max_results)
+        record_render(rendered, path="prefetch")
+        text = rendered.text
+    return "\n".join([
+        "[CONTEXT: search_knowledge_base was already run for this message.",
+        text,
+        "Answer from these results. Only call search_knowledge_base if they "
+        "don't cover the question.]",
+    ])
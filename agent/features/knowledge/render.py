@@ -0,0 +1,168 @@
+"""Token-budgeted rendering of knowledge results for the model.
+
+A "detailed" search can return five long results (tech stacks, approaches,
+full descriptions), and every tool return is carried in the context of
+every later model request in the run. render_results() compacts a result
+to a token budget:
+
+- results whose content nearly repeats a better-scoring one are dropped
+- each remaining result, best first, gets an equal share of what is left
+  of the budget (short results leave more for the next; a tight budget
+  still gives the best results a useful minimum), and long content is cut
+  at a word boundary
+- results that no longer fit are left out; the header says how many, so
+  the model can search again more narrowly
+
+Tokens are estimated locally, without a tokenizer: words count one token
+per ~4 characters beyond the first 6, numbers one per 3 digits, and every
+other symbol one. That tracks BPE tokenizers closely enough for budgeting
+without tying the renderer to one provider's vocabulary.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from core.metrics import metrics
+
+from .models import KnowledgeResult, SearchResultItem
+
+
+_TOKEN_PATTERN = re.compile(r"[A-Za-z]+|\d+|\S")
+
+# token_set_ratio at or above this marks content as a near-duplicate
+NEAR_DUPLICATE_SCORE = 90.0
+
+# A result is only included if at least this many tokens of it fit
+MIN_RESULT_TOKENS = 24
+
+
+def _piece_tokens(piece: str) -> int:
+    if piece[0].isalpha():
+        return 1 + max(0, len(piece) - 3) // 4
+    if piece[0].isdigit():
+        return (len(piece) + 2) // 3
+    return 1
+
+
+def count_tokens(text: str) -> int:
+    """Estimate the number of tokens in text."""
+    return sum(_piece_tokens(piece) for piece in _TOKEN_PATTERN.findall(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to at most max_tokens tokens, marking the cut with an ellipsis."""
+    if count_tokens(text) <= max_tokens:
+        return text
+    used = 1  # The ellipsis
+    for match in _TOKEN_PATTERN.finditer(text):
+        used += _piece_tokens(match.group())
+        if used > max_tokens:
+            return text[:match.start()].rstrip() + " …"
+    return text
+
+
+@dataclass
+class RenderedResults:
+    """Compacted knowledge results and what compaction saved."""
+
+    text: str
+    tokens: int
+    # Tokens in the uncompacted result (the full JSON)
+    full_tokens: int
+    included: int = 0
+    duplicates_dropped: int = 0
+    truncated: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.full_tokens - self.tokens)
+
+
+def drop_near_duplicates(items: list[SearchResultItem]) -> list[SearchResultItem]:
+    """Keep the first of any results whose content nearly repeats another's."""
+    from rapidfuzz import fuzz
+
+    kept: list[SearchResultItem] = []
+    for item in items:
+        if not any(
+            fuzz.token_set_ratio(item.content, other.content) >= NEAR_DUPLICATE_SCORE
+            for other in kept
+        ):
+            kept.append(item)
+    return kept
+
+
+def _entry(index: int, item: SearchResultItem, content: str) -> str:
+    return f"[{index}] {item.title} ({item.source})\n{content}"
+
+
+def render_results(
+    result: KnowledgeResult,
+    budget: int,
+    max_results: Optional[int] = None,
+) -> RenderedResults:
+    """
+    Render a search result as compact text within a token budget.
+
+    Args:
+        result: execute_search() result
+        budget: Tokens the rendered text may use (approximately)
+        max_results: Results to consider, best first (None = all)
+
+    Returns:
+        RenderedResults with the text and token accounting
+    """
+    if not result.found or not result.results:
+        text = f'No results for "{result.query}".'
+        if result.suggestion:
+            text += f" {result.suggestion}"
+        return RenderedResults(
+            text=text, tokens=count_tokens(text), full_tokens=count_tokens(result.model_dump_json())
+        )
+
+    candidates = sorted(result.results, key=lambda item: item.score, reverse=True)
+    if max_results is not None:
+        candidates = candidates[:max_results]
+    # Savings are measured against the same candidates sent as JSON
+    full_tokens = count_tokens(result.model_copy(update={"results": candidates}).model_dump_json())
+    unique = drop_near_duplicates(candidates)
+
+    entries: list[str] = []
+    truncated = 0
+    # Header is written last but its size is reserved up front
+    remaining = budget - count_tokens(f'Results for "{result.query}" (0 of 0 shown; 0 left out):')
+    for position, item in enumerate(unique):
+        overhead = count_tokens(_entry(len(entries) + 1, item, ""))
+        if remaining - overhead < MIN_RESULT_TOKENS:
+            break
+        # An equal share of what is left, but never less than a useful minimum
+        share = max(remaining // (len(unique) - position), overhead + MIN_RESULT_TOKENS)
+
+        content = item.content
+        if count_tokens(content) > share - overhead:
+            content = truncate_to_tokens(content, share - overhead)
+            truncated += 1
+        entry = _entry(len(entries) + 1, item, content)
+        entries.append(entry)
+        remaining -= count_tokens(entry)
+
+    left_out = len(result.results) - len(entries)
+    header = f'Results for "{result.query}" ({len(entries)} of {len(result.results)} shown'
+    header += f"; {left_out} left out):" if left_out else "):"
+    text = "\n\n".join([header, *entries])
+    return RenderedResults(
+        text=text,
+        tokens=count_tokens(text),
+        full_tokens=full_tokens,
+        included=len(entries),
+        duplicates_dropped=len(candidates) - len(unique),
+        truncated=truncated,
+    )
+
+
+def record_render(rendered: RenderedResults, path: str) -> None:
+    """Publish token accounting for one rendered result."""
+    metrics.incr("knowledge_render_tokens_saved_total", rendered.tokens_saved, path=path)
+    metrics.incr("knowledge_render_duplicates_dropped_total", rendered.duplicates_dropped, path=path)
+    metrics.observe("knowledge_render_tokens", rendered.tokens, path=path)
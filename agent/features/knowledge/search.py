@@ -4,7 +4,8 @@ import json
 from pathlib import Path
 from typing import Optional
 
-from rapidfuzz import fuzz
+from core.cache import get_cache
+from core.config import settings
 
 from .models import KnowledgeResult, SearchResultItem, CategoryType, ResponseFormat
 
@@ -33,6 +34,9 @@ def _load_data() -> dict:
 
 def _calculate_score(query: str, text: str) -> float:
     """Calculate match score using fuzzy matching."""
+    # Imported here so loading this module (e.g. via main) stays cheap
+    from rapidfuzz import fuzz
+
     query_lower = query.lower()
     text_lower = text.lower()
 
@@ -276,6 +280,12 @@ async def execute_search(
     Returns:
         KnowledgeResult with matching results or suggestions
     """
+    cache_key = f"knowledge:{response_format}:{category or 'all'}:{query.strip().lower()}"
+    cache = get_cache()
+    cached = await cache.get_async(cache_key)
+    if cached is not None:
+        return KnowledgeResult.model_validate(cached)
+
     all_results: list[SearchResultItem] = []
 
     # Search specified category or all
@@ -296,10 +306,12 @@ async def execute_search(
     found = len(top_results) > 0
     suggestion = None if found else _get_suggestion(query, category)
 
-    return KnowledgeResult(
+    result = KnowledgeResult(
         found=found,
         category=category or "all",
         results=top_results,
         suggestion=suggestion,
         query=query,
     )
+    await cache.set_async(cache_key, result.model_dump(mode="json"), ttl=settings.KNOWLEDGE_CACHE_TTL_SECONDS)
+    return result
@@ -4,18 +4,19 @@ from typing import Optional
 
 from pydantic_ai import RunContext
 
-from core.agent import agent
-from .models import KnowledgeResult, CategoryType, ResponseFormat
+from core.config import settings
+
+from .models import CategoryType, ResponseFormat
+from .render import record_render, render_results
 from .search import execute_search
 
 
-@agent.tool
 async def search_knowledge_base(
     ctx: RunContext[None],
     query: str,
     category: Optional[CategoryType] = None,
     response_format: ResponseFormat = "concise",
-) -> KnowledgeResult:
+) -> str:
     """Search Siphio's knowledge base for accurate business information.
 
     Use this tool to find information about Siphio's products, services,
@@ -31,6 +32,14 @@ async def search_knowledge_base(
                         "detailed" for comprehensive information
 
     Returns:
-        KnowledgeResult containing matching results or suggestions
+        Matching results (best first) or a suggestion, as compact text
     """
-    return await execute_search(query, category, response_format)
+    result = await execute_search(query, category, response_format)
+    if settings.KNOWLEDGE_TOOL_TOKEN_BUDGET <= 0:
+        # Serialized once here: a model object would be re-encoded for every
+        # later model request that carries this tool return in its history
+        return result.model_dump_json()
+
+    rendered = render_results(result, settings.KNOWLEDGE_TOOL_TOKEN_BUDGET)
+    record_render(rendered, path="tool")
+    return rendered.text
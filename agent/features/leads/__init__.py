@@ -1,12 +1,21 @@
 """Lead capture feature slice."""
 
-from .models import LeadResult, InquiryType
+from .models import LeadResult, LeadStatus, InquiryType
 from .capture import execute_capture
+from .importer import ImportStats, import_leads
+from .lookup import get_lead_status, stream_leads
+from .retention import archive_old_leads
 
 __all__ = [
     "LeadResult",
+    "LeadStatus",
     "InquiryType",
     "execute_capture",
+    "ImportStats",
+    "import_leads",
+    "get_lead_status",
+    "stream_leads",
+    "archive_old_leads",
 ]
 
 
@@ -1,5 +1,6 @@
 """Lead capture business logic."""
 
+import hashlib
 import uuid
 from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING
@@ -13,8 +14,29 @@ if TYPE_CHECKING:
 
 def _get_postgrest() -> "SyncPostgrestClient":
     """Lazy import of postgrest client to avoid circular imports."""
-    from database.client import postgrest
-    return postgrest
+    from database.client import get_postgrest
+    return get_postgrest()
+
+
+def _get_cache():
+    """Lazy import of the shared cache backend."""
+    from core.cache import get_cache
+    return get_cache()
+
+
+def _dedup_key(email: str) -> str:
+    # Hash so raw emails never land in the (possibly on-disk) cache
+    digest = hashlib.sha256(email.lower().strip().encode()).hexdigest()
+    return f"lead_email:{digest}"
+
+
+# Fresh reference ids tried when one collides with the unique index
+REFERENCE_ID_ATTEMPTS = 3
+
+
+def _is_unique_violation(error: Exception) -> bool:
+    # postgrest.APIError carries the Postgres SQLSTATE as .code
+    return getattr(error, "code", None) == "23505"
 
 
 def _generate_reference_id() -> str:
@@ -31,6 +53,10 @@ def _check_duplicate(email: str) -> bool:
     Returns:
         True if duplicate found
     """
+    # A hit means we inserted this email recently (any worker on the host)
+    if _get_cache().get(_dedup_key(email)):
+        return True
+
     cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
     cutoff_iso = cutoff.isoformat()
 
@@ -38,7 +64,7 @@ def _check_duplicate(email: str) -> bool:
     result = (
         postgrest.from_("leads")
         .select("id")
-        .eq("email", email.lower().strip())
+        .eq("email_normalized", email.lower().strip())
         .gte("created_at", cutoff_iso)
         .limit(1)
         .execute()
@@ -59,18 +85,26 @@ def _insert_lead(
     Returns:
         Generated reference ID
     """
-    reference_id = _generate_reference_id()
-
     postgrest = _get_postgrest()
-    postgrest.from_("leads").insert({
-        "name": name.strip(),
-        "email": email.lower().strip(),
-        "conversation_summary": conversation_summary,
-        "inquiry_type": inquiry_type,
-        "is_duplicate": is_duplicate,
-        "reference_id": reference_id,
-    }).execute()
-
+    for attempt in range(REFERENCE_ID_ATTEMPTS):
+        reference_id = _generate_reference_id()
+        try:
+            postgrest.from_("leads").insert({
+                "name": name.strip(),
+                "email": email.lower().strip(),
+                "conversation_summary": conversation_summary,
+                "inquiry_type": inquiry_type,
+                "is_duplicate": is_duplicate,
+                "reference_id": reference_id,
+            }).execute()
+            break
+        except Exception as e:
+            if not _is_unique_violation(e) or attempt == REFERENCE_ID_ATTEMPTS - 1:
+                raise
+
+    from core.config import settings
+
+    _get_cache().set(_dedup_key(email), True, ttl=settings.LEAD_DEDUP_CACHE_TTL_SECONDS)
     return reference_id
 
 
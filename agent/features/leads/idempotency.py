@@ -0,0 +1,140 @@
+"""Idempotency keys for lead capture.
+
+A retried submission (proxy retry, double click) would otherwise run the
+duplicate check and insert again, minting a second reference ID. With an
+Idempotency-Key, the first successful response is stored and returned for
+every repeat of that key without touching the database, and repeats that
+arrive while the first attempt is still running wait for its result
+instead of inserting in parallel. If that first attempt is cancelled (its
+client disconnected), one waiter retries it and the others wait for that.
+
+Responses live in a cache backend: a bounded per-worker MemoryCache by
+default, or the shared cache (persistent with CACHE_BACKEND=sqlite) so a
+retry landing on another worker is also answered. In-flight coalescing is
+per worker.
+"""
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Optional
+
+from core.cache import CacheBackend, MemoryCache, get_cache
+from core.metrics import metrics
+
+
+class IdempotencyConflict(Exception):
+    """An idempotency key was reused with a different request."""
+
+
+def request_fingerprint(payload: dict) -> str:
+    """Hash of a request body, to tell a retry from a different request."""
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+class IdempotencyStore:
+    """Stored responses and in-flight attempts, keyed by idempotency key."""
+
+    def __init__(self, backend: CacheBackend, ttl: float, namespace: str = "idempotency"):
+        """
+        Args:
+            backend: Where completed responses are kept
+            ttl: Seconds a completed response is replayed for
+            namespace: Cache key prefix (and metrics label)
+        """
+        self.backend = backend
+        self.ttl = ttl
+        self.namespace = namespace
+        self._inflight: dict[str, tuple[str, asyncio.Future]] = {}
+
+    def _key(self, key: str) -> str:
+        # Hash so client-chosen keys can't collide with other cache entries
+        return f"{self.namespace}:{hashlib.sha256(key.encode()).hexdigest()}"
+
+    async def run(
+        self,
+        key: str,
+        fingerprint: str,
+        operation: Callable[[], Awaitable[dict]],
+        should_store: Callable[[dict], bool] = lambda response: True,
+    ) -> tuple[dict, bool]:
+        """
+        Run operation once per key.
+
+        Args:
+            key: Client-supplied idempotency key
+            fingerprint: request_fingerprint() of the request
+            operation: Produces the JSON-ready response
+            should_store: Whether a response may be replayed (failures
+                worth retrying should not be)
+
+        Returns:
+            (response, replayed): replayed is True if the response came
+            from an earlier or concurrent attempt
+
+        Raises:
+            IdempotencyConflict: The key was used with a different request
+        """
+        cache_key = self._key(key)
+
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            inflight_fingerprint, future = inflight
+            if inflight_fingerprint != fingerprint:
+                raise IdempotencyConflict(key)
+            metrics.incr("idempotency_requests_total", namespace=self.namespace, outcome="coalesced")
+            try:
+                # shield: a waiter disconnecting must not cancel the first attempt
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                # The first attempt was cancelled (its client went away), not
+                # this request: retry. Its in-flight entry is already gone, so
+                # the first waiter back takes over and the rest coalesce onto it.
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                return await self.run(key, fingerprint, operation, should_store)
+
+        # Registered before the (possibly off-thread) lookup, so repeats
+        # arriving meanwhile wait here instead of running the operation too
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = (fingerprint, future)
+        try:
+            stored: Optional[dict[str, Any]] = await self.backend.get_async(cache_key)
+            if stored is not None:
+                if stored["fingerprint"] != fingerprint:
+                    raise IdempotencyConflict(key)
+                metrics.incr("idempotency_requests_total", namespace=self.namespace, outcome="replayed")
+                future.set_result(stored["response"])
+                return stored["response"], True
+
+            metrics.incr("idempotency_requests_total", namespace=self.namespace, outcome="executed")
+            response = await operation()
+            if should_store(response):
+                # Stored before the in-flight entry goes, so no repeat slips between
+                await self.backend.set_async(
+                    cache_key, {"fingerprint": fingerprint, "response": response}, ttl=self.ttl
+                )
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Retrieved here so an unawaited future doesn't log it
+            raise
+        finally:
+            self._inflight.pop(cache_key, None)
+
+        future.set_result(response)
+        return response, False
+
+
+def build_idempotency_store(settings) -> IdempotencyStore:
+    """Create the lead idempotency store configured by Settings."""
+    if settings.LEAD_IDEMPOTENCY_STORE == "cache":
+        backend: CacheBackend = get_cache()
+    else:
+        backend = MemoryCache(
+            max_entries=settings.LEAD_IDEMPOTENCY_MAX_KEYS,
+            default_ttl=settings.LEAD_IDEMPOTENCY_TTL_SECONDS,
+        )
+    return IdempotencyStore(backend, ttl=settings.LEAD_IDEMPOTENCY_TTL_SECONDS, namespace="lead_idempotency")
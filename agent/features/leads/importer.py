@@ -0,0 +1,230 @@
+"""Bulk lead import from CSV or JSONL files.
+
+Rows are streamed from the file and handled a chunk at a time: each chunk
+is validated in one pass, checked against leads captured in the last 24
+hours with one query per DUPLICATE_LOOKUP_SIZE emails, and inserted with
+one request. Only the current chunk is held in memory.
+
+Duplicates within a chunk are caught locally. Earlier chunks have already
+been inserted by the time a later one is checked, so the 24h lookup also
+catches repeats across the file (reported as "duplicate_recent"); a dry
+run inserts nothing and only catches repeats within a chunk.
+"""
+
+import csv
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Optional, get_args
+
+from .models import InquiryType
+from .validation import validate_emails_bulk, validate_name
+
+if TYPE_CHECKING:
+    from postgrest import SyncPostgrestClient
+
+
+INQUIRY_TYPES = frozenset(get_args(InquiryType))
+
+# Emails per duplicate lookup; keeps the in.(...) filter within URL limits
+DUPLICATE_LOOKUP_SIZE = 100
+
+
+@dataclass
+class ImportStats:
+    """Counts for one import run."""
+
+    read: int = 0
+    imported: int = 0
+    rejected: int = 0
+
+
+def _get_postgrest() -> "SyncPostgrestClient":
+    """Lazy import of postgrest client to avoid circular imports."""
+    from database.client import get_postgrest
+    return get_postgrest()
+
+
+def read_rows(path: Path, fmt: Optional[str] = None) -> Iterator[tuple[int, dict]]:
+    """Stream (line number, row) pairs from a CSV or JSONL file.
+
+    Args:
+        path: Input file
+        fmt: "csv" or "jsonl"; inferred from the suffix when omitted
+
+    Yields:
+        Line number and row dict; unparseable JSONL lines yield {"_error": ...}
+    """
+    fmt = fmt or ("csv" if path.suffix.lower() == ".csv" else "jsonl")
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+            return
+
+        for line_num, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                row = {"_error": f"Invalid JSON: {e.msg}"}
+            if not isinstance(row, dict):
+                row = {"_error": "Expected a JSON object"}
+            yield line_num, row
+
+
+def chunks(rows: Iterable, size: int) -> Iterator[list]:
+    """Split an iterable into lists of at most size items."""
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def recent_emails(emails: list[str]) -> set[str]:
+    """Normalized emails among these with a lead captured in the last 24 hours."""
+    cutoff = (datetime.now(timezone.utc) - timedelta(hours=24)).isoformat()
+    found: set[str] = set()
+    for batch in chunks(emails, DUPLICATE_LOOKUP_SIZE):
+        result = (
+            _get_postgrest()
+            .from_("leads")
+            .select("email_normalized")
+            .in_("email_normalized", batch)
+            .gte("created_at", cutoff)
+            .execute()
+        )
+        found.update(row["email_normalized"] for row in result.data)
+    return found
+
+
+def insert_leads(rows: list[dict]) -> None:
+    """Insert a batch of validated leads."""
+    from .capture import REFERENCE_ID_ATTEMPTS, _generate_reference_id, _is_unique_violation
+
+    postgrest = _get_postgrest()
+    for attempt in range(REFERENCE_ID_ATTEMPTS):
+        batch = [{**row, "reference_id": _generate_reference_id()} for row in rows]
+        try:
+            postgrest.from_("leads").insert(batch).execute()
+            return
+        except Exception as e:
+            if not _is_unique_violation(e) or attempt == REFERENCE_ID_ATTEMPTS - 1:
+                raise
+
+
+def validate_chunk(
+    chunk: list[tuple[int, dict]],
+    default_summary: str,
+) -> tuple[list[tuple[int, dict]], list[dict]]:
+    """Validate a chunk of rows.
+
+    Args:
+        chunk: (line number, raw row) pairs
+        default_summary: conversation_summary for rows without one
+
+    Returns:
+        (line number, lead row) pairs ready to insert, and reject records
+    """
+    email_errors = validate_emails_bulk([str(row.get("email") or "") for _, row in chunk])
+
+    accepted: list[tuple[int, dict]] = []
+    rejects: list[dict] = []
+    seen: set[str] = set()
+    for (line, row), email_error in zip(chunk, email_errors):
+        name = str(row.get("name") or "")
+        inquiry_type = str(row.get("inquiry_type") or "other")
+
+        if "_error" in row:
+            reason, error = "invalid", row["_error"]
+        elif email_error:
+            reason, error = "invalid", email_error
+        elif not (name_check := validate_name(name))[0]:
+            reason, error = "invalid", name_check[1]
+        elif inquiry_type not in INQUIRY_TYPES:
+            reason, error = "invalid", f"Unknown inquiry_type: {inquiry_type}"
+        else:
+            email = str(row["email"]).strip().lower()
+            if email in seen:
+                reason, error = "duplicate_in_file", "Email appears earlier in the file"
+            else:
+                seen.add(email)
+                accepted.append((line, {
+                    "name": name.strip(),
+                    "email": email,
+                    "conversation_summary": str(row.get("conversation_summary") or default_summary),
+                    "inquiry_type": inquiry_type,
+                    "is_duplicate": False,
+                }))
+                continue
+
+        rejects.append({"line": line, "reason": reason, "error": error, "row": row})
+
+    return accepted, rejects
+
+
+def import_leads(
+    rows: Iterable[tuple[int, dict]],
+    on_reject: Callable[[dict], None],
+    batch_size: int = 500,
+    default_summary: str = "Imported lead",
+    dry_run: bool = False,
+    find_recent: Optional[Callable[[list[str]], set[str]]] = None,
+    insert: Optional[Callable[[list[dict]], None]] = None,
+) -> ImportStats:
+    """Validate, dedup and insert leads a batch at a time.
+
+    Args:
+        rows: (line number, row) pairs, e.g. from read_rows()
+        on_reject: Called with each reject record as soon as it is known
+        batch_size: Rows validated and inserted together
+        default_summary: conversation_summary for rows without one
+        dry_run: Validate and dedup without inserting
+        find_recent: Returns the emails already captured in the last 24h
+            (default: recent_emails)
+        insert: Inserts one batch of lead rows (default: insert_leads)
+
+    Returns:
+        ImportStats for the run
+    """
+    find_recent = find_recent or recent_emails
+    insert = insert or insert_leads
+
+    stats = ImportStats()
+    for chunk in chunks(rows, batch_size):
+        stats.read += len(chunk)
+        accepted, rejects = validate_chunk(chunk, default_summary)
+
+        recent = find_recent([lead["email"] for _, lead in accepted]) if accepted else set()
+        pending = []
+        for line, lead in accepted:
+            if lead["email"] in recent:
+                rejects.append({
+                    "line": line,
+                    "reason": "duplicate_recent",
+                    "error": "A lead with this email was captured in the last 24 hours",
+                    "row": lead,
+                })
+            else:
+                pending.append((line, lead))
+
+        if pending and not dry_run:
+            try:
+                insert([lead for _, lead in pending])
+            except Exception as e:
+                error = f"Insert failed: {type(e).__name__}: {e}"
+                rejects.extend(
+                    {"line": line, "reason": "insert_failed", "error": error, "row": lead}
+                    for line, lead in pending
+                )
+                pending = []
+
+        stats.imported += len(pending)
+        stats.rejected += len(rejects)
+        for reject in sorted(rejects, key=lambda r: r["line"]):
+            on_reject(reject)
+
+    return stats
@@ -0,0 +1,148 @@
+"""Lead lookup by reference ID and keyset-paginated listing.
+
+Reference IDs are handed to users at capture time. get_lead_status()
+resolves one through a short-TTL read-through cache (misses included, so
+repeated lookups of unknown IDs don't reach the database either), falling
+back to the archive for leads past the retention window.
+
+stream_leads() walks the leads table newest first with keyset pagination
+on (created_at, id): each page is a bounded index range scan no matter how
+deep the listing goes, and only one page is held in memory at a time.
+"""
+
+import asyncio
+import re
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+
+from .models import LeadStatus
+
+if TYPE_CHECKING:
+    from postgrest import SyncPostgrestClient
+
+
+REFERENCE_ID_PATTERN = re.compile(r"^SIPH-[0-9A-F]{8}$")
+
+STATUS_COLUMNS = "reference_id,inquiry_type,created_at"
+LIST_COLUMNS = "id,reference_id,name,email,inquiry_type,is_duplicate,conversation_summary,created_at"
+
+
+def _get_postgrest() -> "SyncPostgrestClient":
+    """Lazy import of postgrest client to avoid circular imports."""
+    from database.client import get_postgrest
+    return get_postgrest()
+
+
+def _get_cache():
+    """Lazy import of the shared cache backend."""
+    from core.cache import get_cache
+    return get_cache()
+
+
+def _lookup_key(reference_id: str) -> str:
+    return f"lead_ref:{reference_id}"
+
+
+def _fetch_status(reference_id: str) -> Optional[dict]:
+    postgrest = _get_postgrest()
+    for table, status in (("leads", "received"), ("leads_archive", "archived")):
+        result = (
+            postgrest.from_(table)
+            .select(STATUS_COLUMNS)
+            .eq("reference_id", reference_id)
+            .limit(1)
+            .execute()
+        )
+        if result.data:
+            return {**result.data[0], "status": status}
+    return None
+
+
+def get_lead_status(reference_id: str) -> Optional[LeadStatus]:
+    """Look up a lead by the reference ID the user was given.
+
+    Args:
+        reference_id: e.g. "SIPH-1A2B3C4D" (case-insensitive)
+
+    Returns:
+        LeadStatus, or None if the ID is malformed or unknown
+    """
+    reference_id = reference_id.strip().upper()
+    if not REFERENCE_ID_PATTERN.match(reference_id):
+        return None
+
+    from core.config import settings
+
+    cache = _get_cache()
+    key = _lookup_key(reference_id)
+    entry = cache.get(key)
+    if entry is None:
+        entry = {"lead": _fetch_status(reference_id)}
+        cache.set(key, entry, ttl=settings.LEAD_LOOKUP_CACHE_TTL_SECONDS)
+
+    if entry["lead"] is None:
+        return None
+    return LeadStatus.model_validate(entry["lead"])
+
+
+def fetch_page(
+    page_size: int,
+    since: Optional[str] = None,
+    before: Optional[tuple[str, str]] = None,
+) -> list[dict]:
+    """Fetch one page of leads, newest first.
+
+    Args:
+        page_size: Rows per page
+        since: Only leads created at or after this ISO timestamp
+        before: (created_at, id) of the last row of the previous page
+
+    Returns:
+        Up to page_size lead rows
+    """
+    query = _get_postgrest().from_("leads").select(LIST_COLUMNS)
+    if since is not None:
+        query = query.gte("created_at", since)
+    if before is not None:
+        created_at, lead_id = before
+        query = query.or_(
+            f'created_at.lt."{created_at}",'
+            f'and(created_at.eq."{created_at}",id.lt.{lead_id})'
+        )
+    return (
+        query.order("created_at", desc=True)
+        .order("id", desc=True)
+        .limit(page_size)
+        .execute()
+        .data
+    )
+
+
+async def stream_leads(
+    page_size: int,
+    limit: Optional[int] = None,
+    since: Optional[str] = None,
+    before: Optional[tuple[str, str]] = None,
+) -> AsyncIterator[dict]:
+    """Yield leads newest first, one page in memory at a time.
+
+    Args:
+        page_size: Rows fetched per query
+        limit: Stop after this many rows (None = all)
+        since: Only leads created at or after this ISO timestamp
+        before: Resume after this (created_at, id) cursor
+
+    Yields:
+        Lead rows
+    """
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = page_size if remaining is None else min(page_size, remaining)
+        # postgrest is synchronous; keep the event loop free between pages
+        page = await asyncio.to_thread(fetch_page, size, since, before)
+        for row in page:
+            yield row
+        if remaining is not None:
+            remaining -= len(page)
+        if len(page) < size:
+            return
+        before = (page[-1]["created_at"], page[-1]["id"])
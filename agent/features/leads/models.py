@@ -1,5 +1,6 @@
 """Pydantic models for lead capture feature."""
 
+from datetime import datetime
 from typing import Optional, Literal
 from pydantic import BaseModel, Field
 
@@ -22,3 +23,14 @@ class LeadResult(BaseModel):
     is_duplicate: bool = Field(
         False, description="Whether this is a duplicate submission"
     )
+
+
+class LeadStatus(BaseModel):
+    """Public view of a captured lead, looked up by reference ID."""
+
+    reference_id: str = Field(..., description="Reference ID given to the user")
+    status: Literal["received", "archived"] = Field(
+        ..., description="Whether the lead is live or past the retention window"
+    )
+    inquiry_type: InquiryType = Field(..., description="Type of inquiry")
+    created_at: Optional[datetime] = Field(None, description="When the lead was captured")
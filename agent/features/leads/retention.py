@@ -0,0 +1,63 @@
+"""Archival of leads past the retention window.
+
+The archive_leads() SQL function moves one batch of old leads into the
+month-partitioned leads_archive table. archive_old_leads() calls it until
+a batch comes back short, so every batch is its own short transaction and
+never holds locks on the live table for long.
+"""
+
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from postgrest import SyncPostgrestClient
+
+
+def _get_postgrest() -> "SyncPostgrestClient":
+    """Lazy import of postgrest client to avoid circular imports."""
+    from database.client import get_postgrest
+    return get_postgrest()
+
+
+def archive_batch(retention_days: int, batch_size: int) -> int:
+    """Move one batch of expired leads to the archive.
+
+    Returns:
+        Number of leads moved
+    """
+    result = (
+        _get_postgrest()
+        .rpc("archive_leads", {"p_retention_days": retention_days, "p_batch_size": batch_size})
+        .execute()
+    )
+    return int(result.data or 0)
+
+
+def archive_old_leads(
+    retention_days: int,
+    batch_size: int,
+    max_batches: Optional[int] = None,
+) -> int:
+    """Archive every lead older than retention_days.
+
+    Args:
+        retention_days: Leads created before this many days ago are moved
+        batch_size: Leads moved per transaction
+        max_batches: Stop after this many batches (None = until done)
+
+    Returns:
+        Total number of leads moved
+    """
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        moved = archive_batch(retention_days, batch_size)
+        batches += 1
+        total += moved
+        if moved < batch_size:
+            break
+
+    from core.metrics import metrics
+
+    metrics.incr("leads_archived_total", total)
+    print(f"LEADS: archived {total} leads older than {retention_days} days in {batches} batches")
+    return total
@@ -2,12 +2,10 @@
 
 from pydantic_ai import RunContext
 
-from core.agent import agent
 from .models import LeadResult, InquiryType
 from .capture import execute_capture
 
 
-@agent.tool
 async def capture_lead(
     ctx: RunContext[None],
     name: str,
@@ -54,3 +54,26 @@ def validate_name(name: str) -> tuple[bool, Optional[str]]:
         return False, "Name must be less than 100 characters"
 
     return True, None
+
+
+def validate_emails_bulk(emails: list[str]) -> list[Optional[str]]:
+    """Validate a chunk of emails with validate_email() semantics.
+
+    Used by bulk imports: one pass over the chunk with the compiled
+    pattern's match bound once, instead of a call per row.
+
+    Args:
+        emails: Raw email values
+
+    Returns:
+        Error message per email, None where the email is valid
+    """
+    match = EMAIL_PATTERN.match
+    normalized = [(email or "").strip().lower() for email in emails]
+    return [
+        "Email is required" if not email
+        else "Email address too long" if len(email) > 254
+        else None if match(email)
+        else "Invalid email format"
+        for email in normalized
+    ]
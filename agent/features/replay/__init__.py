@@ -0,0 +1,17 @@
+"""Conversation replay feature slice.
+
+Replays recorded conversations through the chat pipeline to measure routing
+and cost after prompt or keyword changes.
+"""
+
+from .models import ConversationSummary, ReplayTurn, TurnOutcome
+from .runner import file_lines, replay_conversations, split_lines
+
+__all__ = [
+    "ConversationSummary",
+    "ReplayTurn",
+    "TurnOutcome",
+    "file_lines",
+    "replay_conversations",
+    "split_lines",
+]
@@ -0,0 +1,60 @@
+"""Data models for conversation replay."""
+
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class RecordedMessage(BaseModel):
+    """One message of a recorded conversation."""
+
+    role: Literal["user", "assistant"]
+    content: str = Field(..., min_length=1)
+    # Optional label for routing-accuracy checks on user turns
+    expected_branch: Optional[str] = None
+
+
+class RecordedConversation(BaseModel):
+    """One input line: a conversation to replay."""
+
+    id: str
+    messages: list[RecordedMessage]
+
+
+class TurnOutcome(BaseModel):
+    """What the chat pipeline produced for one turn."""
+
+    response: str
+    branch: str
+    tokens_used: int = 0
+    tools_called: list[str] = Field(default_factory=list)
+    handoff_ready: bool = False
+
+
+class ReplayTurn(BaseModel):
+    """Output line for one replayed user turn."""
+
+    type: Literal["turn"] = "turn"
+    conversation_id: str
+    turn: int
+    message: str
+    branch: Optional[str] = None
+    expected_branch: Optional[str] = None
+    branch_match: Optional[bool] = None
+    response: Optional[str] = None
+    tokens_used: int = 0
+    tools_called: list[str] = Field(default_factory=list)
+    handoff_ready: bool = False
+    latency_ms: float = 0.0
+    error: Optional[str] = None
+
+
+class ConversationSummary(BaseModel):
+    """Output line written once a conversation has fully replayed (checkpoint marker)."""
+
+    type: Literal["conversation"] = "conversation"
+    conversation_id: str
+    turns: int
+    tokens_used: int
+    errors: int
+    latency_ms: float
@@ -0,0 +1,171 @@
+"""Bounded-concurrency replay of JSONL conversation logs."""
+
+import asyncio
+import json
+import time
+from typing import IO, AsyncIterable, AsyncIterator, Awaitable, Callable
+
+from pydantic import ValidationError
+
+from .models import ConversationSummary, RecordedConversation, ReplayTurn, TurnOutcome
+
+
+# (message, history as role/content dicts) -> outcome
+TurnHandler = Callable[[str, list[dict]], Awaitable[TurnOutcome]]
+
+
+async def _replay_one(
+    conversation: RecordedConversation,
+    handler: TurnHandler,
+    emit: Callable[[str], Awaitable[None]],
+) -> None:
+    """Replay one conversation turn by turn, emitting a line per user turn."""
+    history: list[dict] = []
+    tokens = errors = turn = 0
+    started = time.perf_counter()
+    messages = conversation.messages
+
+    for index, message in enumerate(messages):
+        if message.role == "assistant":
+            history.append({"role": "assistant", "content": message.content})
+            continue
+
+        turn += 1
+        line = ReplayTurn(
+            conversation_id=conversation.id,
+            turn=turn,
+            message=message.content,
+            expected_branch=message.expected_branch,
+        )
+        turn_started = time.perf_counter()
+        try:
+            outcome = await handler(message.content, list(history))
+        except Exception as e:
+            outcome = None
+            line.error = f"{type(e).__name__}: {e}"
+            errors += 1
+        line.latency_ms = round((time.perf_counter() - turn_started) * 1000, 2)
+
+        if outcome is not None:
+            line.branch = outcome.branch
+            line.response = outcome.response
+            line.tokens_used = outcome.tokens_used
+            line.tools_called = outcome.tools_called
+            line.handoff_ready = outcome.handoff_ready
+            if message.expected_branch is not None:
+                line.branch_match = outcome.branch == message.expected_branch
+            tokens += outcome.tokens_used
+
+        await emit(line.model_dump_json())
+
+        history.append({"role": "user", "content": message.content})
+        # Prefer the recorded reply; otherwise continue with the one we generated
+        next_is_recorded = index + 1 < len(messages) and messages[index + 1].role == "assistant"
+        if not next_is_recorded and outcome is not None:
+            history.append({"role": "assistant", "content": outcome.response})
+
+    summary = ConversationSummary(
+        conversation_id=conversation.id,
+        turns=turn,
+        tokens_used=tokens,
+        errors=errors,
+        latency_ms=round((time.perf_counter() - started) * 1000, 2),
+    )
+    await emit(summary.model_dump_json())
+
+
+async def split_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Turn a byte stream (e.g. a request body) into text lines."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *complete, buffer = buffer.split(b"\n")
+        for line in complete:
+            yield line.decode("utf-8")
+    if buffer:
+        yield buffer.decode("utf-8")
+
+
+async def file_lines(file: IO[bytes]) -> AsyncIterator[str]:
+    """Yield the text lines of a (spooled) binary file from its current position."""
+    for line in file:
+        yield line.rstrip(b"\r\n").decode("utf-8")
+
+
+def _error_line(line_number: int, error: ValidationError) -> str:
+    """Output line for an input line that could not be parsed."""
+    return json.dumps({"type": "error", "line": line_number, "error": str(error)})
+
+
+async def replay_conversations(
+    lines: AsyncIterable[str],
+    handler: TurnHandler,
+    max_concurrency: int,
+) -> AsyncIterator[str]:
+    """
+    Replay JSONL conversations and yield JSONL result lines as they complete.
+
+    Conversations run concurrently (at most max_concurrency at a time);
+    turns within a conversation run in order. Only max_concurrency
+    conversations are held in memory, so input size is unbounded.
+
+    Args:
+        lines: Input lines, one RecordedConversation JSON object each
+        handler: Runs a single chat turn
+        max_concurrency: Conversations replayed in parallel
+
+    Yields:
+        ReplayTurn / ConversationSummary JSON lines (no trailing newline)
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_concurrency * 4)
+    slots = asyncio.Semaphore(max_concurrency)
+    done = object()
+
+    async def run(conversation: RecordedConversation) -> None:
+        try:
+            await _replay_one(conversation, handler, queue.put)
+        finally:
+            slots.release()
+
+    async def produce() -> None:
+        tasks: set[asyncio.Task] = set()
+        try:
+            line_number = 0
+            async for raw in lines:
+                line_number += 1
+                if not raw.strip():
+                    continue
+                try:
+                    conversation = RecordedConversation.model_validate_json(raw)
+                except ValidationError as e:
+                    await queue.put(_error_line(line_number, e))
+                    continue
+                await slots.acquire()
+                task = asyncio.create_task(run(conversation))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            # Consumer went away: nobody is reading the queue any more
+            for task in tasks:
+                task.cancel()
+            raise
+        except Exception:
+            for task in tasks:
+                task.cancel()
+            await queue.put(done)
+            raise
+        await queue.put(done)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            yield item
+        await producer
+    finally:
+        producer.cancel()
+
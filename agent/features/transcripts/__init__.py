@@ -0,0 +1,16 @@
+"""Conversation transcript feature slice.
+
+Records each chat turn and persists it in the background, in batches, to
+the conversations table (or compressed local files while the database is
+unreachable).
+"""
+
+from .models import TranscriptTurn
+from .sink import TranscriptSink, client_id, insert_turns
+
+__all__ = [
+    "TranscriptSink",
+    "TranscriptTurn",
+    "client_id",
+    "insert_turns",
+]
@@ -0,0 +1,26 @@
+"""Data models for conversation transcripts."""
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class TranscriptTurn(BaseModel):
+    """One chat turn as stored in the conversations table."""
+
+    # HMAC of the rate-limit key (see client_id), so raw IPs and session ids
+    # are never stored and can't be recovered without the server's key
+    client_id: str
+    # Set for /ws/chat connections; /chat turns are grouped by client_id
+    conversation_id: Optional[str] = None
+    transport: str = "http"
+    message: str
+    response: str
+    branch: str
+    tools_called: list[str] = Field(default_factory=list)
+    tokens_used: int = 0
+    cached_tokens: int = 0
+    latency_ms: float = 0.0
+    handoff_ready: bool = False
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
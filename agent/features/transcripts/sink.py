@@ -0,0 +1,145 @@
+"""Buffered, batched transcript persistence.
+
+record() only appends to an in-memory ring buffer, so the chat request
+path never waits on I/O. A background task drains the buffer in batches:
+each batch is inserted into the conversations table in a worker thread,
+or appended to a gzip-compressed JSONL segment under the spool directory
+when the insert fails. When the buffer is full the oldest turns are
+dropped (and counted) rather than letting memory grow.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import hmac
+import json
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Optional
+
+from core.metrics import metrics
+
+from .models import TranscriptTurn
+
+
+def client_id(client_key: str, secret: str) -> str:
+    """
+    Stable pseudonymous id for a rate-limit key.
+
+    Keyed with a server secret: a plain hash of "ip:<addr>" could be
+    reversed by hashing the whole IPv4 space.
+    """
+    return hmac.new(secret.encode(), client_key.encode(), hashlib.sha256).hexdigest()[:16]
+
+
+def insert_turns(rows: list[dict]) -> None:
+    """Insert a batch of turns into the conversations table."""
+    from database.client import get_postgrest
+
+    get_postgrest().from_("conversations").insert(rows).execute()
+
+
+class TranscriptSink:
+    """Ring buffer of chat turns flushed in the background."""
+
+    def __init__(
+        self,
+        capacity: int,
+        batch_size: int,
+        flush_interval: float,
+        spool_dir: str,
+        writer: Callable[[list[dict]], None] = insert_turns,
+    ):
+        """
+        Args:
+            capacity: Turns held in memory before the oldest are dropped
+            batch_size: Turns written per insert
+            flush_interval: Seconds between flushes when the buffer is not full
+            spool_dir: Directory for compressed segments when the writer fails
+            writer: Persists one batch of JSON-ready rows (blocking; runs in a thread)
+        """
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spool_dir = Path(spool_dir)
+        self.writer = writer
+        self._buffer: deque[TranscriptTurn] = deque(maxlen=capacity)
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def record(self, turn: TranscriptTurn) -> None:
+        """Queue a turn for persistence (never blocks)."""
+        if len(self._buffer) == self.capacity:
+            metrics.incr("transcript_dropped_total")
+        self._buffer.append(turn)
+        metrics.incr("transcript_recorded_total")
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    def _take_batch(self) -> list[dict]:
+        batch = []
+        while self._buffer and len(batch) < self.batch_size:
+            batch.append(self._buffer.popleft().model_dump(mode="json"))
+        return batch
+
+    def _spool(self, rows: list[dict]) -> None:
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        # One segment per worker per hour; gzip members append cleanly
+        segment = self.spool_dir / f"transcripts-{time.strftime('%Y%m%d%H')}-{os.getpid()}.jsonl.gz"
+        with gzip.open(segment, "at", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+
+    def _write(self, rows: list[dict]) -> None:
+        try:
+            self.writer(rows)
+            metrics.incr("transcript_written_total", len(rows), target="database")
+        except Exception as e:
+            print(f"TRANSCRIPTS: insert failed ({type(e).__name__}: {e}), spooling {len(rows)} turns")
+            self._spool(rows)
+            metrics.incr("transcript_written_total", len(rows), target="spool")
+
+    async def flush(self) -> int:
+        """Write everything buffered so far; returns the number of turns written."""
+        written = 0
+        while self._buffer:
+            rows = self._take_batch()
+            try:
+                await asyncio.to_thread(self._write, rows)
+            except Exception as e:
+                # Spooling failed too (disk full, permissions): the batch is lost
+                metrics.incr("transcript_dropped_total", len(rows))
+                print(f"TRANSCRIPTS: dropped {len(rows)} turns: {type(e).__name__}: {e}")
+                continue
+            written += len(rows)
+        return written
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        """Start flushing in the background (must be called inside the event loop)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Stop the background task and write whatever is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
@@ -1,15 +1,74 @@
 """FastAPI entry point for Siphio AI Agent."""
 
-import re
+import asyncio
+import hmac
+import secrets
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from typing import Optional
-
-from fastapi import FastAPI, HTTPException
+from typing import TYPE_CHECKING, Callable, Optional
+
+from fastapi import (
+    Depends,
+    FastAPI,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+)
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse, UserPromptPart, TextPart
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+
+from core import settings
+from core.agent import ModelTier, get_agent, resolve_tier, system_prefix, warm_agents
+from core.admission import AdmissionController, AdmissionRejected
+from core.cache import get_cache
+from core.health import HealthProber, Probe
+from core.http import close_clients, get_async_client, keep_warm, prewarm, record_pool_metrics
+from core.metrics import metrics
+from core.profiling import LoopStall, LoopStallMonitor, StackSampler
+from core.rate_limit import (
+    build_rate_limiter,
+    build_session_mint_limiter,
+    client_ip,
+    issue_session_token,
+    verify_session_token,
+)
+from core.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceeded,
+    call_with_deadlines,
+    p95_hedge_delay,
+)
+from core.run_summary import run_usage, summarize_run
+from core.serialization import dumps
+from features.app_building import (
+    Action,
+    AppBuildingState,
+    advance,
+    derive_state,
+    render_template,
+)
+from features.knowledge.answers import render_fallback_answer
+from features.knowledge.fast_path import answer_fast_path, normalize_question
+from features.knowledge.prefetch import render_context
+from features.leads.idempotency import IdempotencyConflict, build_idempotency_store, request_fingerprint
+from features.leads.models import LeadStatus
+from features.replay import TurnOutcome, file_lines, replay_conversations
+from features.transcripts import TranscriptSink, TranscriptTurn, client_id
+from features.knowledge.search import _load_data, execute_search
 
-from core import agent, settings
+if TYPE_CHECKING:
+    # pydantic-ai is imported lazily: it dominates import time
+    from pydantic_ai.messages import ModelMessage
 
 
 # ============ Models ============
@@ -27,6 +86,8 @@ class ChatRequest(BaseModel):
 
     message: str = Field(..., min_length=1, max_length=4000)
     conversation_history: list[MessageHistoryItem] = Field(default_factory=list)
+    # App-building state returned by the previous turn (derived from history if omitted)
+    app_state: Optional[AppBuildingState] = None
 
 
 class ChatResponse(BaseModel):
@@ -34,11 +95,15 @@ class ChatResponse(BaseModel):
 
     response: str
     tokens_used: int = Field(ge=0)
+    # Prompt tokens served from the provider's prompt cache
+    cached_tokens: int = Field(default=0, ge=0)
     tools_called: list[str] = Field(default_factory=list)
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     # Handoff fields - when agent is ready to pass to team
     handoff_ready: bool = False
     handoff_summary: Optional[str] = None
+    # App-building state to send back with the next turn
+    app_state: Optional[AppBuildingState] = None
 
 
 class LeadRequest(BaseModel):
@@ -62,17 +127,22 @@ class LeadResponse(BaseModel):
 # ============ Helpers ============
 
 
-def build_message_history(history: list[MessageHistoryItem]) -> list[ModelMessage]:
+def build_message_history(history: list[MessageHistoryItem]) -> list["ModelMessage"]:
     """
     Convert conversation history to Pydantic AI message format.
 
+    Non-empty histories start with the shared system prompt message, since
+    pydantic-ai only adds the system prompt itself on a first turn.
+
     Args:
         history: List of MessageHistoryItem from the request
 
     Returns:
         List of ModelMessage objects for Pydantic AI
     """
-    messages: list[ModelMessage] = []
+    from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart, UserPromptPart
+
+    messages: list[ModelMessage] = list(system_prefix()) if history else []
 
     for item in history:
         if item.role == "user":
@@ -87,32 +157,338 @@ def build_message_history(history: list[MessageHistoryItem]) -> list[ModelMessag
     return messages
 
 
-def parse_handoff_summary(response: str) -> tuple[str, Optional[str]]:
+def require_admin(
+    authorization: Optional[str] = Header(default=None),
+    x_admin_key: Optional[str] = Header(default=None),
+) -> None:
+    """
+    Guard admin endpoints with ADMIN_API_KEY.
+
+    Accepts either "Authorization: Bearer <key>" or "X-Admin-Key: <key>".
+    Admin endpoints report 404 while no key is configured.
     """
-    Extract handoff summary from agent response if present.
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    provided = x_admin_key or ""
+    if authorization and authorization.startswith("Bearer "):
+        provided = authorization[len("Bearer "):]
+
+    if not hmac.compare_digest(provided.encode(), settings.ADMIN_API_KEY.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin key")
+
+
+def identify_client(
+    peer: Optional[str],
+    x_session_id: Optional[str],
+    x_forwarded_for: Optional[str],
+) -> tuple[str, Optional[str]]:
+    """
+    Rate-limit identity for a client.
+
+    Uses the session id only when the agent signed it, otherwise the client
+    IP as seen by the trusted proxy (or the socket peer). Blocks on the
+    rate-limit store, so async code calls it in a worker thread.
+
+    Returns:
+        (key, issued) where issued is a new session token for clients
+        without a valid one (None when sessions are not signed, or when
+        the IP has used up its RATE_LIMIT_SESSIONS_PER_IP_PER_HOUR)
+    """
+    session_id = (
+        verify_session_token(x_session_id, settings.SESSION_SIGNING_KEY)
+        if x_session_id
+        else None
+    )
+    if session_id:
+        return f"session:{session_id}", None
+    key = f"ip:{client_ip(peer, x_forwarded_for, trusted_proxies)}"
+    if not settings.SESSION_SIGNING_KEY:
+        return key, None
+    # Each session gets a fresh budget, so an IP may only mint a few
+    if settings.RATE_LIMIT_ENABLED and not session_mints.check(f"mint:{key}").allowed:
+        return key, None
+    return key, issue_session_token(settings.SESSION_SIGNING_KEY)
+
+
+def rate_limit_key(
+    request: Request,
+    response: Response,
+    x_session_id: Optional[str] = Header(default=None),
+    x_forwarded_for: Optional[str] = Header(default=None),
+) -> str:
+    """
+    Identify the client for rate limiting and enforce its request budget.
+
+    Clients without a valid session are issued one in the X-Session-Id
+    response header.
+    """
+    key, issued = identify_client(
+        request.client.host if request.client else None, x_session_id, x_forwarded_for
+    )
+    if issued:
+        response.headers["X-Session-Id"] = issued
+
+    if settings.RATE_LIMIT_ENABLED:
+        decision = rate_limiter.check(key)
+        if not decision.allowed:
+            raise HTTPException(
+                status_code=429,
+                detail=rate_limit_detail(decision.reason),
+                headers={"Retry-After": str(decision.retry_after)},
+            )
+
+    return key
+
+
+def rate_limit_detail(reason: str) -> str:
+    return (
+        "Token budget exhausted for this session"
+        if reason == "token_budget"
+        else "Too many requests"
+    )
+
 
-    Agent uses format: [HANDOFF_SUMMARY]...summary...[/HANDOFF_SUMMARY]
+def is_transient_llm_error(error: BaseException) -> bool:
+    """Provider errors worth retrying: connection failures, 429 and 5xx."""
+    from pydantic_ai.exceptions import ModelAPIError, ModelHTTPError
 
-    Returns: (cleaned_response, summary_or_none)
+    if isinstance(error, ModelHTTPError):
+        return error.status_code == 429 or error.status_code >= 500
+    return isinstance(error, ModelAPIError)
+
+
+async def charge_usage(client_key: str, result, tier: ModelTier = ModelTier.FULL) -> None:
+    """Charge a run's token usage to the client's budget."""
+    usage = run_usage(result)
+    if not usage:
+        return
+    metrics.incr("llm_tokens_total", usage.total_tokens, tier=tier.value)
+    metrics.incr("llm_input_tokens_total", usage.input_tokens)
+    metrics.incr("llm_cached_tokens_total", usage.cache_read_tokens)
+    if settings.RATE_LIMIT_ENABLED:
+        await rate_limiter.record_tokens_async(client_key, usage.total_tokens)
+
+
+async def run_agent(
+    user_message: str,
+    message_history: list["ModelMessage"],
+    client_key: str,
+    instruction: Optional[str] = None,
+    tier: ModelTier = ModelTier.FULL,
+    event_stream_handler: Optional[Callable] = None,
+):
     """
-    pattern = r'\[HANDOFF_SUMMARY\](.*?)\[/HANDOFF_SUMMARY\]'
-    match = re.search(pattern, response, re.DOTALL)
+    Run the agent with admission control, deadlines and the circuit breaker,
+    then charge its token usage to the client.
 
-    if match:
-        summary = match.group(1).strip()
-        # Remove the markers from the response
-        cleaned = re.sub(pattern, '', response, flags=re.DOTALL).strip()
-        return cleaned, summary
+    A per-turn instruction is sent as a separate part after the user's
+    message, so everything before it stays identical across turns. The
+    tier picks which configured model answers. Streamed runs are never
+    hedged, since two racing attempts would interleave their events.
 
-    return response, None
+    Raises:
+        CircuitOpenError: If recent OpenRouter calls kept failing
+        DeadlineExceeded: If no attempt finished within the deadlines
+    """
+    # Fail fast without queueing while the breaker is fully open
+    if llm_breaker.state == CircuitBreaker.OPEN:
+        raise CircuitOpenError(llm_breaker.retry_after())
+
+    hedge_delay = (
+        p95_hedge_delay(min_samples=settings.LLM_HEDGE_MIN_SAMPLES)
+        if settings.LLM_HEDGING_ENABLED and event_stream_handler is None
+        else None
+    )
+    run_options = {"event_stream_handler": event_stream_handler} if event_stream_handler else {}
+
+    user_prompt = [user_message, instruction] if instruction else user_message
+    # Metrics report the tier that answers, not the one requested
+    tier = resolve_tier(tier)
+    agent = get_agent(tier)
+    metrics.incr("llm_runs_total", tier=tier.value)
+
+    # Hedged copies that also finished; their usage was spent too
+    discarded: list = []
+    async with llm_admission.slot():
+        # Claim the half-open trial only once we hold a slot, and always give it back
+        is_trial = llm_breaker.state == CircuitBreaker.HALF_OPEN
+        if not llm_breaker.allow():
+            raise CircuitOpenError(llm_breaker.retry_after())
+        started = time.perf_counter()
+        try:
+            result = await call_with_deadlines(
+                lambda: agent.run(user_prompt, message_history=message_history, **run_options),
+                attempt_timeout=settings.LLM_ATTEMPT_TIMEOUT_SECONDS,
+                total_timeout=settings.LLM_TOTAL_TIMEOUT_SECONDS,
+                max_attempts=settings.LLM_MAX_ATTEMPTS,
+                hedge_delay=hedge_delay,
+                is_retryable=is_transient_llm_error,
+                hedge_admission=llm_admission,
+                on_discarded=discarded.append,
+            )
+        except Exception as e:
+            # Only provider-side failures count; a bad prompt says nothing about OpenRouter
+            if isinstance(e, DeadlineExceeded) or is_transient_llm_error(e):
+                llm_breaker.record_failure()
+            raise
+        else:
+            llm_breaker.record_success()
+            metrics.observe("llm_run_seconds", time.perf_counter() - started, tier=tier.value)
+        finally:
+            if is_trial:
+                llm_breaker.release_trial()
+
+    for loser in discarded:
+        await charge_usage(client_key, loser, tier)
+    await charge_usage(client_key, result, tier)
+    return result
 
 
 # ============ Application ============
 
+# Bounds in-flight OpenRouter calls across all requests in this worker
+llm_admission = AdmissionController(
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    max_queue=settings.LLM_MAX_QUEUE,
+    queue_timeout=settings.LLM_QUEUE_TIMEOUT_SECONDS,
+)
+
+# Trips after consecutive OpenRouter failures
+llm_breaker = CircuitBreaker(
+    failure_threshold=settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+    reset_timeout=settings.LLM_CIRCUIT_RESET_SECONDS,
+)
+
+# Per-client request and token budgets
+rate_limiter = build_rate_limiter(settings)
+session_mints = build_session_mint_limiter(settings, rate_limiter.store)
+lead_idempotency = build_idempotency_store(settings)
+trusted_proxies = {ip.strip() for ip in settings.RATE_LIMIT_TRUSTED_PROXIES.split(",") if ip.strip()}
+
+# Event-loop stall monitor (started in lifespan when enabled)
+stall_monitor: Optional[LoopStallMonitor] = None
+
+# Only one sampling profile may run at a time
+_profile_lock = asyncio.Lock()
+
+
+# Background dependency prober (started in lifespan)
+prober: Optional[HealthProber] = None
+
+# Chat transcript buffer (started in lifespan when enabled)
+transcripts: Optional[TranscriptSink] = None
+# Keys the pseudonymous client_id stored with each turn
+transcript_key = settings.TRANSCRIPT_HASH_KEY or settings.SESSION_SIGNING_KEY or secrets.token_hex(32)
+
+
+def _setting_list(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def build_probes(client) -> dict[str, Probe]:
+    """Dependency probes behind /ready and /health/deep, filtered by HEALTH_PROBES."""
+
+    async def knowledge() -> None:
+        data = _load_data()
+        missing = {"apps", "services", "blog", "company"} - set(data)
+        if missing:
+            raise RuntimeError(f"knowledge index missing {sorted(missing)}")
+
+    async def postgrest() -> None:
+        response = await client.get(
+            f"{settings.SUPABASE_URL}/rest/v1/",
+            headers={"apikey": settings.SUPABASE_ANON_KEY},
+        )
+        if response.status_code >= 500:
+            raise RuntimeError(f"PostgREST returned {response.status_code}")
+
+    async def model() -> None:
+        if llm_breaker.state == CircuitBreaker.OPEN:
+            raise RuntimeError("circuit breaker open")
+        response = await client.get(
+            settings.OPENROUTER_HEALTH_URL,
+            headers={"Authorization": f"Bearer {settings.OPENROUTER_API_KEY}"},
+        )
+        response.raise_for_status()
+
+    probes = {"knowledge": knowledge, "postgrest": postgrest, "model": model}
+    return {name: probes[name] for name in _setting_list(settings.HEALTH_PROBES) if name in probes}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm indexes, then start and stop background diagnostics around the app's lifetime."""
+    global stall_monitor, prober, transcripts
+
+    app.state.ready = False
+    # Both are already loaded when serve.py preloaded them before forking
+    await asyncio.to_thread(_load_data)
+    await asyncio.to_thread(warm_agents)
+
+    if settings.LOOP_STALL_THRESHOLD_MS > 0:
+        stall_monitor = LoopStallMonitor(threshold_ms=settings.LOOP_STALL_THRESHOLD_MS)
+        stall_monitor.start()
+
+    # Open upstream connections now rather than on the first request
+    if settings.HTTP_PREWARM_ENABLED:
+        await prewarm()
+    keep_warm_task = None
+    if settings.HTTP_PREWARM_ENABLED and settings.HTTP_KEEPALIVE_REFRESH_SECONDS > 0:
+        keep_warm_task = asyncio.create_task(keep_warm(settings.HTTP_KEEPALIVE_REFRESH_SECONDS))
+
+    unknown = set(_setting_list(settings.HEALTH_READY_PROBES)) - set(_setting_list(settings.HEALTH_PROBES))
+    if unknown:
+        # healthy() fails these, so /ready stays 503 until the config is fixed
+        print(f"HEALTH: HEALTH_READY_PROBES not in HEALTH_PROBES: {sorted(unknown)}")
+    prober = HealthProber(
+        build_probes(get_async_client()),
+        interval=settings.HEALTH_PROBE_INTERVAL_SECONDS,
+        ttl=settings.HEALTH_PROBE_TTL_SECONDS,
+        timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS,
+    )
+    # /ready stays 503 until the first probe round has passed
+    prober.start()
+
+    if settings.TRANSCRIPTS_ENABLED:
+        if not (settings.TRANSCRIPT_HASH_KEY or settings.SESSION_SIGNING_KEY):
+            print("TRANSCRIPTS: no TRANSCRIPT_HASH_KEY; client ids won't match across restarts")
+        transcripts = TranscriptSink(
+            capacity=settings.TRANSCRIPT_BUFFER_SIZE,
+            batch_size=settings.TRANSCRIPT_BATCH_SIZE,
+            flush_interval=settings.TRANSCRIPT_FLUSH_SECONDS,
+            spool_dir=settings.TRANSCRIPT_SPOOL_DIR,
+        )
+        transcripts.start()
+
+    app.state.ready = True
+    yield
+    app.state.ready = False
+
+    await prober.stop()
+    if transcripts is not None:
+        # Written before the HTTP clients close
+        await transcripts.stop()
+        transcripts = None
+    if keep_warm_task is not None:
+        keep_warm_task.cancel()
+        try:
+            await keep_warm_task
+        except asyncio.CancelledError:
+            pass
+    # The worker is exiting; the agents' client goes with it
+    await close_clients()
+
+    if stall_monitor is not None:
+        await stall_monitor.stop()
+        stall_monitor = None
+
+
 app = FastAPI(
     title="Siphio AI Agent",
     description="AI-powered assistant API for Siphio",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS configuration for Next.js frontend
@@ -137,6 +513,47 @@ async def health_check() -> dict:
     return {"status": "healthy", "service": "siphio-agent"}
 
 
+@app.get("/ready")
+async def readiness_check() -> JSONResponse:
+    """
+    Readiness for load balancers.
+
+    503 until indexes are warm and the HEALTH_READY_PROBES pass, and while
+    draining. Reads cached probe results only.
+    """
+    ready = (
+        getattr(app.state, "ready", False)
+        and prober is not None
+        and prober.healthy(_setting_list(settings.HEALTH_READY_PROBES))
+    )
+    if not ready:
+        return JSONResponse({"status": "not_ready"}, status_code=503)
+    return JSONResponse({"status": "ready"})
+
+
+@app.get("/health/deep")
+async def deep_health_check() -> JSONResponse:
+    """Per-dependency status from the background prober (cached, no outbound calls)."""
+    checks = prober.results() if prober is not None else {}
+    healthy = bool(checks) and all(check.ok for check in checks.values())
+    return JSONResponse(
+        {
+            "status": "healthy" if healthy else "degraded",
+            "service": "siphio-agent",
+            "ready": getattr(app.state, "ready", False),
+            "checks": {name: check.model_dump(mode="json") for name, check in checks.items()},
+        },
+        status_code=200 if healthy else 503,
+    )
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint() -> PlainTextResponse:
+    """Expose in-process metrics in Prometheus text format."""
+    record_pool_metrics()
+    return PlainTextResponse(metrics.render_prometheus())
+
+
 def is_informational_query(message: str) -> bool:
     """
     Detect if the user is asking an informational question about Siphio.
@@ -195,244 +612,485 @@ def is_app_building_intent(message: str, history: list[MessageHistoryItem]) -> b
     return False
 
 
-def is_new_app_building_request(message: str) -> bool:
+async def respond(
+    request: ChatRequest,
+    client_key: str,
+    message_history: Optional[list["ModelMessage"]] = None,
+    event_stream_handler: Optional[Callable] = None,
+) -> tuple[ChatResponse, str]:
     """
-    Detect if the CURRENT message is starting a new app-building request.
+    Route a chat turn and produce the response.
+
+    Shared by /chat, /chat/batch and /ws/chat.
 
-    This is different from is_app_building_intent - this only checks the current
-    message, not history. Used to reset the app-building flow when user switches topics.
+    Args:
+        request: The turn, with history and carried app state
+        client_key: Rate-limit identity to charge tokens to
+        message_history: Model messages for request.conversation_history
+            when the caller already has them (built from it otherwise)
+        event_stream_handler: Receives the model's stream events as they arrive
+
+    Returns:
+        (response, branch) where branch names the path that answered
     """
-    message_lower = message.lower()
+    # Log incoming message
+    print(f"\n{'='*50}")
+    print(f"USER: {request.message}")
+    print(f"HISTORY: {len(request.conversation_history)} messages")
 
-    # Keywords that indicate starting a new app request
-    new_app_keywords = [
-        'i want to build', 'i want a', 'i need a', 'i need an app',
-        'can you build', 'can you make', 'can you create',
-        'build me a', 'create a', 'make a', 'develop a',
-        'looking for an app', 'need an app for',
-    ]
+    # Convert conversation history to Pydantic AI format
+    if message_history is None:
+        message_history = build_message_history(request.conversation_history)
+
+    # Simple informational questions ("how much does it cost?") are answered
+    # from templates before any routing, so they never reach the model
+    if settings.FAST_PATH_ENABLED:
+        fast_answer = await answer_fast_path(request.message, settings.FAST_PATH_MIN_SCORE)
+        if fast_answer:
+            print(f"AGENT (FAST PATH: {fast_answer.template}): {fast_answer.response}")
+            print(f"{'='*50}\n")
+            return ChatResponse(
+                response=fast_answer.response,
+                tokens_used=0,
+                tools_called=["search_knowledge_base"],
+                app_state=request.app_state,
+            ), "fast_path"
+
+    # Check if this is an informational query (should use knowledge tool)
+    if is_informational_query(request.message) and not is_app_building_intent(request.message, request.conversation_history):
+        print("MODE: Informational query - using knowledge base")
+
+        # Opening questions repeat across visitors; reuse a recent answer
+        cache_key = None
+        if not request.conversation_history and settings.CHAT_CACHE_TTL_SECONDS > 0:
+            cache_key = f"chat:{normalize_question(request.message)}"
+            cached = await get_cache().get_async(cache_key)
+            if cached is not None:
+                print(f"AGENT (CACHED): {cached['response'][:200]}")
+                print(f"{'='*50}\n")
+                return ChatResponse(
+                    response=cached["response"],
+                    tokens_used=0,
+                    tools_called=cached["tools_called"],
+                ), "chat_cache"
+
+        # Search up front so the model can answer without a tool round trip;
+        # the search is in-process and cached, so it is simply awaited here
+        search_result = None
+        context = None
+        if settings.KNOWLEDGE_PREFETCH_ENABLED:
+            search_result = await execute_search(request.message)
+            context = render_context(
+                search_result,
+                settings.KNOWLEDGE_PREFETCH_MAX_RESULTS,
+                settings.KNOWLEDGE_TOOL_TOKEN_BUDGET,
+            )
+
+        try:
+            result = await run_agent(
+                request.message,
+                message_history,
+                client_key,
+                instruction=context,
+                event_stream_handler=event_stream_handler,
+            )
+        except (CircuitOpenError, DeadlineExceeded) as e:
+            # Model unavailable - answer straight from the knowledge base
+            print(f"FALLBACK: {type(e).__name__} - answering from knowledge base")
+            if search_result is None:
+                search_result = await execute_search(request.message)
+            return ChatResponse(
+                response=render_fallback_answer(search_result),
+                tokens_used=0,
+                tools_called=["search_knowledge_base"],
+            ), "knowledge_fallback"
+        run = summarize_run(result)
+
+        if context is None:
+            mode = "tool"
+        elif run.tools_called:
+            mode = "prefetch_tool_fallback"
+        else:
+            # One model request instead of tool call + answer
+            mode = "prefetch"
+            metrics.incr("llm_round_trips_saved_total")
+            run.tools_called = ["search_knowledge_base"]
+        metrics.incr("knowledge_prefetch_total", mode=mode)
+        metrics.observe("chat_informational_tokens", run.tokens_used, mode=mode)
+
+        print(f"AGENT: {run.text[:200]}..." if len(run.text) > 200 else f"AGENT: {run.text}")
+        print(f"TOOLS: {run.tools_called}")
+        print(f"{'='*50}\n")
+
+        if cache_key is not None:
+            await get_cache().set_async(
+                cache_key,
+                {"response": run.text, "tools_called": list(run.tools_called)},
+                ttl=settings.CHAT_CACHE_TTL_SECONDS,
+            )
+
+        return ChatResponse(
+            response=run.text,
+            tokens_used=run.tokens_used,
+            cached_tokens=run.cached_tokens,
+            tools_called=run.tools_called,
+            handoff_ready=False,
+            handoff_summary=None,
+        ), "informational"
+
+    # ===== APP BUILDING FLOW =====
+    print("MODE: App building flow")
+
+    # Carried state wins; older clients only send history
+    if request.app_state is not None:
+        state = request.app_state
+    else:
+        state = derive_state(request.conversation_history)
+    transition = advance(state, request.message)
+    state = transition.state
+
+    print(f"  -> {transition.action.value}: phase={state.phase}, type='{state.app_type}', "
+          f"features='{state.features[:50] + '...' if len(state.features) > 50 else state.features}', "
+          f"platform='{state.platform}'")
+
+    # Forced responses bypass the LLM entirely
+    if transition.is_forced:
+        print(f"AGENT (FORCED): {transition.forced_response}")
+        print(f"HANDOFF_READY: True")
+        print(f"SUMMARY: {transition.handoff_summary}")
+        print(f"{'='*50}\n")
 
-    return any(keyword in message_lower for keyword in new_app_keywords)
+        branch = "handoff_confirmed" if transition.action == Action.CONFIRM_HANDOFF else "handoff_offer"
+        return ChatResponse(
+            response=transition.forced_response,
+            tokens_used=0,
+            tools_called=[],
+            handoff_ready=True,
+            handoff_summary=transition.handoff_summary,
+            app_state=state,
+        ), branch
+
+    # Questions whose wording is fixed are answered from templates
+    templated = render_template(transition, request.message) if settings.RESPONSE_TEMPLATES_ENABLED else None
+    if templated:
+        print(f"AGENT (TEMPLATE): {templated}")
+        print(f"{'='*50}\n")
+        return ChatResponse(
+            response=templated,
+            tokens_used=0,
+            tools_called=[],
+            app_state=state,
+        ), "app_building_template"
+
+    # Run agent with message and history; the instruction trails the message
+    result = await run_agent(
+        request.message,
+        message_history,
+        client_key,
+        instruction=transition.instruction(),
+        tier=ModelTier.FAST if transition.is_constrained else ModelTier.FULL,
+        event_stream_handler=event_stream_handler,
+    )
+
+    run = summarize_run(result)
+
+    # Log response
+    print(f"AGENT: {run.text[:200]}..." if len(run.text) > 200 else f"AGENT: {run.text}")
+    print(f"HANDOFF_READY: {run.handoff_ready}")
+    print(f"{'='*50}\n")
+
+    return ChatResponse(
+        response=run.text,
+        tokens_used=run.tokens_used,
+        cached_tokens=run.cached_tokens,
+        tools_called=run.tools_called,
+        handoff_ready=run.handoff_ready,
+        handoff_summary=run.handoff_summary,
+        app_state=state,
+    ), "app_building_llm"
+
+
+def chat_error(error: Exception) -> tuple[int, str, Optional[float]]:
+    """HTTP status, detail and Retry-After seconds for a failed chat turn."""
+    if isinstance(error, CircuitOpenError):
+        return 503, "Assistant is temporarily unavailable, please retry shortly", error.retry_after
+    if isinstance(error, DeadlineExceeded):
+        return 504, "Assistant timed out", None
+    if isinstance(error, AdmissionRejected):
+        return 503, "Assistant is busy, please retry shortly", error.retry_after
+    # Log error in production
+    return 500, f"Agent error: {str(error)}", None
+
+
+def record_transcript(
+    client_key: str,
+    message: str,
+    response: ChatResponse,
+    branch: str,
+    started: float,
+    conversation_id: Optional[str] = None,
+    transport: str = "http",
+) -> None:
+    """Queue a finished turn for the conversations table (no-op when disabled)."""
+    if transcripts is None:
+        return
+    transcripts.record(TranscriptTurn(
+        client_id=client_id(client_key, transcript_key),
+        conversation_id=conversation_id,
+        transport=transport,
+        message=message,
+        response=response.response,
+        branch=branch,
+        tools_called=response.tools_called,
+        tokens_used=response.tokens_used,
+        cached_tokens=response.cached_tokens,
+        latency_ms=(time.perf_counter() - started) * 1000,
+        handoff_ready=response.handoff_ready,
+    ))
 
 
 @app.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest) -> ChatResponse:
+async def chat(request: ChatRequest, client_key: str = Depends(rate_limit_key)) -> ChatResponse:
     """
     Process a user message and return AI agent response.
 
     Accepts optional conversation history for multi-turn context.
     """
+    started = time.perf_counter()
     try:
-        # Log incoming message
-        print(f"\n{'='*50}")
-        print(f"USER: {request.message}")
-        print(f"HISTORY: {len(request.conversation_history)} messages")
-
-        # Convert conversation history to Pydantic AI format
-        message_history = build_message_history(request.conversation_history)
-
-        user_lower = request.message.lower().strip()
-
-        # Check if this is an informational query (should use knowledge tool)
-        if is_informational_query(request.message) and not is_app_building_intent(request.message, request.conversation_history):
-            print("MODE: Informational query - using knowledge base")
-
-            # Let the agent handle it naturally with tools
-            result = await agent.run(request.message, message_history=message_history)
-            usage = result.usage()
-
-            # Extract tool names
-            tools_called = []
-            for call in result.all_messages():
-                if hasattr(call, 'parts'):
-                    for part in call.parts:
-                        if hasattr(part, 'tool_name'):
-                            tools_called.append(part.tool_name)
+        response, branch = await respond(request, client_key)
+    except Exception as e:
+        status, detail, retry_after = chat_error(e)
+        headers = {"Retry-After": str(retry_after)} if retry_after is not None else None
+        raise HTTPException(status_code=status, detail=detail, headers=headers)
+
+    metrics.incr("chat_branch_total", branch=branch)
+    record_transcript(client_key, request.message, response, branch, started)
+    return response
+
+
+# Batch bodies above this size are spooled to a temp file
+BATCH_SPOOL_MEMORY_BYTES = 8 * 1024 * 1024
+
+
+async def replay_turn(message: str, history: list[dict]) -> TurnOutcome:
+    """Run one recorded turn through the chat pipeline (used by batch replay)."""
+    request = ChatRequest(message=message, conversation_history=history)
+    response, branch = await respond(request, client_key="batch")
+    metrics.incr("chat_batch_turns_total", branch=branch)
+    return TurnOutcome(
+        response=response.response,
+        branch=branch,
+        tokens_used=response.tokens_used,
+        tools_called=response.tools_called,
+        handoff_ready=response.handoff_ready,
+    )
 
-            response_text, handoff_summary = parse_handoff_summary(result.output)
 
-            print(f"AGENT: {response_text[:200]}..." if len(response_text) > 200 else f"AGENT: {response_text}")
-            print(f"TOOLS: {tools_called}")
-            print(f"{'='*50}\n")
+@app.post("/chat/batch", dependencies=[Depends(require_admin)])
+async def chat_batch(
+    request: Request,
+    concurrency: int = Query(default=4, ge=1),
+) -> StreamingResponse:
+    """
+    Replay a JSONL body of recorded conversations and stream JSONL results.
 
-            return ChatResponse(
-                response=response_text,
-                tokens_used=usage.total_tokens if usage else 0,
-                tools_called=tools_called,
-                handoff_ready=False,
-                handoff_summary=None,
-            )
+    Each input line is {"id": ..., "messages": [{"role", "content", "expected_branch"?}]}.
+    Each output line is a per-turn result (branch, tokens, tools, latency) or,
+    once a conversation finishes, a summary line usable as a checkpoint.
+    """
+    concurrency = min(concurrency, settings.BATCH_MAX_CONCURRENCY)
 
-        # ===== APP BUILDING FLOW =====
-        print("MODE: App building flow")
-
-        # Check if this is a NEW app-building request (user switching topics)
-        is_new_request = is_new_app_building_request(request.message)
-
-        if is_new_request:
-            print("  -> NEW app request detected, resetting flow")
-
-        # Extract info from conversation - but ONLY from app-building context
-        # If this is a new request, we start fresh
-        app_features = ""
-        platform = ""
-        app_type = ""
-
-        # Extract app type from current message if it's a new request
-        if is_new_request:
-            # Extract what type of app from current message
-            # e.g., "I want to build a gym app" -> "gym app"
-            message_lower = request.message.lower()
-            for word in ['gym', 'restaurant', 'fitness', 'food', 'delivery', 'booking', 'scheduling', 'todo', 'task', 'finance', 'health', 'social', 'ecommerce', 'shopping']:
-                if word in message_lower:
-                    app_type = word + " app"
-                    break
-        else:
-            # Continue from previous app-building conversation
-            # Check history first
-            for msg in request.conversation_history:
-                if msg.role == "user" and len(msg.content) > 5:
-                    content_lower = msg.content.lower()
-                    if not app_features and any(word in content_lower for word in ['track', 'manage', 'show', 'workout', 'subscription', 'member', 'book', 'order', 'schedule', 'display', 'list', 'monitor']):
-                        app_features = msg.content
-                    if not platform and any(word in content_lower for word in ['phone', 'mobile', 'ios', 'android', 'website', 'web']):
-                        platform = "phone" if any(w in content_lower for w in ['phone', 'mobile', 'ios', 'android']) else "website"
-
-            # Also check CURRENT message for features/platform (user might be answering the "what features" question)
-            current_lower = request.message.lower()
-            feature_keywords = ['track', 'manage', 'show', 'workout', 'subscription', 'member', 'book', 'order', 'schedule', 'display', 'list', 'monitor', 'busy', 'notification', 'alert', 'remind']
-            if not app_features and any(word in current_lower for word in feature_keywords):
-                app_features = request.message
-            if not platform and any(word in current_lower for word in ['phone', 'mobile', 'ios', 'android', 'website', 'web']):
-                platform = "phone" if any(w in current_lower for w in ['phone', 'mobile', 'ios', 'android']) else "website"
-
-        if app_features or platform:
-            print(f"  -> Extracted: features='{app_features[:50] + '...' if len(app_features) > 50 else app_features}', platform='{platform}'")
-
-        # Check if user is confirming handoff
-        is_affirmative = user_lower in ['yes', 'yeah', 'sure', 'yep', 'ok', 'okay', 'yes please', 'yes, please', 'y', 'yea']
-
-        # Check if last message asked about handoff
-        last_asked_handoff = False
-        if request.conversation_history and not is_new_request:
-            last_msg = request.conversation_history[-1]
-            if last_msg.role == "assistant" and "pass" in last_msg.content.lower() and "team" in last_msg.content.lower():
-                last_asked_handoff = True
-
-        # STATE MACHINE - force correct responses
-        if is_affirmative and last_asked_handoff:
-            # User confirmed handoff - return summary directly (bypass LLM)
-            summary = f"App for {platform or 'phone'} - {app_features or 'custom app'}"
-            forced_response = f"Great, I'll let the team know!\n\n[HANDOFF_SUMMARY]{summary}[/HANDOFF_SUMMARY]"
-
-            print(f"AGENT (FORCED): {forced_response}")
-            print(f"HANDOFF_READY: True")
-            print(f"{'='*50}\n")
+    # Take the whole body before responding: once the response starts,
+    # Starlette's disconnect listener consumes the remaining request messages.
+    # Large uploads spill to disk instead of being held in memory.
+    spool = tempfile.SpooledTemporaryFile(max_size=BATCH_SPOOL_MEMORY_BYTES)
+    async for chunk in request.stream():
+        spool.write(chunk)
+    spool.seek(0)
 
-            return ChatResponse(
-                response="Great, I'll let the team know!",
-                tokens_used=0,
-                tools_called=[],
-                handoff_ready=True,
-                handoff_summary=summary,
-            )
+    async def body():
+        try:
+            async for line in replay_conversations(file_lines(spool), replay_turn, concurrency):
+                yield line + "\n"
+        finally:
+            spool.close()
 
-        # If this is a new request, always start by asking about features
-        if is_new_request:
-            print(f"  -> Asking about features for: {app_type or 'the app'}")
-            instruction = f"""[INSTRUCTION: The user wants to build a {app_type or 'new app'}. In ONE friendly short sentence, ask what features they want it to have. Example: "A gym app, nice! What would you want it to do?"]
+    return StreamingResponse(body(), media_type="application/x-ndjson")
 
-"""
-        # Check if we should ask about handoff (have features + platform)
-        elif platform and app_features:
-            # Force the handoff question AND return handoff_ready so frontend knows to wait
-            summary = f"App for {platform or 'phone'} - {app_features or 'custom app'}"
 
-            print(f"AGENT (ASKING HANDOFF): Want me to pass this to the team?")
-            print(f"HANDOFF_READY: True (waiting for confirmation)")
-            print(f"SUMMARY: {summary}")
-            print(f"{'='*50}\n")
+class ConversationContext:
+    """
+    Conversation held server-side for one /ws/chat connection.
 
-            return ChatResponse(
-                response="Want me to pass this to the team?",
-                tokens_used=0,
-                tools_called=[],
-                handoff_ready=True,
-                handoff_summary=summary,
-            )
+    History is kept both as request items (for routing) and as model
+    messages, appended once per turn, so a turn costs the same however
+    long the conversation is. The oldest turns are dropped past
+    max_messages.
+    """
 
-        elif platform or any(word in user_lower for word in ['phone', 'mobile', 'website', 'web', 'ios', 'android']):
-            # User just said phone/website - ask for handoff
-            summary = f"App for {platform or user_lower} - {app_features or 'custom app'}"
+    def __init__(self, max_messages: int):
+        self.max_messages = max_messages
+        self.items: list[MessageHistoryItem] = []
+        self.messages: list["ModelMessage"] = []
+        self.app_state: Optional[AppBuildingState] = None
 
-            print(f"AGENT (ASKING HANDOFF): Want me to pass this to the team?")
-            print(f"HANDOFF_READY: True (waiting for confirmation)")
-            print(f"SUMMARY: {summary}")
-            print(f"{'='*50}\n")
+    def model_history(self) -> list["ModelMessage"]:
+        """Model messages for the next run (with the shared system prompt)."""
+        return [*system_prefix(), *self.messages] if self.messages else []
 
-            return ChatResponse(
-                response="Want me to pass this to the team?",
-                tokens_used=0,
-                tools_called=[],
-                handoff_ready=True,
-                handoff_summary=summary,
-            )
+    def add_turn(self, user: str, assistant: str, app_state: Optional[AppBuildingState]) -> None:
+        from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart, UserPromptPart
 
-        elif app_features:
-            # Have features, ask about platform
-            instruction = """[INSTRUCTION: Say ONLY this: "Phone app or website?" - nothing else]
+        self.items.append(MessageHistoryItem(role="user", content=user))
+        self.items.append(MessageHistoryItem(role="assistant", content=assistant))
+        self.messages.append(ModelRequest(parts=[UserPromptPart(content=user)]))
+        self.messages.append(ModelResponse(parts=[TextPart(content=assistant)]))
+        self.app_state = app_state
+        if len(self.items) > self.max_messages:
+            del self.items[:2]
+            del self.messages[:2]
 
-"""
-        else:
-            # No features yet - ask what app should do
-            instruction = """[INSTRUCTION: You are a receptionist. ONE short sentence. Ask what the app should do.]
 
-"""
+class WebSocketTurn(BaseModel):
+    """One client message on /ws/chat."""
 
-        user_message = instruction + request.message
+    message: str = Field(..., min_length=1, max_length=4000)
 
-        # Run agent with message and history
-        result = await agent.run(user_message, message_history=message_history)
 
-        # Build response
-        usage = result.usage()
+async def send_event(websocket: WebSocket, event: dict) -> None:
+    """Send one JSON event (encoded with orjson when available)."""
+    await websocket.send_text(dumps(event))
 
-        # Extract tool names from tool calls
-        tools_called = []
-        for call in result.all_messages():
-            if hasattr(call, 'parts'):
-                for part in call.parts:
-                    if hasattr(part, 'tool_name'):
-                        tools_called.append(part.tool_name)
 
-        # Parse handoff summary if present
-        response_text, handoff_summary = parse_handoff_summary(result.output)
-        handoff_ready = handoff_summary is not None
+def stream_text_events(websocket: WebSocket) -> Callable:
+    """
+    Event handler that forwards the model's text to the client as it streams.
 
-        # Log response
-        print(f"AGENT: {response_text[:200]}..." if len(response_text) > 200 else f"AGENT: {response_text}")
-        print(f"HANDOFF_READY: {handoff_ready}")
-        print(f"{'='*50}\n")
+    Sends {"type": "delta", "text"} per chunk. A retried attempt starts a
+    new run; the client is told to discard what it has with {"type": "reset"}.
+    """
+    from pydantic_ai.messages import PartDeltaEvent, PartStartEvent, TextPart, TextPartDelta
+
+    current_run: list[Optional[str]] = [None]
+
+    async def handler(ctx, events) -> None:
+        async for event in events:
+            text = None
+            if isinstance(event, PartStartEvent) and isinstance(event.part, TextPart):
+                text = event.part.content
+            elif isinstance(event, PartDeltaEvent) and isinstance(event.delta, TextPartDelta):
+                text = event.delta.content_delta
+            if not text:
+                continue
+            if current_run[0] != ctx.run_id:
+                if current_run[0] is not None:
+                    await send_event(websocket, {"type": "reset"})
+                current_run[0] = ctx.run_id
+            await send_event(websocket, {"type": "delta", "text": text})
+
+    return handler
+
+
+@app.websocket("/ws/chat")
+async def chat_websocket(websocket: WebSocket) -> None:
+    """
+    Chat over one connection with the conversation held on the server.
+
+    The client sends {"message": "..."} per turn. The server streams
+    {"type": "delta"} events while the model writes, then one
+    {"type": "done"} event carrying the full ChatResponse (its "response"
+    is authoritative: handoff markers are stripped from it) and, when the
+    turn hands off, a {"type": "handoff", "summary"} event. Problems with a
+    turn are reported as {"type": "error", "status", "detail"} and leave the
+    connection open.
+    """
+    client_key, issued = await asyncio.to_thread(
+        identify_client,
+        websocket.client.host if websocket.client else None,
+        websocket.headers.get("x-session-id"),
+        websocket.headers.get("x-forwarded-for"),
+    )
+    await websocket.accept()
+    if issued:
+        await send_event(websocket, {"type": "session", "session_id": issued})
 
-        return ChatResponse(
-            response=response_text,
-            tokens_used=usage.total_tokens if usage else 0,
-            tools_called=tools_called,
-            handoff_ready=handoff_ready,
-            handoff_summary=handoff_summary,
-        )
-    except Exception as e:
-        # Log error in production
-        raise HTTPException(status_code=500, detail=f"Agent error: {str(e)}")
+    conversation = ConversationContext(max_messages=settings.WS_MAX_HISTORY_MESSAGES)
+    conversation_id = uuid.uuid4().hex
+    handler = stream_text_events(websocket)
+    metrics.incr("ws_connections_total")
 
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    websocket.receive(), timeout=settings.WS_IDLE_TIMEOUT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                await websocket.close(code=1000, reason="idle")
+                return
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+
+            try:
+                # Parsed and validated together, so a frame that isn't JSON
+                # is reported like any other invalid turn
+                turn = WebSocketTurn.model_validate_json(
+                    message.get("text") or (message.get("bytes") or b"").decode("utf-8", "replace")
+                )
+            except ValidationError as e:
+                await send_event(websocket, {"type": "error", "status": 422, "detail": e.errors(include_url=False)})
+                continue
+
+            if settings.RATE_LIMIT_ENABLED:
+                decision = await rate_limiter.check_async(client_key)
+                if not decision.allowed:
+                    await send_event(websocket, {
+                        "type": "error",
+                        "status": 429,
+                        "detail": rate_limit_detail(decision.reason),
+                        "retry_after": decision.retry_after,
+                    })
+                    continue
+
+            # History items are already model instances, so validation only
+            # type-checks them (faster than model_construct, which runs in Python)
+            request = ChatRequest(
+                message=turn.message,
+                conversation_history=conversation.items,
+                app_state=conversation.app_state,
+            )
+            started = time.perf_counter()
+            try:
+                response, branch = await respond(
+                    request,
+                    client_key,
+                    message_history=conversation.model_history(),
+                    event_stream_handler=handler,
+                )
+            except Exception as e:
+                status, detail, retry_after = chat_error(e)
+                await send_event(
+                    websocket,
+                    {"type": "error", "status": status, "detail": detail, "retry_after": retry_after},
+                )
+                continue
+
+            metrics.incr("chat_branch_total", branch=branch)
+            record_transcript(
+                client_key, turn.message, response, branch, started,
+                conversation_id=conversation_id, transport="ws",
+            )
+            conversation.add_turn(turn.message, response.response, response.app_state)
+            await send_event(websocket, {"type": "done", "branch": branch, **response.model_dump()})
+            if response.handoff_ready:
+                await send_event(websocket, {"type": "handoff", "summary": response.handoff_summary})
+    except WebSocketDisconnect:
+        pass
 
-@app.post("/lead", response_model=LeadResponse)
-async def capture_lead(request: LeadRequest) -> LeadResponse:
-    """
-    Capture lead information from the form submission.
 
-    Called when user submits the lead capture form after agreeing to handoff.
-    """
+async def run_capture(request: LeadRequest) -> LeadResponse:
+    """Run lead capture for a request, mapping failures to a 500."""
     try:
         from features.leads.capture import execute_capture
 
@@ -453,9 +1111,147 @@ async def capture_lead(request: LeadRequest) -> LeadResponse:
         raise HTTPException(status_code=500, detail=f"Lead capture error: {str(e)}")
 
 
+@app.post("/lead", response_model=LeadResponse)
+async def capture_lead(
+    request: LeadRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(default=None, min_length=1, max_length=255),
+) -> LeadResponse:
+    """
+    Capture lead information from the form submission.
+
+    Called when user submits the lead capture form after agreeing to handoff.
+    With an Idempotency-Key header, repeats of a successful submission get
+    the original response (marked Idempotent-Replayed: true) without
+    touching the database, and concurrent repeats share one insert.
+    """
+    if idempotency_key is None:
+        return await run_capture(request)
+
+    async def capture() -> dict:
+        return (await run_capture(request)).model_dump()
+
+    try:
+        body, replayed = await lead_idempotency.run(
+            idempotency_key,
+            request_fingerprint(request.model_dump()),
+            capture,
+            # Failed saves stay retryable under the same key
+            should_store=lambda body: body["success"],
+        )
+    except IdempotencyConflict:
+        raise HTTPException(
+            status_code=422, detail="Idempotency-Key was already used with a different request"
+        )
+
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return LeadResponse.model_validate(body)
+
+
+@app.get("/lead/{reference_id}", response_model=LeadStatus)
+async def lead_status(reference_id: str) -> LeadStatus:
+    """
+    Look up a captured lead by the reference ID the user was given.
+
+    Returns only the status, inquiry type and capture time, never contact details.
+    """
+    from features.leads.lookup import get_lead_status
+
+    try:
+        lead = await asyncio.to_thread(get_lead_status, reference_id)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Lead lookup error: {str(e)}")
+    if lead is None:
+        raise HTTPException(status_code=404, detail="Unknown reference ID")
+    return lead
+
+
+# ============ Admin ============
+
+
+@app.get(
+    "/admin/profile",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_admin)],
+)
+async def profile(
+    seconds: float = Query(default=10.0, gt=0),
+    interval_ms: float = Query(default=5.0, ge=1, le=1000),
+    all_threads: bool = False,
+) -> PlainTextResponse:
+    """
+    Sample the running worker and return flamegraph-compatible collapsed stacks.
+
+    By default only the event-loop thread is sampled. Feed the output to
+    flamegraph.pl or speedscope.
+    """
+    if _profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    async with _profile_lock:
+        thread_ids = None if all_threads else {threading.get_ident()}
+        sampler = StackSampler(interval=interval_ms / 1000, thread_ids=thread_ids)
+        sampler.start()
+        try:
+            await asyncio.sleep(min(seconds, settings.PROFILE_MAX_SECONDS))
+        finally:
+            await asyncio.to_thread(sampler.stop)
+
+    print(f"PROFILE: {sampler.sample_count} samples, {len(sampler.samples)} unique stacks")
+    return PlainTextResponse(sampler.collapsed())
+
+
+@app.get("/admin/leads", dependencies=[Depends(require_admin)])
+async def list_leads(
+    limit: Optional[int] = Query(default=None, ge=1),
+    since: Optional[datetime] = None,
+    before_created_at: Optional[datetime] = None,
+    before_id: Optional[uuid.UUID] = None,
+) -> StreamingResponse:
+    """
+    Stream leads newest first as JSONL.
+
+    Pages through the table with a (created_at, id) keyset, so memory stays
+    flat however many rows match. To resume an interrupted export, pass the
+    created_at and id of the last line received as before_created_at and
+    before_id.
+    """
+    from features.leads.lookup import stream_leads
+
+    if (before_created_at is None) != (before_id is None):
+        raise HTTPException(
+            status_code=422, detail="before_created_at and before_id must be given together"
+        )
+    before = (before_created_at.isoformat(), str(before_id)) if before_id is not None else None
+
+    async def lines():
+        async for row in stream_leads(
+            settings.LEAD_LIST_PAGE_SIZE,
+            limit=limit,
+            since=since.isoformat() if since is not None else None,
+            before=before,
+        ):
+            yield dumps(row) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.get("/admin/stalls", dependencies=[Depends(require_admin)])
+async def loop_stalls() -> dict:
+    """Report recent event-loop stalls above LOOP_STALL_THRESHOLD_MS with their stacks."""
+    stalls: list[LoopStall] = stall_monitor.recent() if stall_monitor else []
+    return {
+        "enabled": stall_monitor is not None,
+        "threshold_ms": settings.LOOP_STALL_THRESHOLD_MS,
+        "stalls": [stall.model_dump(mode="json") for stall in stalls],
+    }
+
+
 # ============ Entry Point ============
 
 if __name__ == "__main__":
+    # Development server with reload; production runs serve.py
     import uvicorn
 
     uvicorn.run(
@@ -0,0 +1,164 @@
+"""Production launcher for Siphio AI Agent.
+
+Runs N uvicorn workers (one per core by default) on one shared listening
+socket. The app, agent and knowledge index are loaded once in the parent
+before forking, so workers start warm and share those pages copy-on-write.
+
+uvloop and httptools are used when installed. On SIGTERM/SIGINT every
+worker flips /ready to 503, stops accepting, and drains in-flight requests
+for up to SHUTDOWN_GRACE_SECONDS before exiting. Crashed workers are
+replaced.
+
+Usage:
+    python serve.py [--workers N] [--host HOST] [--port PORT]
+"""
+
+import argparse
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Optional
+
+import uvicorn
+from fastapi import FastAPI
+
+from core.config import settings
+
+
+# Back off before replacing a worker that keeps crashing on startup
+RESPAWN_DELAY_SECONDS = 1.0
+
+
+def preload() -> FastAPI:
+    """Import the app, build the agents and warm the knowledge index in the parent."""
+    from core.agent import warm_agents
+    from features.knowledge.search import _load_data
+    from main import app
+
+    started = time.perf_counter()
+    _load_data()
+    warm_agents()
+    print(f"SERVE: preloaded app, agents and knowledge index in {time.perf_counter() - started:.2f}s")
+    return app
+
+
+class DrainingServer(uvicorn.Server):
+    """uvicorn server that reports not-ready as soon as shutdown begins."""
+
+    def __init__(self, config: uvicorn.Config, app: FastAPI):
+        super().__init__(config)
+        self.app = app
+
+    def handle_exit(self, sig: int, frame) -> None:
+        # Load balancers polling /ready stop routing here while we drain
+        self.app.state.ready = False
+        super().handle_exit(sig, frame)
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """Create the listening socket every worker accepts from."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app: FastAPI, sock: socket.socket) -> None:
+    """Serve on the inherited socket until told to stop (runs in the child)."""
+    config = uvicorn.Config(
+        app,
+        loop="auto",  # uvloop when installed
+        http="auto",  # httptools when installed
+        lifespan="on",
+        timeout_graceful_shutdown=int(settings.SHUTDOWN_GRACE_SECONDS),
+        access_log=False,
+    )
+    DrainingServer(config, app).run(sockets=[sock])
+
+
+def spawn_worker(app: FastAPI, sock: socket.socket) -> int:
+    """Fork one worker and return its pid."""
+    pid = os.fork()
+    if pid == 0:
+        # uvicorn installs its own handlers; start from the defaults
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        code = 0
+        try:
+            run_worker(app, sock)
+        except BaseException as e:
+            print(f"SERVE: worker {os.getpid()} crashed: {type(e).__name__}: {e}", file=sys.stderr)
+            code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
+    return pid
+
+
+def supervise(app: FastAPI, sock: socket.socket, workers: int) -> int:
+    """Start workers, replace crashed ones, and forward shutdown signals."""
+    children: set[int] = set()
+    stopping = False
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        if not stopping:
+            print(f"SERVE: {signal.Signals(signum).name} received, draining {len(children)} workers")
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(workers):
+        children.add(spawn_worker(app, sock))
+    print(f"SERVE: {workers} workers on {sock.getsockname()}")
+
+    exit_code = 0
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        code = os.waitstatus_to_exitcode(status)
+        if stopping:
+            continue
+        print(f"SERVE: worker {pid} exited with {code}, replacing it", file=sys.stderr)
+        exit_code = 1
+        time.sleep(RESPAWN_DELAY_SECONDS)
+        if not stopping:
+            children.add(spawn_worker(app, sock))
+
+    sock.close()
+    print("SERVE: all workers stopped")
+    return 0 if stopping else exit_code
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the agent API with preforked workers")
+    parser.add_argument(
+        "--workers", type=int, default=settings.AGENT_WORKERS or os.cpu_count() or 1,
+        help="Worker processes (default: AGENT_WORKERS, else one per core)",
+    )
+    parser.add_argument("--host", default=settings.AGENT_HOST)
+    parser.add_argument("--port", type=int, default=settings.AGENT_PORT)
+    args = parser.parse_args(argv)
+
+    app = preload()
+    sock = bind_socket(args.host, args.port)
+    return supervise(app, sock, max(1, args.workers))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
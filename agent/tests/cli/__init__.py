@@ -0,0 +1 @@
+"""Tests for command-line tools."""
@@ -0,0 +1,25 @@
+"""Tests for the lead import CLI."""
+
+import json
+
+from cli.import_leads import main
+from features.leads import importer
+
+
+def test_writes_reject_report(tmp_path, monkeypatch, capsys):
+    """Rejected rows should land in the report and the summary on stderr."""
+    inserted = []
+    monkeypatch.setattr(importer, "recent_emails", lambda emails: set())
+    monkeypatch.setattr(importer, "insert_leads", inserted.append)
+
+    path = tmp_path / "leads.csv"
+    path.write_text("name,email\nJane Doe,jane@example.com\nBad Row,nope\n")
+
+    assert main([str(path)]) == 1
+
+    report = tmp_path / "leads.csv.rejects.jsonl"
+    (reject,) = [json.loads(line) for line in report.read_text().splitlines()]
+    assert reject["line"] == 3
+    assert reject["reason"] == "invalid"
+    assert inserted[0][0]["conversation_summary"] == "Imported from leads.csv"
+    assert "Imported 1 of 2 rows, 1 rejected" in capsys.readouterr().err
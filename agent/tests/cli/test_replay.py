@@ -0,0 +1,41 @@
+"""Tests for the replay CLI checkpointing."""
+
+import json
+
+import pytest
+
+from cli.replay import load_checkpoint, pending_lines
+
+
+def _write(path, records):
+    path.write_text("".join(json.dumps(r) + "\n" for r in records))
+
+
+class TestCheckpoint:
+    """Test resuming from a partial output file."""
+
+    def test_missing_output(self, tmp_path):
+        """No output file means nothing is complete."""
+        assert load_checkpoint(tmp_path / "out.jsonl") == set()
+
+    def test_keeps_only_complete_conversations(self, tmp_path):
+        """Partial conversations should be dropped from the output."""
+        output = tmp_path / "out.jsonl"
+        _write(output, [
+            {"type": "turn", "conversation_id": "a", "turn": 1},
+            {"type": "conversation", "conversation_id": "a", "turns": 1},
+            {"type": "turn", "conversation_id": "b", "turn": 1},
+        ])
+
+        assert load_checkpoint(output) == {"a"}
+        remaining = [json.loads(line) for line in output.read_text().splitlines()]
+        assert {r["conversation_id"] for r in remaining} == {"a"}
+
+    @pytest.mark.asyncio
+    async def test_pending_lines_skip_completed(self, tmp_path):
+        """Completed conversations should not be replayed again."""
+        source = tmp_path / "in.jsonl"
+        _write(source, [{"id": "a", "messages": []}, {"id": "b", "messages": []}])
+
+        lines = [line async for line in pending_lines(source, {"a"})]
+        assert [json.loads(line)["id"] for line in lines] == ["b"]
@@ -1,5 +1,6 @@
 """Shared pytest fixtures for agent tests."""
 
+import os
 import pytest
 import sys
 from pathlib import Path
@@ -7,3 +8,19 @@ from pathlib import Path
 # Add agent directory to path for imports
 agent_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(agent_dir))
+
+# Tests run offline: only probe the local knowledge index
+os.environ.setdefault("HEALTH_PROBES", "knowledge")
+os.environ.setdefault("HEALTH_READY_PROBES", "knowledge")
+os.environ.setdefault("HTTP_PREWARM_ENABLED", "false")
+os.environ.setdefault("TRANSCRIPTS_ENABLED", "false")
+
+
+@pytest.fixture(autouse=True)
+def _clear_shared_cache():
+    """Keep cached knowledge, chat and dedup entries from leaking between tests."""
+    from core.cache import get_cache
+
+    get_cache().clear()
+    yield
+    get_cache().clear()
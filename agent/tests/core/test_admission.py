@@ -0,0 +1,96 @@
+"""Tests for LLM admission control."""
+
+import asyncio
+
+import pytest
+
+from core.admission import AdmissionController, AdmissionRejected
+from core.metrics import metrics
+
+
+async def _hold(controller: AdmissionController, release: asyncio.Event) -> None:
+    async with controller.slot():
+        await release.wait()
+
+
+class TestAdmissionController:
+    """Test concurrency limiting and backpressure."""
+
+    @pytest.mark.asyncio
+    async def test_admits_up_to_max_concurrency(self):
+        """Calls within the limit should run immediately."""
+        controller = AdmissionController(max_concurrency=2, max_queue=0, queue_timeout=1)
+        release = asyncio.Event()
+        tasks = [asyncio.create_task(_hold(controller, release)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        assert controller.in_flight == 2
+        release.set()
+        await asyncio.gather(*tasks)
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_full(self):
+        """Calls beyond concurrency + queue should fast-fail."""
+        controller = AdmissionController(max_concurrency=1, max_queue=1, queue_timeout=5)
+        release = asyncio.Event()
+        running = asyncio.create_task(_hold(controller, release))
+        queued = asyncio.create_task(_hold(controller, release))
+        await asyncio.sleep(0)
+        assert controller.queue_depth == 1
+
+        with pytest.raises(AdmissionRejected) as exc_info:
+            async with controller.slot():
+                pass
+        assert exc_info.value.reason == "queue_full"
+        assert exc_info.value.retry_after >= 1
+
+        release.set()
+        await asyncio.gather(running, queued)
+        assert controller.in_flight == 0
+        assert controller.queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_rejects_after_queue_timeout(self):
+        """Queued calls should be rejected once their deadline passes."""
+        controller = AdmissionController(max_concurrency=1, max_queue=5, queue_timeout=0.05)
+        release = asyncio.Event()
+        running = asyncio.create_task(_hold(controller, release))
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected) as exc_info:
+            async with controller.slot():
+                pass
+        assert exc_info.value.reason == "queue_timeout"
+        assert controller.queue_depth == 0
+
+        release.set()
+        await running
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_queued_calls_run_in_order(self):
+        """Waiting callers should be admitted FIFO as slots free up."""
+        controller = AdmissionController(max_concurrency=1, max_queue=5, queue_timeout=1)
+        order: list[int] = []
+
+        async def work(n: int) -> None:
+            async with controller.slot():
+                order.append(n)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(work(n) for n in range(4)))
+        assert order == [0, 1, 2, 3]
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_records_queue_metrics(self):
+        """Queue wait time should be exported as a metric."""
+        controller = AdmissionController(
+            max_concurrency=1, max_queue=1, queue_timeout=1, name="test_llm"
+        )
+        async with controller.slot():
+            pass
+        summary = metrics.summary("test_llm_queue_wait_seconds")
+        assert summary is not None and summary.count >= 1
+        assert metrics.gauge("test_llm_queue_depth") == 0
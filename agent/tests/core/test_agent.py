@@ -0,0 +1,47 @@
+"""Tests for model tier configuration."""
+
+from core import settings
+from core import agent as agent_module
+from core.agent import ModelTier, get_agent, model_name, resolve_tier, warm_agents
+
+
+class TestModelName:
+    """Test tier to model resolution."""
+
+    def test_fast_tier_uses_configured_model(self, monkeypatch):
+        """FAST should use OPENROUTER_FAST_MODEL when set."""
+        monkeypatch.setattr(settings, "OPENROUTER_FAST_MODEL", "cheap/model")
+        assert model_name(ModelTier.FAST) == "cheap/model"
+        assert model_name(ModelTier.FULL) == settings.OPENROUTER_MODEL
+
+    def test_fast_tier_falls_back_to_full_model(self, monkeypatch):
+        """Without a fast model both tiers share OPENROUTER_MODEL."""
+        monkeypatch.setattr(settings, "OPENROUTER_FAST_MODEL", "")
+        assert model_name(ModelTier.FAST) == settings.OPENROUTER_MODEL
+
+
+class TestAgentTiers:
+    """Test which agents are built per tier."""
+
+    def test_fast_tier_shares_full_agent_without_fast_model(self, monkeypatch):
+        """Without a fast model, FAST should reuse the FULL agent, not build a second one."""
+        built = []
+        monkeypatch.setattr(settings, "OPENROUTER_FAST_MODEL", "")
+        monkeypatch.setattr(agent_module, "_agents", {})
+        monkeypatch.setattr(agent_module, "build_agent", lambda model_id: built.append(model_id) or object())
+
+        warm_agents()
+        assert get_agent(ModelTier.FAST) is get_agent(ModelTier.FULL)
+        assert built == [settings.OPENROUTER_MODEL]
+        assert resolve_tier(ModelTier.FAST) == ModelTier.FULL
+
+    def test_fast_model_gets_its_own_agent(self, monkeypatch):
+        """A configured fast model should get a separate agent."""
+        built = []
+        monkeypatch.setattr(settings, "OPENROUTER_FAST_MODEL", "cheap/model")
+        monkeypatch.setattr(agent_module, "_agents", {})
+        monkeypatch.setattr(agent_module, "build_agent", lambda model_id: built.append(model_id) or object())
+
+        warm_agents()
+        assert get_agent(ModelTier.FAST) is not get_agent(ModelTier.FULL)
+        assert sorted(built) == sorted(["cheap/model", settings.OPENROUTER_MODEL])
@@ -0,0 +1,120 @@
+"""Tests for the pluggable cache backends."""
+
+import pytest
+
+from core.cache import MemoryCache, SQLiteCache
+from core.metrics import metrics
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache(request, tmp_path):
+    """Each backend under the same contract."""
+    if request.param == "sqlite":
+        return SQLiteCache(str(tmp_path / "cache.db"), max_entries=3, default_ttl=60)
+    return MemoryCache(max_entries=3, default_ttl=60)
+
+
+class TestCacheContract:
+    """Behaviour shared by every backend."""
+
+    def test_round_trip(self, cache):
+        """Stored JSON values should come back equal."""
+        cache.set("ns:a", {"x": [1, 2]})
+        assert cache.get("ns:a") == {"x": [1, 2]}
+
+    def test_missing_key(self, cache):
+        """Unknown keys should miss."""
+        assert cache.get("ns:missing") is None
+
+    def test_expired_entry_misses(self, cache):
+        """Entries past their TTL should not be returned."""
+        cache.set("ns:a", 1, ttl=-1)
+        cache.set("ns:b", 1, ttl=0.000001)
+        assert cache.get("ns:a") is None
+        assert cache.get("ns:b") is None
+
+    @pytest.mark.asyncio
+    async def test_async_round_trip(self, cache):
+        """get_async/set_async should behave like get/set."""
+        await cache.set_async("ns:a", {"x": 1})
+        assert await cache.get_async("ns:a") == {"x": 1}
+
+    def test_delete_and_clear(self, cache):
+        """delete() and clear() should remove entries."""
+        cache.set("ns:a", 1)
+        cache.set("ns:b", 2)
+        cache.delete("ns:a")
+        assert cache.get("ns:a") is None
+        cache.clear()
+        assert cache.get("ns:b") is None
+
+    def test_hit_and_miss_metrics(self, cache):
+        """Lookups should be counted per namespace."""
+        hits = metrics.counter("cache_hits_total", namespace="metric_ns")
+        misses = metrics.counter("cache_misses_total", namespace="metric_ns")
+        cache.set("metric_ns:a", 1)
+        cache.get("metric_ns:a")
+        cache.get("metric_ns:b")
+        assert metrics.counter("cache_hits_total", namespace="metric_ns") == hits + 1
+        assert metrics.counter("cache_misses_total", namespace="metric_ns") == misses + 1
+
+
+class TestMemoryCache:
+    """Test the worker-local LRU."""
+
+    def test_evicts_least_recently_used(self):
+        """The entry untouched the longest should be evicted first."""
+        cache = MemoryCache(max_entries=2, default_ttl=60)
+        cache.set("ns:a", 1)
+        cache.set("ns:b", 2)
+        cache.get("ns:a")
+        cache.set("ns:c", 3)
+        assert cache.get("ns:b") is None
+        assert cache.get("ns:a") == 1
+        assert len(cache) == 2
+
+    def test_hits_skip_decoding(self):
+        """Hits should return the stored object rather than re-parse JSON."""
+        cache = MemoryCache(max_entries=2, default_ttl=60)
+        value = {"results": [{"title": "a"}]}
+        cache.set("ns:a", value)
+        assert cache.get("ns:a") is value
+
+
+class TestSQLiteCache:
+    """Test the host-shared SQLite backend."""
+
+    def test_shared_between_instances(self, tmp_path):
+        """Two workers opening the same file should see each other's writes."""
+        path = str(tmp_path / "shared.db")
+        first = SQLiteCache(path)
+        second = SQLiteCache(path)
+        first.set("ns:a", "warm")
+        assert second.get("ns:a") == "warm"
+
+    @pytest.mark.asyncio
+    async def test_async_calls_leave_the_event_loop(self, tmp_path):
+        """get_async/set_async should run SQLite I/O in a worker thread."""
+        import threading
+
+        threads = []
+
+        class RecordingCache(SQLiteCache):
+            def _connect(self):
+                threads.append(threading.get_ident())
+                return super()._connect()
+
+        cache = RecordingCache(str(tmp_path / "cache.db"))
+        threads.clear()
+        await cache.set_async("ns:a", 1)
+        assert await cache.get_async("ns:a") == 1
+        assert threads and threading.get_ident() not in threads
+
+    def test_cleanup_enforces_max_entries(self, tmp_path):
+        """Cleanup should keep only the most recently used rows."""
+        cache = SQLiteCache(str(tmp_path / "cache.db"), max_entries=2, default_ttl=60)
+        for key in ("ns:a", "ns:b", "ns:c"):
+            cache.set(key, key)
+        cache.cleanup()
+        assert cache.get("ns:a") is None
+        assert cache.get("ns:c") == "ns:c"
@@ -0,0 +1,83 @@
+"""Tests for the background dependency prober."""
+
+import asyncio
+
+import pytest
+
+from core.health import HealthProber
+
+
+async def _ok() -> None:
+    return None
+
+
+async def _fail() -> None:
+    raise ConnectionError("refused")
+
+
+async def _hang() -> None:
+    await asyncio.sleep(10)
+
+
+class TestHealthProber:
+    """Test cached probe results."""
+
+    @pytest.mark.asyncio
+    async def test_unprobed_is_unhealthy(self):
+        """Before the first round every probe counts as failed."""
+        prober = HealthProber({"db": _ok}, interval=10, ttl=30, timeout=1)
+        assert prober.results()["db"].error == "not probed yet"
+        assert not prober.healthy()
+
+    @pytest.mark.asyncio
+    async def test_records_pass_fail_and_timeout(self):
+        """Each probe's outcome should be cached with its error."""
+        prober = HealthProber({"a": _ok, "b": _fail, "c": _hang}, interval=10, ttl=30, timeout=0.05)
+        await prober.probe_once()
+        results = prober.results()
+        assert results["a"].ok
+        assert results["b"].error == "ConnectionError: refused"
+        assert "timed out" in results["c"].error
+        assert prober.healthy(["a"])
+        assert not prober.healthy()
+
+    @pytest.mark.asyncio
+    async def test_unknown_names_fail(self):
+        """Names without a probe should fail rather than be skipped."""
+        prober = HealthProber({"a": _ok}, interval=10, ttl=30, timeout=1)
+        await prober.probe_once()
+        assert not prober.healthy(["a", "knowlege"])
+
+    @pytest.mark.asyncio
+    async def test_stale_results_fail(self):
+        """Results older than the TTL should be reported stale and failing."""
+        prober = HealthProber({"a": _ok}, interval=10, ttl=0, timeout=1)
+        await prober.probe_once()
+        await asyncio.sleep(0.01)
+        result = prober.results()["a"]
+        assert result.stale and not result.ok
+
+    @pytest.mark.asyncio
+    async def test_reads_do_not_probe(self):
+        """Reading results must never trigger a probe."""
+        calls = 0
+
+        async def counted() -> None:
+            nonlocal calls
+            calls += 1
+
+        prober = HealthProber({"a": counted}, interval=10, ttl=30, timeout=1)
+        await prober.probe_once()
+        for _ in range(100):
+            prober.results()
+            prober.healthy()
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_background_loop(self):
+        """start() should probe in the background until stop()."""
+        prober = HealthProber({"a": _ok}, interval=0.01, ttl=30, timeout=1)
+        prober.start()
+        await asyncio.sleep(0.05)
+        await prober.stop()
+        assert prober.healthy()
@@ -0,0 +1,76 @@
+"""Tests for the shared HTTP client pools."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core import settings
+from core.http import close_clients, get_async_client, get_sync_client, pool_stats, prewarm
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Local keep-alive server standing in for OpenRouter and Supabase."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr(settings, "OPENROUTER_BASE_URL", url)
+    monkeypatch.setattr(settings, "SUPABASE_URL", url)
+    monkeypatch.setattr(settings, "HTTP2_ENABLED", False)
+    yield url
+    server.shutdown()
+    server.server_close()
+
+
+class TestSharedClients:
+    """Test the process-wide clients."""
+
+    @pytest.mark.asyncio
+    async def test_clients_are_shared(self):
+        """Every caller should get the same client objects."""
+        try:
+            assert get_async_client() is get_async_client()
+            assert get_sync_client() is get_sync_client()
+        finally:
+            await close_clients()
+
+    @pytest.mark.asyncio
+    async def test_prewarm_leaves_idle_connections(self, upstream):
+        """After prewarm both pools should hold a reusable connection."""
+        await close_clients()
+        try:
+            await prewarm()
+            stats = pool_stats()
+            assert stats["async"]["idle"] == 1
+            assert stats["sync"]["idle"] == 1
+        finally:
+            await close_clients()
+        assert pool_stats() == {}
+
+    @pytest.mark.asyncio
+    async def test_prewarm_failure_is_not_fatal(self, monkeypatch):
+        """An unreachable upstream should be logged, not raised."""
+        from core.metrics import metrics
+
+        monkeypatch.setattr(settings, "OPENROUTER_BASE_URL", "http://127.0.0.1:9")
+        monkeypatch.setattr(settings, "SUPABASE_URL", "")
+        before = metrics.counter("http_prewarm_failures_total", client="async")
+        try:
+            await prewarm()
+        finally:
+            await close_clients()
+        assert metrics.counter("http_prewarm_failures_total", client="async") == before + 1
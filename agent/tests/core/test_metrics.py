@@ -0,0 +1,38 @@
+"""Tests for the in-process metrics registry."""
+
+from core.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry:
+    """Test counters, gauges, summaries and exposition."""
+
+    def test_counter_with_labels(self):
+        """Counters should be tracked per label set."""
+        registry = MetricsRegistry()
+        registry.incr("requests_total", branch="a")
+        registry.incr("requests_total", branch="a")
+        registry.incr("requests_total", branch="b")
+        assert registry.counter("requests_total", branch="a") == 2
+        assert registry.counter("requests_total", branch="b") == 1
+
+    def test_summary_quantiles(self):
+        """Summaries should report quantiles over recent observations."""
+        registry = MetricsRegistry()
+        for value in range(1, 101):
+            registry.observe("latency_seconds", float(value))
+        summary = registry.summary("latency_seconds")
+        assert summary.count == 100
+        assert summary.quantile(0.5) == 50
+        assert summary.quantile(0.95) == 95
+
+    def test_prometheus_rendering(self):
+        """Rendered output should contain every series."""
+        registry = MetricsRegistry()
+        registry.incr("hits_total", route="chat")
+        registry.set_gauge("queue_depth", 3)
+        registry.observe("wait_seconds", 0.5)
+        text = registry.render_prometheus()
+        assert 'hits_total{route="chat"} 1' in text
+        assert "queue_depth 3" in text
+        assert 'wait_seconds{quantile="0.5"} 0.5' in text
+        assert "wait_seconds_count 1" in text
@@ -0,0 +1,87 @@
+"""Tests for the sampling profiler and loop stall monitor."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.profiling import LoopStallMonitor, StackSampler, collapse_stack
+
+
+def _busy_wait(seconds: float) -> None:
+    """Block the calling thread without sleeping."""
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pass
+
+
+class TestCollapseStack:
+    """Test collapsed-stack rendering."""
+
+    def test_stack_is_root_first(self):
+        """Current function should be the last frame."""
+        import sys
+
+        stack = collapse_stack(sys._getframe())
+        assert stack.split(";")[-1].startswith("TestCollapseStack.test_stack_is_root_first")
+
+    def test_empty_frame(self):
+        """No frame should give an empty stack."""
+        assert collapse_stack(None) == ""
+
+
+class TestStackSampler:
+    """Test the statistical sampler."""
+
+    def test_samples_target_thread(self):
+        """Sampler should capture the busy function in collapsed format."""
+        sampler = StackSampler(interval=0.001, thread_ids={threading.get_ident()})
+        sampler.start()
+        _busy_wait(0.1)
+        sampler.stop()
+
+        output = sampler.collapsed()
+        assert sampler.sample_count > 0
+        assert "_busy_wait" in output
+        # Every line is "<stack> <count>"
+        for line in output.splitlines():
+            stack, count = line.rsplit(" ", 1)
+            assert stack
+            assert int(count) > 0
+
+    def test_ignores_other_threads(self):
+        """Sampler should only sample the requested threads."""
+        sampler = StackSampler(interval=0.001, thread_ids={-1})
+        sampler.start()
+        _busy_wait(0.05)
+        sampler.stop()
+        assert sampler.collapsed() == ""
+
+
+class TestLoopStallMonitor:
+    """Test event-loop stall detection."""
+
+    @pytest.mark.asyncio
+    async def test_detects_blocking_call(self):
+        """A blocking call longer than the threshold should be reported."""
+        monitor = LoopStallMonitor(threshold_ms=50)
+        monitor.start()
+        await asyncio.sleep(0.05)
+        _busy_wait(0.3)
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+
+        stalls = monitor.recent()
+        assert len(stalls) >= 1
+        assert stalls[0].blocked_ms >= 50
+        assert "_busy_wait" in stalls[0].stack
+
+    @pytest.mark.asyncio
+    async def test_no_stall_when_idle(self):
+        """An idle loop should not report stalls."""
+        monitor = LoopStallMonitor(threshold_ms=100)
+        monitor.start()
+        await asyncio.sleep(0.2)
+        await monitor.stop()
+        assert monitor.recent() == []
@@ -0,0 +1,171 @@
+"""Tests for per-client rate limiting and token budgets."""
+
+import pytest
+
+from core.rate_limit import (
+    InMemoryRateLimitStore,
+    RateLimiter,
+    SQLiteRateLimitStore,
+    client_ip,
+    issue_session_token,
+    verify_session_token,
+)
+
+
+def _limiter(store=None, **overrides) -> RateLimiter:
+    config = dict(
+        requests_per_minute=60,
+        burst=3,
+        token_budget=1000,
+        budget_window=3600,
+    )
+    config.update(overrides)
+    if store is None:
+        store = InMemoryRateLimitStore()
+    return RateLimiter(store=store, **config)
+
+
+class TestRequestBucket:
+    """Test the token bucket on requests."""
+
+    def test_allows_burst_then_rejects(self):
+        """Burst requests should pass, the next one should be rejected."""
+        limiter = _limiter()
+        for _ in range(3):
+            assert limiter.check("ip:1", now=100.0).allowed
+        decision = limiter.check("ip:1", now=100.0)
+        assert not decision.allowed
+        assert decision.reason == "rate"
+        assert decision.retry_after >= 1
+
+    def test_bucket_refills_over_time(self):
+        """Requests should be allowed again after the refill interval."""
+        limiter = _limiter()
+        for _ in range(3):
+            limiter.check("ip:1", now=100.0)
+        assert not limiter.check("ip:1", now=100.0).allowed
+        assert limiter.check("ip:1", now=101.5).allowed
+
+    def test_keys_are_independent(self):
+        """One client's usage should not affect another."""
+        limiter = _limiter(burst=1)
+        assert limiter.check("ip:1", now=100.0).allowed
+        assert not limiter.check("ip:1", now=100.0).allowed
+        assert limiter.check("ip:2", now=100.0).allowed
+
+
+class TestTokenBudget:
+    """Test LLM token accounting."""
+
+    def test_rejects_when_budget_spent(self):
+        """Clients over their token budget should be rejected."""
+        limiter = _limiter(burst=10)
+        assert limiter.check("session:a", now=100.0).allowed
+        limiter.record_tokens("session:a", 1200, now=100.0)
+
+        decision = limiter.check("session:a", now=101.0)
+        assert not decision.allowed
+        assert decision.reason == "token_budget"
+
+    def test_budget_resets_after_window(self):
+        """Token budget should reset once the window elapses."""
+        limiter = _limiter(burst=10, budget_window=60)
+        limiter.check("session:a", now=100.0)
+        limiter.record_tokens("session:a", 5000, now=100.0)
+        assert not limiter.check("session:a", now=120.0).allowed
+        assert limiter.check("session:a", now=161.0).allowed
+
+
+class TestInMemoryStore:
+    """Test memory bounds of the in-memory store."""
+
+    def test_bounded_by_max_keys(self):
+        """Store should evict least recently used keys beyond max_keys."""
+        store = InMemoryRateLimitStore(max_keys=100)
+        limiter = _limiter(store=store)
+        for n in range(500):
+            limiter.check(f"ip:{n}", now=100.0)
+        assert len(store) == 100
+
+    def test_evicts_idle_entries(self):
+        """Entries idle past idle_seconds should be dropped."""
+        store = InMemoryRateLimitStore(idle_seconds=60)
+        limiter = _limiter(store=store)
+        limiter.check("ip:old", now=100.0)
+        limiter.check("ip:new", now=200.0)
+        assert len(store) == 1
+
+
+class TestSQLiteStore:
+    """Test the shared SQLite-backed store."""
+
+    def test_state_shared_between_limiters(self, tmp_path):
+        """Two limiters on the same file should see the same state."""
+        path = str(tmp_path / "limits.db")
+        first = _limiter(store=SQLiteRateLimitStore(path), burst=2)
+        second = _limiter(store=SQLiteRateLimitStore(path), burst=2)
+
+        assert first.check("ip:1", now=100.0).allowed
+        assert second.check("ip:1", now=100.0).allowed
+        assert not first.check("ip:1", now=100.0).allowed
+
+    def test_token_budget_persisted(self, tmp_path):
+        """Token usage recorded by one worker should be enforced by another."""
+        path = str(tmp_path / "limits.db")
+        first = _limiter(store=SQLiteRateLimitStore(path))
+        second = _limiter(store=SQLiteRateLimitStore(path))
+
+        first.record_tokens("session:a", 2000, now=100.0)
+        decision = second.check("session:a", now=100.0)
+        assert decision.reason == "token_budget"
+
+    @pytest.mark.asyncio
+    async def test_async_calls_leave_the_event_loop(self, tmp_path):
+        """check_async/record_tokens_async should run SQLite I/O in a worker thread."""
+        import threading
+
+        loop_thread = threading.get_ident()
+        threads = []
+
+        class RecordingStore(SQLiteRateLimitStore):
+            def load(self, key):
+                threads.append(threading.get_ident())
+                return super().load(key)
+
+        limiter = _limiter(store=RecordingStore(str(tmp_path / "limits.db")))
+        assert (await limiter.check_async("ip:1")).allowed
+        await limiter.record_tokens_async("ip:1", 2000)
+        assert (await limiter.check_async("ip:1")).reason == "token_budget"
+        assert len(threads) == 3 and loop_thread not in threads
+
+
+class TestClientIdentity:
+    """Test client IP resolution and signed session ids."""
+
+    TRUSTED = {"127.0.0.1", "10.0.0.2"}
+
+    def test_forwarded_for_ignored_from_untrusted_peer(self):
+        """A client talking to the agent directly cannot choose its IP."""
+        assert client_ip("203.0.113.9", "1.2.3.4", self.TRUSTED) == "203.0.113.9"
+
+    def test_rightmost_untrusted_hop_wins(self):
+        """Spoofed left-hand entries should be skipped."""
+        forwarded = "1.2.3.4, 198.51.100.7, 10.0.0.2"
+        assert client_ip("127.0.0.1", forwarded, self.TRUSTED) == "198.51.100.7"
+
+    def test_no_forwarded_for_uses_peer(self):
+        """Without a forwarded header the socket peer is the client."""
+        assert client_ip("127.0.0.1", None, self.TRUSTED) == "127.0.0.1"
+
+    def test_session_token_round_trip(self):
+        """Issued tokens should verify; tampered or foreign ones should not."""
+        token = issue_session_token("secret")
+        session_id = verify_session_token(token, "secret")
+        assert session_id and token.startswith(session_id)
+        assert verify_session_token(token, "other") is None
+        assert verify_session_token(token + "x", "secret") is None
+        assert verify_session_token("made-up", "secret") is None
+
+    def test_sessions_disabled_without_secret(self):
+        """No signing key means no session ids are trusted."""
+        assert verify_session_token(issue_session_token("secret"), "") is None
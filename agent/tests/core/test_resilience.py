@@ -0,0 +1,215 @@
+"""Tests for deadlines, hedging and the circuit breaker."""
+
+import asyncio
+
+import pytest
+
+from core.admission import AdmissionController
+from core.metrics import metrics
+from core.resilience import (
+    CircuitBreaker,
+    DeadlineExceeded,
+    call_with_deadlines,
+)
+
+
+class TestCircuitBreaker:
+    """Test circuit breaker state transitions."""
+
+    def test_trips_after_consecutive_failures(self):
+        """Breaker should open after the failure threshold."""
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow()
+        assert breaker.retry_after() >= 1
+
+    def test_success_resets_failures(self):
+        """A success should reset the consecutive failure count."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_allows_single_trial(self):
+        """After the reset timeout exactly one trial call is admitted."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_released_trial_can_be_retried(self):
+        """A trial that ended without an outcome should not block later trials."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.release_trial()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow()
+
+
+class TestCallWithDeadlines:
+    """Test per-attempt/total deadlines, retries and hedging."""
+
+    @pytest.mark.asyncio
+    async def test_returns_result(self):
+        """A fast call should return its result."""
+        async def call():
+            return "ok"
+
+        assert await call_with_deadlines(call, attempt_timeout=1, total_timeout=1) == "ok"
+
+    @pytest.mark.asyncio
+    async def test_attempt_timeout_then_retry(self):
+        """A stuck first attempt should time out and be retried."""
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(10)
+            return calls
+
+        result = await call_with_deadlines(
+            call, attempt_timeout=0.05, total_timeout=1, max_attempts=2
+        )
+        assert result == 2
+
+    @pytest.mark.asyncio
+    async def test_total_deadline(self):
+        """Hanging calls should raise DeadlineExceeded at the total deadline."""
+        async def call():
+            await asyncio.sleep(10)
+
+        with pytest.raises(DeadlineExceeded):
+            await call_with_deadlines(
+                call, attempt_timeout=0.05, total_timeout=0.08, max_attempts=5
+            )
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_error_raised(self):
+        """Errors rejected by is_retryable should propagate immediately."""
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            raise ValueError("bad request")
+
+        with pytest.raises(ValueError):
+            await call_with_deadlines(
+                call,
+                attempt_timeout=1,
+                total_timeout=1,
+                max_attempts=3,
+                is_retryable=lambda e: False,
+            )
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_hedge_wins_when_primary_slow(self):
+        """A hedged second call should be used if the first is slow."""
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(10)
+                return "primary"
+            return "hedge"
+
+        before = metrics.counter("hedge_test_hedge_wins_total")
+        result = await call_with_deadlines(
+            call,
+            attempt_timeout=1,
+            total_timeout=1,
+            hedge_delay=0.02,
+            metric_prefix="hedge_test",
+        )
+        assert result == "hedge"
+        assert metrics.counter("hedge_test_hedge_wins_total") == before + 1
+
+    @pytest.mark.asyncio
+    async def test_hedge_skipped_without_free_slot(self):
+        """A hedge should not fire when the admission controller has no free slot."""
+        admission = AdmissionController(max_concurrency=1, max_queue=0, queue_timeout=1)
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return "primary"
+
+        async with admission.slot():
+            result = await call_with_deadlines(
+                call,
+                attempt_timeout=1,
+                total_timeout=1,
+                hedge_delay=0.01,
+                hedge_admission=admission,
+                metric_prefix="hedge_skip_test",
+            )
+        assert result == "primary"
+        assert calls == 1
+        assert metrics.counter("hedge_skip_test_hedges_skipped_total") == 1
+        assert admission.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_hedge_holds_own_slot(self):
+        """A fired hedge should occupy a slot until it finishes."""
+        admission = AdmissionController(max_concurrency=2, max_queue=0, queue_timeout=1)
+        in_flight_during_hedge = []
+
+        async def call():
+            in_flight_during_hedge.append(admission.in_flight)
+            await asyncio.sleep(0.05)
+            return "ok"
+
+        async with admission.slot():
+            await call_with_deadlines(
+                call,
+                attempt_timeout=1,
+                total_timeout=1,
+                hedge_delay=0.01,
+                hedge_admission=admission,
+            )
+        await asyncio.sleep(0)
+        assert in_flight_during_hedge == [1, 2]
+        assert admission.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_discarded_result_reported(self):
+        """A losing copy that also finished should be passed to on_discarded."""
+        gate = asyncio.Event()
+        calls = 0
+        discarded = []
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await gate.wait()
+                return "primary"
+            # The hedge releases the primary so both finish together
+            gate.set()
+            return "hedge"
+
+        result = await call_with_deadlines(
+            call,
+            attempt_timeout=1,
+            total_timeout=1,
+            hedge_delay=0.01,
+            on_discarded=discarded.append,
+        )
+        assert len(discarded) == 1
+        assert {result, discarded[0]} == {"primary", "hedge"}
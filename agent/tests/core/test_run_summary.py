@@ -0,0 +1,91 @@
+"""Tests for agent run post-processing."""
+
+from pydantic_ai.messages import (
+    ModelRequest,
+    ModelResponse,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+
+from core.run_summary import parse_handoff_summary, summarize_run, tool_calls
+
+
+class _Usage:
+    total_tokens = 120
+    cache_read_tokens = 80
+
+
+class _Result:
+    def __init__(self, output: str, messages: list):
+        self.output = output
+        self._messages = messages
+
+    def usage(self):
+        return _Usage()
+
+    def new_messages(self):
+        return self._messages
+
+
+def _tool_round(name: str) -> list:
+    return [
+        ModelResponse(parts=[ToolCallPart(tool_name=name, args={"query": "apps"}, tool_call_id="c1")]),
+        ModelRequest(parts=[ToolReturnPart(tool_name=name, content="...", tool_call_id="c1")]),
+    ]
+
+
+class TestParseHandoffSummary:
+    """Test handoff marker extraction."""
+
+    def test_extracts_and_strips_markers(self):
+        """The summary should be returned and removed from the text."""
+        text, summary = parse_handoff_summary(
+            "Want me to pass this on?\n\n[HANDOFF_SUMMARY]Gym phone app[/HANDOFF_SUMMARY]"
+        )
+        assert text == "Want me to pass this on?"
+        assert summary == "Gym phone app"
+
+    def test_plain_reply_unchanged(self):
+        """Replies without markers pass through untouched."""
+        assert parse_handoff_summary("Hi there") == ("Hi there", None)
+
+    def test_unclosed_marker_unchanged(self):
+        """A half-written marker is not a handoff."""
+        assert parse_handoff_summary("[HANDOFF_SUMMARY]oops") == ("[HANDOFF_SUMMARY]oops", None)
+
+
+class TestToolCalls:
+    """Test tool-call extraction."""
+
+    def test_counts_each_call_once(self):
+        """Tool returns carry a tool_name too but must not be counted."""
+        messages = [
+            ModelRequest(parts=[UserPromptPart(content="hi")]),
+            *_tool_round("search_knowledge_base"),
+            ModelResponse(parts=[TextPart(content="done")]),
+        ]
+        assert tool_calls(messages) == ["search_knowledge_base"]
+
+
+class TestSummarizeRun:
+    """Test the combined summary."""
+
+    def test_summary_fields(self):
+        """Text, handoff, tools and tokens should all be filled in."""
+        result = _Result(
+            "Sure![HANDOFF_SUMMARY]Gym app[/HANDOFF_SUMMARY]",
+            _tool_round("search_knowledge_base"),
+        )
+        run = summarize_run(result)
+        assert run.text == "Sure!"
+        assert run.handoff_ready and run.handoff_summary == "Gym app"
+        assert run.tools_called == ["search_knowledge_base"]
+        assert (run.tokens_used, run.cached_tokens) == (120, 80)
+
+    def test_streamed_output_override(self):
+        """Streamed runs pass the final text explicitly."""
+        run = summarize_run(_Result("ignored", []), output="Phone app or website?")
+        assert run.text == "Phone app or website?"
+        assert run.tools_called == []
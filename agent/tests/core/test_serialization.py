@@ -0,0 +1,35 @@
+"""Tests for hand-built JSON encoding."""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from core import serialization
+from core.serialization import dumps
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def encoder(request, monkeypatch):
+    """Run each test with orjson and with the stdlib fallback."""
+    if request.param == "stdlib":
+        monkeypatch.setattr(serialization, "orjson", None)
+    return request.param
+
+
+class TestDumps:
+    """Test dumps() with and without orjson."""
+
+    def test_compact_text(self, encoder):
+        """Output should be compact JSON text."""
+        assert dumps({"type": "delta", "text": "hi"}) == '{"type":"delta","text":"hi"}'
+
+    def test_datetimes_as_iso(self, encoder):
+        """Datetimes from model_dump() should encode as ISO 8601."""
+        stamp = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+        assert json.loads(dumps({"timestamp": stamp})) == {"timestamp": "2026-10-19T12:00:00+00:00"}
+
+    def test_unknown_types_rejected(self, encoder):
+        """Objects without a JSON form should raise TypeError."""
+        with pytest.raises(TypeError):
+            dumps({"value": object()})
@@ -0,0 +1 @@
+"""Tests for app-building feature slice."""
@@ -0,0 +1,142 @@
+"""Tests for the app-building state machine."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from features.app_building import Action, AppBuildingState, advance, derive_state
+from features.app_building.classifier import classify_message
+from features.app_building.state_machine import (
+    CONSTRAINED_ACTIONS,
+    FORCED_ACTIONS,
+    PHASES,
+    TRANSITIONS,
+    Event,
+)
+
+
+def _msg(role: str, content: str):
+    return SimpleNamespace(role=role, content=content)
+
+
+class TestClassifier:
+    """Test message classification."""
+
+    def test_new_request_with_app_type(self):
+        """New requests should carry the detected app type."""
+        signals = classify_message("I want to build a gym app")
+        assert signals.is_new_request
+        assert signals.app_type == "gym app"
+
+    def test_platform_detection(self):
+        """Platform words should map to phone or website."""
+        assert classify_message("An iOS app please").platform == "phone"
+        assert classify_message("a website").platform == "website"
+
+    def test_affirmative(self):
+        """Short confirmations should be affirmative."""
+        assert classify_message("Yes please").is_affirmative
+        assert not classify_message("yes but also a website").is_affirmative
+
+
+class TestTransitionTable:
+    """Test the transition table itself."""
+
+    def test_every_phase_handles_every_details_event(self):
+        """Each phase must have a row for every non-affirm event."""
+        for phase in PHASES:
+            for event in (Event.NEW_REQUEST, Event.HAS_PLATFORM, Event.HAS_FEATURES, Event.NO_DETAILS):
+                assert (phase, event) in TRANSITIONS
+
+    def test_affirm_only_when_awaiting_confirmation(self):
+        """Confirmation is only meaningful after offering a handoff."""
+        affirm_phases = [phase for phase, event in TRANSITIONS if event == Event.AFFIRM]
+        assert affirm_phases == ["awaiting_confirmation"]
+
+    def test_every_action_is_forced_or_constrained(self):
+        """Each action either skips the model or only needs a one-line phrasing."""
+        for action in Action:
+            assert (action in FORCED_ACTIONS) != (action in CONSTRAINED_ACTIONS)
+
+
+class TestConversationFlow:
+    """Walk the full gathering flow with carried state."""
+
+    def test_full_flow(self):
+        """Type -> features -> platform -> offer -> confirm."""
+        t = advance(AppBuildingState(), "I want to build a gym app")
+        assert t.action == Action.ASK_FEATURES
+        assert t.state.phase == "collecting_features"
+        assert "gym app" in t.instruction()
+
+        t = advance(t.state, "Track workouts and show how busy the gym is")
+        assert t.action == Action.ASK_PLATFORM
+        assert t.state.features.startswith("Track workouts")
+
+        t = advance(t.state, "Phone app")
+        assert t.action == Action.OFFER_HANDOFF
+        assert t.is_forced
+        assert t.forced_response == "Want me to pass this to the team?"
+        assert t.handoff_summary == "App for phone - Track workouts and show how busy the gym is"
+
+        t = advance(t.state, "yes")
+        assert t.action == Action.CONFIRM_HANDOFF
+        assert t.state.phase == "handed_off"
+        assert t.instruction() is None
+
+    def test_no_details_asks_what_it_does(self):
+        """Vague messages should ask what the app should do."""
+        t = advance(AppBuildingState(), "hmm not sure")
+        assert t.action == Action.ASK_WHAT_IT_DOES
+        assert not t.is_forced
+
+    def test_affirm_without_offer_is_not_confirmation(self):
+        """'yes' before a handoff was offered should not hand off."""
+        t = advance(AppBuildingState(phase="collecting_platform", features="track orders"), "yes")
+        assert t.action == Action.ASK_PLATFORM
+
+    def test_new_request_resets_state(self):
+        """Switching topics should drop previously gathered details."""
+        state = AppBuildingState(phase="awaiting_confirmation", features="track", platform="phone")
+        t = advance(state, "Can you build a restaurant app?")
+        assert t.action == Action.ASK_FEATURES
+        assert t.state.features == ""
+        assert t.state.platform == ""
+        assert t.state.app_type == "restaurant app"
+
+    def test_state_round_trips_as_json(self):
+        """State should serialize so it can be carried between turns."""
+        t = advance(AppBuildingState(), "I need a fitness app")
+        restored = AppBuildingState.model_validate_json(t.state.model_dump_json())
+        assert restored == t.state
+
+
+class TestDeriveState:
+    """Test rebuilding state from history for clients that don't carry it."""
+
+    def test_awaiting_confirmation_from_last_assistant_message(self):
+        """History ending with a handoff offer should await confirmation."""
+        history = [
+            _msg("user", "I want to build a gym app"),
+            _msg("assistant", "Nice! What should it do?"),
+            _msg("user", "track workouts"),
+            _msg("assistant", "Phone app or website?"),
+            _msg("user", "phone"),
+            _msg("assistant", "Want me to pass this to the team?"),
+        ]
+        state = derive_state(history)
+        assert state.phase == "awaiting_confirmation"
+        assert state.features == "track workouts"
+
+        t = advance(state, "yeah")
+        assert t.action == Action.CONFIRM_HANDOFF
+        assert t.handoff_summary == "App for phone - track workouts"
+
+    @pytest.mark.parametrize("history,phase", [
+        ([], "collecting_type"),
+        ([_msg("user", "I want an app"), _msg("assistant", "What should it do?")], "collecting_features"),
+        ([_msg("user", "track my orders")], "collecting_platform"),
+    ])
+    def test_phase_from_details(self, history, phase):
+        """Phase should follow the details found in history."""
+        assert derive_state(history).phase == phase
@@ -0,0 +1,42 @@
+"""Tests for templated app-building replies."""
+
+from features.app_building import Action, AppBuildingState, Transition, render_template
+from features.app_building.templates import TEMPLATES
+
+
+def _transition(action: Action, app_type: str = "") -> Transition:
+    return Transition(state=AppBuildingState(app_type=app_type), action=action)
+
+
+class TestRenderTemplate:
+    """Test template selection and interpolation."""
+
+    def test_platform_question_is_fixed(self):
+        """ASK_PLATFORM should always say exactly the instructed line."""
+        assert render_template(_transition(Action.ASK_PLATFORM), "track workouts") == "Phone app or website?"
+
+    def test_features_question_names_app_type(self):
+        """ASK_FEATURES should interpolate the app type with the right article."""
+        reply = render_template(_transition(Action.ASK_FEATURES, "gym app"), "I want a gym app")
+        assert "gym app" in reply
+        reply = render_template(_transition(Action.ASK_FEATURES, "event app"), "I want an event app")
+        assert "an event app" in reply.lower()
+
+    def test_features_question_without_app_type(self):
+        """Without a type, ASK_FEATURES should fall back to the generic question."""
+        reply = render_template(_transition(Action.ASK_FEATURES), "build me something")
+        assert reply in TEMPLATES[Action.ASK_WHAT_IT_DOES]
+
+    def test_variant_is_stable_per_message(self):
+        """The same message should always get the same variant."""
+        transition = _transition(Action.ASK_WHAT_IT_DOES)
+        replies = {render_template(transition, "I want an app") for _ in range(5)}
+        assert len(replies) == 1
+
+    def test_questions_go_to_model(self):
+        """A message asking something itself needs free-form phrasing."""
+        assert render_template(_transition(Action.ASK_PLATFORM), "gym app, how long does it take?") is None
+
+    def test_forced_actions_have_no_template(self):
+        """Forced actions carry their own response."""
+        assert render_template(_transition(Action.OFFER_HANDOFF), "phone") is None
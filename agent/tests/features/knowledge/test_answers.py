@@ -0,0 +1,49 @@
+"""Tests for answers rendered without the model."""
+
+from features.knowledge.answers import NO_INFO_ANSWER, render_fallback_answer, trim_snippet
+from features.knowledge.models import KnowledgeResult, SearchResultItem
+
+
+class TestTrimSnippet:
+    """Test snippet trimming at sentence and word boundaries."""
+
+    def test_cuts_to_last_sentence(self):
+        """A snippet sliced mid-word should end at its last full sentence."""
+        text = "First sentence. Second one is cut mid-wo"
+        assert trim_snippet(text) == "First sentence."
+
+    def test_drops_slicing_ellipsis(self):
+        """The ellipsis added by slicing should not hide a cut word."""
+        text = "Tagline. Description that stops in ..."
+        assert trim_snippet(text) == "Tagline."
+
+    def test_word_boundary_without_sentence(self):
+        """Without a sentence end the snippet should stop at a whole word."""
+        assert trim_snippet("one two thr") == "one two..."
+
+    def test_complete_text_unchanged(self):
+        """Complete text should pass through, minus markdown bold."""
+        assert trim_snippet("**Bold** statement.") == "Bold statement."
+
+
+class TestRenderFallbackAnswer:
+    """Test the canned fallback answer."""
+
+    def test_no_results(self):
+        """No results should give the no-info guardrail answer."""
+        result = KnowledgeResult(found=False, category="all", query="x")
+        assert render_fallback_answer(result) == NO_INFO_ANSWER
+
+    def test_renders_top_result(self):
+        """The top result should be rendered without a cut-off word."""
+        item = SearchResultItem(
+            title="Spending Insights",
+            content="AI-driven financial clarity. Track every subscription in ...",
+            relevance="test",
+            source="apps/spending-insights",
+            score=90,
+        )
+        result = KnowledgeResult(found=True, category="apps", results=[item], query="x")
+        assert render_fallback_answer(result) == (
+            "Here's what I found on Spending Insights: AI-driven financial clarity."
+        )
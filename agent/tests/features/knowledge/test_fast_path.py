@@ -0,0 +1,95 @@
+"""Tests for the deterministic informational fast path."""
+
+import pytest
+
+from features.knowledge.fast_path import (
+    answer_fast_path,
+    match_template,
+    normalize_question,
+)
+
+
+class TestTemplateMatching:
+    """Test question-to-template classification."""
+
+    @pytest.mark.parametrize(
+        "message,expected",
+        [
+            ("What is Siphio?", "about"),
+            ("hey, who is siphio ai", "about"),
+            ("What apps do you have?", "apps"),
+            ("what are your products", "apps"),
+            ("How much does it cost?", "pricing"),
+            ("pricing", "pricing"),
+        ],
+    )
+    def test_matches_template(self, message, expected):
+        """Simple questions should map to their template class."""
+        template = match_template(message)
+        assert template is not None
+        assert template.name == expected
+
+    @pytest.mark.parametrize(
+        "message",
+        [
+            "What is Siphio's approach to building AI agents for startups?",
+            "How much does it cost to build a gym app with bookings?",
+            "Tell me about Spending Insights",
+        ],
+    )
+    def test_compound_questions_not_matched(self, message):
+        """Anything beyond the simple phrasing should go to the model."""
+        assert match_template(message) is None
+
+    def test_normalize_question(self):
+        """Normalization should drop punctuation and case."""
+        assert normalize_question("  What's   NEW?! ") == "whats new"
+
+
+class TestAnswerFastPath:
+    """Test answers rendered from knowledge results."""
+
+    @pytest.mark.asyncio
+    async def test_about_answer(self):
+        """About question should be answered from the company mission."""
+        answer = await answer_fast_path("What is Siphio?", min_score=85)
+        assert answer is not None
+        assert answer.template == "about"
+        assert "AI-native" in answer.response
+
+    @pytest.mark.asyncio
+    async def test_apps_answer_lists_apps(self):
+        """Apps question should list every app."""
+        answer = await answer_fast_path("What apps do you have?", min_score=85)
+        assert answer is not None
+        for name in ["Spending Insights", "Checklist Manager", "AI Agents"]:
+            assert name in answer.response
+        assert "3 apps" in answer.response
+
+    @pytest.mark.asyncio
+    async def test_apps_answer_uses_catalog(self, monkeypatch):
+        """Apps are listed from the catalog, whatever words they contain."""
+        from features.knowledge import search
+
+        catalog = {"apps": {"apps": [{"slug": "zen", "name": "Zen", "tagline": "Calm."}]}}
+        monkeypatch.setattr(search, "_cache", catalog)
+        answer = await answer_fast_path("What apps do you have?", min_score=85)
+        assert answer is not None
+        assert "1 apps right now: Zen" in answer.response
+
+    @pytest.mark.asyncio
+    async def test_pricing_answer(self):
+        """Pricing question should quote the pricing approach."""
+        answer = await answer_fast_path("How much does it cost?", min_score=85)
+        assert answer is not None
+        assert "$5K" in answer.response
+
+    @pytest.mark.asyncio
+    async def test_low_confidence_falls_through(self):
+        """Scores below the threshold should defer to the model."""
+        assert await answer_fast_path("How much does it cost?", min_score=99) is None
+
+    @pytest.mark.asyncio
+    async def test_unmatched_question(self):
+        """Questions without a template should defer to the model."""
+        assert await answer_fast_path("Do you have a blog?", min_score=85) is None
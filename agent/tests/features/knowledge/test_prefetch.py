@@ -0,0 +1,44 @@
+"""Tests for speculative knowledge prefetch."""
+
+from features.knowledge import KnowledgeResult, SearchResultItem, render_context
+
+
+def _item(title: str, score: float) -> SearchResultItem:
+    return SearchResultItem(
+        title=title, content=f"{title} details", relevance="match", source=f"apps/{title}", score=score
+    )
+
+
+class TestRenderContext:
+    """Test formatting prefetched results for the model."""
+
+    def test_lists_top_results(self):
+        """Only the best max_results results should be included."""
+        result = KnowledgeResult(
+            found=True,
+            category="all",
+            results=[_item("One", 90), _item("Two", 80), _item("Three", 70)],
+            query="apps",
+        )
+        context = render_context(result, max_results=2)
+        assert context.startswith("[CONTEXT:")
+        assert "[1] One (apps/One)\nOne details" in context
+        assert "Two" in context and "Three" not in context
+
+    def test_nothing_found(self):
+        """Empty searches leave the model to use the tool."""
+        result = KnowledgeResult(found=False, category="all", query="zzz", suggestion="Try apps")
+        assert render_context(result) is None
+
+    def test_zero_budget_sends_full_results(self):
+        """A zero budget should send the top results uncompacted, not none of them."""
+        result = KnowledgeResult(
+            found=True,
+            category="all",
+            results=[_item("Two", 80), _item("One", 90), _item("Three", 70)],
+            query="apps",
+        )
+        context = render_context(result, max_results=2, budget=0)
+        assert "left out" not in context
+        top = KnowledgeResult.model_validate_json(context.splitlines()[1])
+        assert [item.title for item in top.results] == ["One", "Two"]
@@ -0,0 +1,129 @@
+"""Tests for token-budgeted result rendering."""
+
+import random
+import string
+
+from features.knowledge import KnowledgeResult, SearchResultItem
+from features.knowledge.render import (
+    count_tokens,
+    drop_near_duplicates,
+    render_results,
+    truncate_to_tokens,
+)
+
+
+def _item(title: str, content: str, score: float) -> SearchResultItem:
+    return SearchResultItem(
+        title=title, content=content, relevance="match", source=f"apps/{title.lower()}", score=score
+    )
+
+
+def _result(*items: SearchResultItem) -> KnowledgeResult:
+    return KnowledgeResult(found=bool(items), category="all", results=list(items), query="apps")
+
+
+LONG = " ".join(f"feature{i} keeps track of spending" for i in range(200))
+
+
+def _long(title: str) -> str:
+    # Random words per title, so contents aren't near-duplicates of each other
+    rng = random.Random(title)
+    return " ".join(
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(600)
+    )
+
+
+class TestCountTokens:
+    """Test the local token estimate."""
+
+    def test_words_numbers_and_symbols(self):
+        """Short words, digit groups and symbols should each count."""
+        assert count_tokens("") == 0
+        assert count_tokens("the app") == 2
+        assert count_tokens("2025") == 2
+        assert count_tokens("**Tech**:") == 6
+
+    def test_long_words_cost_more(self):
+        """Longer words should count as more tokens."""
+        assert count_tokens("internationalization") > count_tokens("app")
+
+
+class TestTruncateToTokens:
+    """Test cutting content to a token count."""
+
+    def test_short_text_unchanged(self):
+        """Text within the limit should be returned as is."""
+        assert truncate_to_tokens("Tracks spending", 10) == "Tracks spending"
+
+    def test_long_text_cut_at_word(self):
+        """Long text should be cut between words and marked."""
+        cut = truncate_to_tokens(LONG, 20)
+        assert cut.endswith(" …")
+        assert count_tokens(cut) <= 20
+        assert LONG.startswith(cut[:-2])
+
+
+class TestDropNearDuplicates:
+    """Test near-duplicate removal."""
+
+    def test_keeps_first_of_similar_contents(self):
+        """A result repeating a better one's content should be dropped."""
+        items = [
+            _item("One", "Spending Insights tracks where your money goes each month", 90),
+            _item("Two", "Spending Insights tracks where your money goes each month!", 80),
+            _item("Three", "Checklist Manager keeps recurring tasks in order", 70),
+        ]
+        assert [item.title for item in drop_near_duplicates(items)] == ["One", "Three"]
+
+
+class TestRenderResults:
+    """Test rendering within a budget."""
+
+    def test_fits_budget_and_reports_savings(self):
+        """Long results should be cut to the budget and the savings counted."""
+        result = _result(*(_item(f"App{i}", _long(f"App{i}"), 90 - i) for i in range(5)))
+        rendered = render_results(result, budget=300)
+
+        assert rendered.tokens <= 300
+        assert rendered.included == 5
+        assert rendered.truncated == 5
+        assert rendered.tokens_saved == rendered.full_tokens - rendered.tokens > 0
+
+    def test_short_results_untouched(self):
+        """Results that fit should be rendered in full, best first."""
+        result = _result(_item("Two", "Second app", 80), _item("One", "First app", 90))
+        rendered = render_results(result, budget=300)
+
+        assert rendered.text == 'Results for "apps" (2 of 2 shown):\n\n[1] One (apps/one)\nFirst app\n\n[2] Two (apps/two)\nSecond app'
+        assert rendered.truncated == 0
+
+    def test_results_left_out_when_budget_runs_out(self):
+        """Results that can't get a useful share should be left out and counted."""
+        result = _result(*(_item(f"App{i}", _long(f"App{i}"), 90 - i) for i in range(5)))
+        rendered = render_results(result, budget=80)
+
+        assert 0 < rendered.included < 5
+        assert f"{5 - rendered.included} left out" in rendered.text
+
+    def test_savings_measured_against_considered_results(self):
+        """full_tokens should only count the max_results results considered."""
+        result = _result(*(_item(f"App{i}", _long(f"App{i}"), 90 - i) for i in range(5)))
+        top = result.model_copy(update={"results": result.results[:2]})
+        rendered = render_results(result, budget=2000, max_results=2)
+
+        assert rendered.full_tokens == count_tokens(top.model_dump_json())
+        assert rendered.truncated == 0
+
+    def test_duplicates_dropped(self):
+        """Near-duplicate results should not be rendered twice."""
+        result = _result(_item("One", "Same content here", 90), _item("Two", "Same content here", 80))
+        rendered = render_results(result, budget=300)
+
+        assert rendered.duplicates_dropped == 1
+        assert "[2]" not in rendered.text
+        assert "1 left out" in rendered.text
+
+    def test_nothing_found(self):
+        """An empty result should render its suggestion."""
+        result = KnowledgeResult(found=False, category="all", query="zzz", suggestion="Try apps")
+        assert render_results(result, budget=300).text == 'No results for "zzz". Try apps'
@@ -0,0 +1,30 @@
+"""Tests for the search_knowledge_base tool."""
+
+import json
+
+import pytest
+
+from core import settings
+from features.knowledge.render import count_tokens
+from features.knowledge.tool import search_knowledge_base
+
+
+class TestSearchKnowledgeBaseTool:
+    """Test the tool's return value."""
+
+    @pytest.mark.asyncio
+    async def test_returns_budgeted_text(self, monkeypatch):
+        """Results should come back as compact text within the budget."""
+        monkeypatch.setattr(settings, "KNOWLEDGE_TOOL_TOKEN_BUDGET", 200)
+        output = await search_knowledge_base(None, "AI agents", response_format="detailed")
+        assert output.startswith('Results for "AI agents"')
+        assert count_tokens(output) <= 200
+
+    @pytest.mark.asyncio
+    async def test_zero_budget_returns_json(self, monkeypatch):
+        """A budget of 0 should hand the model the full result, encoded once."""
+        monkeypatch.setattr(settings, "KNOWLEDGE_TOOL_TOKEN_BUDGET", 0)
+        output = await search_knowledge_base(None, "Spending Insights", category="apps")
+        result = json.loads(output)
+        assert result["found"] is True
+        assert result["results"][0]["title"]
@@ -114,6 +114,58 @@ class TestExecuteCapture:
         assert result.is_duplicate is True
         assert "already have" in result.message.lower()
 
+    @pytest.mark.asyncio
+    @patch("features.leads.capture._get_postgrest")
+    async def test_recent_capture_detected_from_cache(self, mock_get_postgrest):
+        """A second capture for the same email should be flagged without a lookup query."""
+        mock_postgrest = MagicMock()
+        mock_get_postgrest.return_value = mock_postgrest
+        mock_table = MagicMock()
+        mock_postgrest.from_.return_value = mock_table
+        mock_table.select.return_value.eq.return_value.gte.return_value.limit.return_value.execute.return_value.data = []
+
+        first = await execute_capture(name="John Doe", email="John@Example.com", conversation_summary="")
+        second = await execute_capture(name="John Doe", email="john@example.com", conversation_summary="")
+
+        assert first.is_duplicate is False
+        assert second.is_duplicate is True
+        assert mock_table.select.call_count == 1
+
+    @pytest.mark.asyncio
+    @patch("features.leads.capture._get_postgrest")
+    async def test_duplicate_check_uses_normalized_email(self, mock_get_postgrest):
+        """The 24h lookup should filter on the indexed normalized column."""
+        mock_postgrest = MagicMock()
+        mock_get_postgrest.return_value = mock_postgrest
+        mock_table = MagicMock()
+        mock_postgrest.from_.return_value = mock_table
+        mock_table.select.return_value.eq.return_value.gte.return_value.limit.return_value.execute.return_value.data = []
+
+        await execute_capture(name="John Doe", email=" John@Example.com ", conversation_summary="")
+
+        mock_table.select.return_value.eq.assert_called_once_with("email_normalized", "john@example.com")
+
+    @pytest.mark.asyncio
+    @patch("features.leads.capture._get_postgrest")
+    async def test_reference_id_collision_retried(self, mock_get_postgrest):
+        """A reference id rejected by the unique index should be regenerated."""
+        class UniqueViolation(Exception):
+            code = "23505"
+
+        mock_postgrest = MagicMock()
+        mock_get_postgrest.return_value = mock_postgrest
+        mock_table = MagicMock()
+        mock_postgrest.from_.return_value = mock_table
+        mock_table.select.return_value.eq.return_value.gte.return_value.limit.return_value.execute.return_value.data = []
+        mock_table.insert.return_value.execute.side_effect = [UniqueViolation("duplicate key"), MagicMock()]
+
+        result = await execute_capture(name="John Doe", email="john@example.com", conversation_summary="")
+
+        assert result.success is True
+        first, second = (call.args[0]["reference_id"] for call in mock_table.insert.call_args_list)
+        assert first != second
+        assert result.reference_id == second
+
     @pytest.mark.asyncio
     @patch("features.leads.capture._get_postgrest")
     async def test_database_error_handled(self, mock_get_postgrest):
@@ -0,0 +1,159 @@
+"""Tests for idempotency keys."""
+
+import asyncio
+
+import pytest
+
+from core.cache import MemoryCache
+from features.leads.idempotency import IdempotencyConflict, IdempotencyStore, request_fingerprint
+
+
+def _store() -> IdempotencyStore:
+    return IdempotencyStore(MemoryCache(max_entries=10, default_ttl=60), ttl=60)
+
+
+class TestRequestFingerprint:
+    """Test request fingerprints."""
+
+    def test_key_order_does_not_matter(self):
+        """Equal bodies should match however their keys are ordered."""
+        assert request_fingerprint({"a": 1, "b": 2}) == request_fingerprint({"b": 2, "a": 1})
+        assert request_fingerprint({"a": 1}) != request_fingerprint({"a": 2})
+
+
+class TestIdempotencyStore:
+    """Test replaying and coalescing by key."""
+
+    def test_repeat_is_replayed(self):
+        """A repeated key should return the stored response without running again."""
+        store = _store()
+        calls = []
+
+        async def operation():
+            calls.append(1)
+            return {"reference_id": f"SIPH-{len(calls)}"}
+
+        async def run():
+            first = await store.run("key", "fp", operation)
+            second = await store.run("key", "fp", operation)
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert first == ({"reference_id": "SIPH-1"}, False)
+        assert second == ({"reference_id": "SIPH-1"}, True)
+        assert len(calls) == 1
+
+    def test_different_request_conflicts(self):
+        """Reusing a key for a different request should be refused."""
+        store = _store()
+
+        async def run():
+            await store.run("key", "fp-1", lambda: asyncio.sleep(0, {"ok": True}))
+            await store.run("key", "fp-2", lambda: asyncio.sleep(0, {"ok": True}))
+
+        with pytest.raises(IdempotencyConflict):
+            asyncio.run(run())
+
+    def test_concurrent_repeats_coalesce(self):
+        """Repeats arriving mid-flight should share the first attempt's result."""
+        store = _store()
+        calls = []
+
+        async def operation():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"reference_id": "SIPH-1"}
+
+        async def run():
+            return await asyncio.gather(*(store.run("key", "fp", operation) for _ in range(5)))
+
+        results = asyncio.run(run())
+        assert len(calls) == 1
+        assert [replayed for _, replayed in results].count(False) == 1
+        assert all(body == {"reference_id": "SIPH-1"} for body, _ in results)
+
+    def test_unstored_responses_rerun(self):
+        """Responses rejected by should_store should not be replayed."""
+        store = _store()
+        calls = []
+
+        async def operation():
+            calls.append(1)
+            return {"success": len(calls) > 1}
+
+        async def run():
+            kwargs = {"should_store": lambda body: body["success"]}
+            await store.run("key", "fp", operation, **kwargs)
+            await store.run("key", "fp", operation, **kwargs)
+            return await store.run("key", "fp", operation, **kwargs)
+
+        assert asyncio.run(run()) == ({"success": True}, True)
+        assert len(calls) == 2
+
+    def test_errors_reach_waiters_and_are_not_stored(self):
+        """A failed attempt should fail its waiters and leave the key retryable."""
+        store = _store()
+
+        async def failing():
+            await asyncio.sleep(0.05)
+            raise RuntimeError("database down")
+
+        async def run():
+            results = await asyncio.gather(
+                store.run("key", "fp", failing),
+                store.run("key", "fp", failing),
+                return_exceptions=True,
+            )
+            retry = await store.run("key", "fp", lambda: asyncio.sleep(0, {"ok": True}))
+            return results, retry
+
+        results, retry = asyncio.run(run())
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert retry == ({"ok": True}, False)
+
+    def test_cancelled_first_attempt_is_retried_by_a_waiter(self):
+        """Waiters should not fail because the first request's client went away."""
+        store = _store()
+        calls = []
+
+        async def operation():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"reference_id": f"SIPH-{len(calls)}"}
+
+        async def run():
+            first = asyncio.create_task(store.run("key", "fp", operation))
+            await asyncio.sleep(0.01)
+            waiters = [asyncio.create_task(store.run("key", "fp", operation)) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            first.cancel()
+            results = await asyncio.gather(*waiters)
+            return first, results
+
+        first, results = asyncio.run(run())
+        assert first.cancelled()
+        assert len(calls) == 2
+        assert all(body == {"reference_id": "SIPH-2"} for body, _ in results)
+        assert [replayed for _, replayed in results].count(False) == 1
+
+    def test_cancelled_waiter_leaves_first_attempt_running(self):
+        """A waiter going away should neither cancel nor retry the first attempt."""
+        store = _store()
+        calls = []
+
+        async def operation():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"ok": True}
+
+        async def run():
+            first = asyncio.create_task(store.run("key", "fp", operation))
+            await asyncio.sleep(0.01)
+            waiter = asyncio.create_task(store.run("key", "fp", operation))
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            return await first, waiter
+
+        result, waiter = asyncio.run(run())
+        assert result == ({"ok": True}, False)
+        assert waiter.cancelled() and len(calls) == 1
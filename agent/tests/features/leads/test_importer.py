@@ -0,0 +1,117 @@
+"""Tests for bulk lead import."""
+
+from features.leads.importer import chunks, import_leads, read_rows
+
+
+def _rows(*rows):
+    return list(enumerate(rows, start=2))
+
+
+class TestReadRows:
+    """Test streaming rows from files."""
+
+    def test_csv(self, tmp_path):
+        """CSV rows should come with their line numbers."""
+        path = tmp_path / "leads.csv"
+        path.write_text("name,email\nJane Doe,jane@example.com\nJohn Roe,john@example.com\n")
+        assert [(line, row["email"]) for line, row in read_rows(path)] == [
+            (2, "jane@example.com"),
+            (3, "john@example.com"),
+        ]
+
+    def test_jsonl_with_bad_lines(self, tmp_path):
+        """Unparseable lines should be yielded as errors, blank lines skipped."""
+        path = tmp_path / "leads.jsonl"
+        path.write_text('{"name": "Jane Doe"}\n\nnot json\n[1, 2]\n')
+        rows = list(read_rows(path))
+        assert rows[0] == (1, {"name": "Jane Doe"})
+        assert [line for line, _ in rows] == [1, 3, 4]
+        assert all("_error" in row for _, row in rows[1:])
+
+
+class TestChunks:
+    """Test batching an iterator."""
+
+    def test_last_chunk_is_short(self):
+        """The final chunk should hold whatever is left."""
+        assert list(chunks(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+class TestImportLeads:
+    """Test validation, dedup and batched inserts."""
+
+    def _run(self, rows, recent=frozenset(), batch_size=500, insert=None, dry_run=False):
+        inserted, rejects = [], []
+        stats = import_leads(
+            rows,
+            on_reject=rejects.append,
+            batch_size=batch_size,
+            dry_run=dry_run,
+            find_recent=lambda emails: {e for e in emails if e in recent},
+            insert=insert or inserted.append,
+        )
+        return stats, inserted, rejects
+
+    def test_valid_rows_inserted_in_batches(self):
+        """Rows should be inserted batch_size at a time, normalized."""
+        rows = _rows(*({"name": f"Lead {i}", "email": f"Lead{i}@Example.com"} for i in range(5)))
+        stats, inserted, rejects = self._run(rows, batch_size=2)
+
+        assert [len(batch) for batch in inserted] == [2, 2, 1]
+        assert inserted[0][0]["email"] == "lead0@example.com"
+        assert inserted[0][0]["inquiry_type"] == "other"
+        assert (stats.read, stats.imported, stats.rejected) == (5, 5, 0)
+        assert rejects == []
+
+    def test_invalid_rows_rejected(self):
+        """Rows failing validate_email/validate_name semantics should be reported."""
+        rows = _rows(
+            {"name": "Jane Doe", "email": "not-an-email"},
+            {"name": "J", "email": "j@example.com"},
+            {"name": "Jane Doe", "email": "jane@example.com", "inquiry_type": "spam"},
+            {"_error": "Invalid JSON"},
+        )
+        stats, inserted, rejects = self._run(rows)
+
+        assert inserted == []
+        assert [r["line"] for r in rejects] == [2, 3, 4, 5]
+        assert {r["reason"] for r in rejects} == {"invalid"}
+        assert rejects[0]["error"] == "Invalid email format"
+
+    def test_duplicates_in_chunk_and_recent(self):
+        """Repeats within the file and recent captures should be skipped."""
+        rows = _rows(
+            {"name": "Jane Doe", "email": "jane@example.com"},
+            {"name": "Jane Doe", "email": "JANE@example.com"},
+            {"name": "Old Lead", "email": "old@example.com"},
+        )
+        stats, inserted, rejects = self._run(rows, recent={"old@example.com"})
+
+        assert [lead["email"] for lead in inserted[0]] == ["jane@example.com"]
+        assert [(r["line"], r["reason"]) for r in rejects] == [
+            (3, "duplicate_in_file"),
+            (4, "duplicate_recent"),
+        ]
+
+    def test_failed_insert_rejects_batch(self):
+        """A failed insert should report its rows instead of aborting the import."""
+        def insert(batch):
+            if batch[0]["email"] == "a@example.com":
+                raise ConnectionError("database down")
+
+        rows = _rows(
+            {"name": "Lead A", "email": "a@example.com"},
+            {"name": "Lead B", "email": "b@example.com"},
+        )
+        stats, _, rejects = self._run(rows, batch_size=1, insert=insert)
+
+        assert (stats.imported, stats.rejected) == (1, 1)
+        assert rejects[0]["reason"] == "insert_failed"
+
+    def test_dry_run_inserts_nothing(self):
+        """A dry run should count importable rows without inserting them."""
+        rows = _rows({"name": "Jane Doe", "email": "jane@example.com"})
+        stats, inserted, _ = self._run(rows, dry_run=True)
+
+        assert inserted == []
+        assert stats.imported == 1
@@ -0,0 +1,117 @@
+"""Tests for lead lookup and listing."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from features.leads import lookup
+from features.leads.lookup import get_lead_status, stream_leads
+
+
+def _postgrest_with(rows_by_table: dict):
+    mock_postgrest = MagicMock()
+
+    def from_(table):
+        def eq(column, value):
+            query = MagicMock()
+            rows = [row for row in rows_by_table.get(table, []) if row[column] == value]
+            query.limit.return_value.execute.return_value.data = rows
+            return query
+
+        mock_table = MagicMock()
+        mock_table.select.return_value.eq.side_effect = eq
+        return mock_table
+
+    mock_postgrest.from_.side_effect = from_
+    return mock_postgrest
+
+
+ROW = {"reference_id": "SIPH-1A2B3C4D", "inquiry_type": "freelance_project", "created_at": "2026-10-01T12:00:00+00:00"}
+
+
+class TestGetLeadStatus:
+    """Test reference ID lookups."""
+
+    @patch("features.leads.lookup._get_postgrest")
+    def test_found_in_leads(self, mock_get_postgrest):
+        """A live lead should be reported as received."""
+        mock_get_postgrest.return_value = _postgrest_with({"leads": [ROW]})
+
+        lead = get_lead_status("siph-1a2b3c4d")
+
+        assert lead.reference_id == "SIPH-1A2B3C4D"
+        assert lead.status == "received"
+        assert lead.inquiry_type == "freelance_project"
+
+    @patch("features.leads.lookup._get_postgrest")
+    def test_falls_back_to_archive(self, mock_get_postgrest):
+        """A lead past retention should be found in the archive."""
+        mock_get_postgrest.return_value = _postgrest_with({"leads_archive": [ROW]})
+
+        assert get_lead_status("SIPH-1A2B3C4D").status == "archived"
+
+    @patch("features.leads.lookup._get_postgrest")
+    def test_lookups_are_cached(self, mock_get_postgrest):
+        """Repeated lookups, hits and misses alike, should query once."""
+        mock_postgrest = _postgrest_with({"leads": [ROW]})
+        mock_get_postgrest.return_value = mock_postgrest
+
+        get_lead_status("SIPH-1A2B3C4D")
+        get_lead_status("SIPH-1A2B3C4D")
+        assert get_lead_status("SIPH-00000000") is None
+        assert get_lead_status("SIPH-00000000") is None
+
+        # One query for the hit, two (leads, archive) for the miss
+        assert mock_postgrest.from_.call_count == 3
+
+    @patch("features.leads.lookup._get_postgrest")
+    def test_malformed_id_skips_database(self, mock_get_postgrest):
+        """IDs that can't have been issued should not be looked up."""
+        assert get_lead_status("not-an-id") is None
+        assert get_lead_status("SIPH-XYZ") is None
+        mock_get_postgrest.assert_not_called()
+
+
+def _rows(n: int) -> list[dict]:
+    return [
+        {"id": f"{i:08d}", "created_at": f"2026-10-01T00:00:{59 - i:02d}+00:00"}
+        for i in range(n)
+    ]
+
+
+class TestStreamLeads:
+    """Test keyset pagination."""
+
+    def _collect(self, monkeypatch, rows, **kwargs):
+        calls = []
+
+        def fetch_page(page_size, since=None, before=None):
+            calls.append((page_size, before))
+            start = 0 if before is None else next(i for i, r in enumerate(rows) if r["id"] == before[1]) + 1
+            return rows[start:start + page_size]
+
+        monkeypatch.setattr(lookup, "fetch_page", fetch_page)
+
+        async def collect():
+            return [row async for row in stream_leads(**kwargs)]
+
+        return asyncio.run(collect()), calls
+
+    def test_pages_through_all_rows(self, monkeypatch):
+        """Each page should continue from the last row of the previous one."""
+        rows = _rows(7)
+        streamed, calls = self._collect(monkeypatch, rows, page_size=3)
+
+        assert streamed == rows
+        assert calls == [
+            (3, None),
+            (3, (rows[2]["created_at"], rows[2]["id"])),
+            (3, (rows[5]["created_at"], rows[5]["id"])),
+        ]
+
+    def test_limit_shrinks_last_page(self, monkeypatch):
+        """A limit should stop the stream and never over-fetch."""
+        rows = _rows(7)
+        streamed, calls = self._collect(monkeypatch, rows, page_size=3, limit=4)
+
+        assert streamed == rows[:4]
+        assert [size for size, _ in calls] == [3, 1]
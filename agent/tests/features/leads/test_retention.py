@@ -0,0 +1,42 @@
+"""Tests for lead archival."""
+
+from unittest.mock import MagicMock, patch
+
+from features.leads.retention import archive_old_leads
+
+
+def _rpc_returning(mock_get_postgrest, counts):
+    mock_postgrest = MagicMock()
+    mock_get_postgrest.return_value = mock_postgrest
+    mock_postgrest.rpc.return_value.execute.side_effect = [MagicMock(data=n) for n in counts]
+    return mock_postgrest
+
+
+class TestArchiveOldLeads:
+    """Test batching calls to the archive_leads SQL function."""
+
+    @patch("features.leads.retention._get_postgrest")
+    def test_runs_until_short_batch(self, mock_get_postgrest):
+        """Batches should continue until one moves fewer than batch_size leads."""
+        mock_postgrest = _rpc_returning(mock_get_postgrest, [100, 100, 40])
+
+        assert archive_old_leads(retention_days=365, batch_size=100) == 240
+        assert mock_postgrest.rpc.call_count == 3
+        mock_postgrest.rpc.assert_called_with(
+            "archive_leads", {"p_retention_days": 365, "p_batch_size": 100}
+        )
+
+    @patch("features.leads.retention._get_postgrest")
+    def test_max_batches(self, mock_get_postgrest):
+        """max_batches should cap the run even if more leads remain."""
+        mock_postgrest = _rpc_returning(mock_get_postgrest, [100, 100, 100])
+
+        assert archive_old_leads(retention_days=30, batch_size=100, max_batches=2) == 200
+        assert mock_postgrest.rpc.call_count == 2
+
+    @patch("features.leads.retention._get_postgrest")
+    def test_nothing_to_archive(self, mock_get_postgrest):
+        """An empty result should count as zero leads moved."""
+        _rpc_returning(mock_get_postgrest, [None])
+
+        assert archive_old_leads(retention_days=365, batch_size=100) == 0
@@ -2,7 +2,7 @@
 
 import pytest
 
-from features.leads.validation import validate_email, validate_name
+from features.leads.validation import validate_email, validate_emails_bulk, validate_name
 
 
 class TestEmailValidation:
@@ -94,3 +94,12 @@ class TestNameValidation:
         valid, error = validate_name(long_name)
         assert valid is False
         assert "less than 100" in error
+
+
+class TestBulkEmailValidation:
+    """Test chunked email validation."""
+
+    def test_matches_single_validation(self):
+        """Bulk results should match validate_email() row for row."""
+        emails = ["", "  ", "a@b.co", " A@B.COM ", "x" * 250 + "@b.com", "bad", "a@b"]
+        assert validate_emails_bulk(emails) == [validate_email(e)[1] for e in emails]
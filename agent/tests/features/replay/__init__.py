@@ -0,0 +1 @@
+"""Tests for replay feature slice."""
@@ -0,0 +1,129 @@
+"""Tests for batch conversation replay."""
+
+import asyncio
+import io
+import json
+
+import pytest
+
+from features.replay import TurnOutcome, file_lines, replay_conversations, split_lines
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+async def _collect(lines, handler, concurrency=2) -> list[dict]:
+    return [json.loads(line) async for line in replay_conversations(_aiter(lines), handler, concurrency)]
+
+
+async def _echo(message: str, history: list[dict]) -> TurnOutcome:
+    return TurnOutcome(response=f"echo:{message}", branch="echo", tokens_used=len(history))
+
+
+def _conversation(conv_id: str, *messages) -> str:
+    return json.dumps({
+        "id": conv_id,
+        "messages": [{"role": role, "content": content} for role, content in messages],
+    })
+
+
+class TestReplayConversations:
+    """Test replay output and ordering."""
+
+    @pytest.mark.asyncio
+    async def test_emits_turn_and_summary_lines(self):
+        """Each user turn gets a line, then one summary per conversation."""
+        records = await _collect(
+            [_conversation("c1", ("user", "hi"), ("assistant", "hello"), ("user", "bye"))],
+            _echo,
+        )
+        turns = [r for r in records if r["type"] == "turn"]
+        assert [t["message"] for t in turns] == ["hi", "bye"]
+        assert turns[1]["tokens_used"] == 2  # recorded history: user + assistant
+        assert records[-1]["type"] == "conversation"
+        assert records[-1]["turns"] == 2
+
+    @pytest.mark.asyncio
+    async def test_generated_reply_used_when_not_recorded(self):
+        """Consecutive user turns should see the generated reply in history."""
+        seen: list[list[dict]] = []
+
+        async def handler(message, history):
+            seen.append(history)
+            return TurnOutcome(response=f"re:{message}", branch="x")
+
+        await _collect([_conversation("c1", ("user", "a"), ("user", "b"))], handler)
+        assert seen[1] == [
+            {"role": "user", "content": "a"},
+            {"role": "assistant", "content": "re:a"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_branch_match(self):
+        """Expected branch labels should be compared with the actual branch."""
+        line = json.dumps({
+            "id": "c1",
+            "messages": [{"role": "user", "content": "hi", "expected_branch": "echo"}],
+        })
+        records = await _collect([line], _echo)
+        assert records[0]["branch_match"] is True
+
+    @pytest.mark.asyncio
+    async def test_handler_errors_reported(self):
+        """Failing turns should produce an error line, not abort the run."""
+        async def failing(message, history):
+            raise RuntimeError("boom")
+
+        records = await _collect([_conversation("c1", ("user", "hi"))], failing)
+        assert "boom" in records[0]["error"]
+        assert records[1]["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalid_lines_reported(self):
+        """Malformed input lines should yield error records."""
+        records = await _collect(["not json", "", _conversation("c1", ("user", "hi"))], _echo)
+        assert records[0]["type"] == "error"
+        assert records[0]["line"] == 1
+        assert records[-1]["type"] == "conversation"
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """No more than max_concurrency conversations should run at once."""
+        running = peak = 0
+
+        async def slow(message, history):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return TurnOutcome(response="", branch="x")
+
+        lines = [_conversation(f"c{n}", ("user", "hi")) for n in range(10)]
+        records = await _collect(lines, slow, concurrency=3)
+        assert peak <= 3
+        assert sum(r["type"] == "conversation" for r in records) == 10
+
+
+class TestSplitLines:
+    """Test byte-stream line splitting."""
+
+    @pytest.mark.asyncio
+    async def test_lines_across_chunks(self):
+        """Lines split across chunks should be reassembled."""
+        chunks = [b'{"a":', b' 1}\n{"b"', b': 2}\n{"c": 3}']
+        lines = [line async for line in split_lines(_aiter(chunks))]
+        assert lines == ['{"a": 1}', '{"b": 2}', '{"c": 3}']
+
+
+class TestFileLines:
+    """Test line reading from a spooled body."""
+
+    @pytest.mark.asyncio
+    async def test_strips_line_endings(self):
+        """Lines should come back without newlines, including a final unterminated one."""
+        body = io.BytesIO(b'{"a": 1}\r\n{"b": 2}\n{"c": 3}')
+        lines = [line async for line in file_lines(body)]
+        assert lines == ['{"a": 1}', '{"b": 2}', '{"c": 3}']
@@ -0,0 +1 @@
+"""Transcript feature tests."""
@@ -0,0 +1,110 @@
+"""Tests for the buffered transcript sink."""
+
+import asyncio
+import gzip
+import json
+
+from features.transcripts import TranscriptSink, TranscriptTurn, client_id
+
+
+def _turn(message: str = "hi") -> TranscriptTurn:
+    return TranscriptTurn(client_id="abc", message=message, response="hello", branch="fast_path")
+
+
+def _sink(tmp_path, writer, capacity: int = 100, batch_size: int = 10) -> TranscriptSink:
+    return TranscriptSink(
+        capacity=capacity,
+        batch_size=batch_size,
+        flush_interval=60.0,
+        spool_dir=str(tmp_path / "spool"),
+        writer=writer,
+    )
+
+
+class TestClientId:
+    """Test pseudonymous client ids."""
+
+    def test_stable_and_opaque(self):
+        """The same key should map to the same id without exposing the key."""
+        assert client_id("ip:10.0.0.1", "k") == client_id("ip:10.0.0.1", "k")
+        assert client_id("ip:10.0.0.1", "k") != client_id("ip:10.0.0.2", "k")
+        assert "10.0.0.1" not in client_id("ip:10.0.0.1", "k")
+
+    def test_keyed(self):
+        """Ids should depend on the secret, so they can't be brute-forced from IPs alone."""
+        import hashlib
+
+        assert client_id("ip:10.0.0.1", "k") != client_id("ip:10.0.0.1", "other")
+        assert client_id("ip:10.0.0.1", "k") != hashlib.sha256(b"ip:10.0.0.1").hexdigest()[:16]
+
+
+class TestTranscriptSink:
+    """Test buffering, batching and spooling."""
+
+    def test_record_drops_oldest_when_full(self, tmp_path):
+        """A full buffer should keep the newest turns."""
+        sink = _sink(tmp_path, writer=lambda rows: None, capacity=3)
+        for i in range(5):
+            sink.record(_turn(str(i)))
+        assert len(sink) == 3
+        assert [row["message"] for row in sink._take_batch()] == ["2", "3", "4"]
+
+    def test_flush_writes_in_batches(self, tmp_path):
+        """Buffered turns should reach the writer in batch_size chunks."""
+        batches = []
+        sink = _sink(tmp_path, writer=batches.append, batch_size=2)
+        for i in range(5):
+            sink.record(_turn(str(i)))
+
+        assert asyncio.run(sink.flush()) == 5
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert batches[0][0]["client_id"] == "abc"
+        assert isinstance(batches[0][0]["created_at"], str)
+        assert len(sink) == 0
+
+    def test_failed_writes_are_spooled(self, tmp_path):
+        """Turns the writer rejects should land in a gzip JSONL segment."""
+        def failing(rows):
+            raise ConnectionError("database down")
+
+        sink = _sink(tmp_path, writer=failing)
+        sink.record(_turn("one"))
+        sink.record(_turn("two"))
+        asyncio.run(sink.flush())
+
+        segments = list((tmp_path / "spool").glob("transcripts-*.jsonl.gz"))
+        assert len(segments) == 1
+        with gzip.open(segments[0], "rt", encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        assert [row["message"] for row in rows] == ["one", "two"]
+
+    def test_stop_flushes_remaining_turns(self, tmp_path):
+        """Stopping should write what the background task hasn't yet."""
+        batches = []
+        sink = _sink(tmp_path, writer=batches.append)
+
+        async def run():
+            sink.start()
+            sink.record(_turn())
+            await sink.stop()
+
+        asyncio.run(run())
+        assert sum(len(batch) for batch in batches) == 1
+
+    def test_full_batch_wakes_the_flusher(self, tmp_path):
+        """Reaching batch_size should flush without waiting for the interval."""
+        batches = []
+        sink = _sink(tmp_path, writer=batches.append, batch_size=2)
+
+        async def run():
+            sink.start()
+            sink.record(_turn("a"))
+            sink.record(_turn("b"))
+            for _ in range(100):
+                if batches:
+                    break
+                await asyncio.sleep(0.01)
+            await sink.stop()
+
+        asyncio.run(run())
+        assert [len(batch) for batch in batches] == [2]
@@ -1,16 +1,78 @@
 """Tests for the FastAPI endpoints."""
 
+import json
+
 import pytest
 from fastapi.testclient import TestClient
+
+from core import SYSTEM_PROMPT, settings
+from core.admission import AdmissionController
+from core.rate_limit import (
+    InMemoryRateLimitStore,
+    RateLimiter,
+    build_rate_limiter,
+    build_session_mint_limiter,
+    issue_session_token,
+)
+from core.resilience import CircuitBreaker
 from main import app
 
 
+class FakeUsage:
+    total_tokens = 42
+    input_tokens = 30
+    cache_read_tokens = 24
+
+
+class FakeRunResult:
+    """Stands in for an AgentRunResult."""
+
+    def __init__(self, output: str):
+        self.output = output
+
+    def usage(self):
+        return FakeUsage()
+
+    def new_messages(self):
+        return []
+
+
+class FakeAgent:
+    """Agent double that answers every run with a fixed output."""
+
+    def __init__(self, output: str = "Fake answer"):
+        self.output = output
+        self.runs = 0
+        self.prompts = []
+
+    async def run(self, user_prompt, **kwargs):
+        self.runs += 1
+        self.prompts.append(user_prompt)
+        return FakeRunResult(self.output)
+
+
 @pytest.fixture
 def client():
     """Create a test client for the FastAPI app."""
     return TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def fresh_rate_limiter(monkeypatch):
+    """Give each test its own request, token and session-mint budgets."""
+    import main
+
+    limiter = build_rate_limiter(settings)
+    monkeypatch.setattr(main, "rate_limiter", limiter)
+    monkeypatch.setattr(main, "session_mints", build_session_mint_limiter(settings, limiter.store))
+
+
+@pytest.fixture
+def no_templates(monkeypatch):
+    """Send app-building questions to the model instead of the templates."""
+    monkeypatch.setattr(settings, "RESPONSE_TEMPLATES_ENABLED", False)
+
+
 class TestHealthEndpoint:
     """Test the health check endpoint."""
 
@@ -27,6 +89,103 @@ class TestHealthEndpoint:
         assert data["service"] == "siphio-agent"
 
 
+def _poll(live_client: TestClient, path: str, status: int = 200, timeout: float = 5.0):
+    """GET path until it returns status (the first probe round runs in the background)."""
+    import time
+
+    deadline = time.monotonic() + timeout
+    while True:
+        response = live_client.get(path)
+        if response.status_code == status or time.monotonic() > deadline:
+            return response
+        time.sleep(0.05)
+
+
+class TestReadyEndpoint:
+    """Test the readiness and deep health endpoints."""
+
+    def test_ready_after_startup(self):
+        """Readiness should pass once indexes are warm and the first probes passed."""
+        with TestClient(app) as live_client:
+            response = _poll(live_client, "/ready")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+
+    def test_not_ready_while_draining(self):
+        """Readiness should fail once shutdown has started."""
+        with TestClient(app):
+            pass
+        response = TestClient(app).get("/ready")
+        assert response.status_code == 503
+
+    def test_deep_health_reports_checks(self):
+        """Deep health should report each probe from the cache."""
+        with TestClient(app) as live_client:
+            response = _poll(live_client, "/health/deep")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "healthy"
+        assert data["checks"]["knowledge"]["ok"] is True
+
+    def test_failing_ready_probe_blocks_readiness(self, monkeypatch):
+        """A failing probe listed in HEALTH_READY_PROBES should fail /ready and /health/deep."""
+        import main
+
+        def failing_probes(client):
+            async def model() -> None:
+                raise RuntimeError("unreachable")
+
+            return {"model": model}
+
+        monkeypatch.setattr(main, "build_probes", failing_probes)
+        monkeypatch.setattr(settings, "HEALTH_READY_PROBES", "model")
+        with TestClient(app) as live_client:
+            deep = _poll(live_client, "/health/deep", status=503)
+            ready = live_client.get("/ready")
+        assert deep.json()["checks"]["model"]["error"] == "RuntimeError: unreachable"
+        assert ready.status_code == 503
+
+
+    def test_upstream_outage_keeps_readiness(self, monkeypatch):
+        """With the default HEALTH_READY_PROBES, a failing model probe only degrades /health/deep."""
+        import main
+        from core.config import Settings
+
+        def probes(client):
+            async def knowledge() -> None:
+                pass
+
+            async def model() -> None:
+                raise RuntimeError("unreachable")
+
+            return {"knowledge": knowledge, "model": model}
+
+        monkeypatch.setattr(main, "build_probes", probes)
+        monkeypatch.setattr(settings, "HEALTH_READY_PROBES", Settings.model_fields["HEALTH_READY_PROBES"].default)
+        with TestClient(app) as live_client:
+            ready = _poll(live_client, "/ready")
+            deep = live_client.get("/health/deep")
+        assert ready.status_code == 200
+        assert deep.status_code == 503
+
+    def test_unknown_ready_probe_blocks_readiness(self, monkeypatch):
+        """A misspelt HEALTH_READY_PROBES entry should fail /ready, not be ignored."""
+        monkeypatch.setattr(settings, "HEALTH_READY_PROBES", "knowlege")
+        with TestClient(app) as live_client:
+            _poll(live_client, "/health/deep")
+            ready = live_client.get("/ready")
+        assert ready.status_code == 503
+
+class TestMetricsEndpoint:
+    """Test the metrics endpoint."""
+
+    def test_metrics_returns_prometheus_text(self, client):
+        """Metrics endpoint should return plain-text exposition."""
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+
+
 class TestChatEndpoint:
     """Test the chat endpoint."""
 
@@ -61,6 +220,174 @@ class TestChatEndpoint:
         # Will fail without valid API key, but should not be a validation error
         assert response.status_code in [200, 500]
 
+    def test_chat_returns_503_when_saturated(self, client, monkeypatch):
+        """Chat should fast-fail with Retry-After when the LLM queue is full."""
+        import main
+
+        saturated = AdmissionController(max_concurrency=0, max_queue=0, queue_timeout=1)
+        monkeypatch.setattr(main, "llm_admission", saturated)
+        response = client.post("/chat", json={"message": "Tell me about Spending Insights"})
+        assert response.status_code == 503
+        assert int(response.headers["Retry-After"]) >= 1
+
+    def test_chat_rate_limited_per_session(self, client, monkeypatch):
+        """Chat should answer 429 once a session exceeds its request budget."""
+        import main
+
+        limiter = RateLimiter(
+            store=InMemoryRateLimitStore(),
+            requests_per_minute=1,
+            burst=1,
+            token_budget=1000,
+            budget_window=3600,
+        )
+        monkeypatch.setattr(main, "rate_limiter", limiter)
+        monkeypatch.setattr(settings, "SESSION_SIGNING_KEY", "secret")
+        headers = {"X-Session-Id": issue_session_token("secret")}
+        # A bare platform answer is handled without an LLM call
+        first = client.post("/chat", json={"message": "phone"}, headers=headers)
+        assert first.status_code == 200
+        second = client.post("/chat", json={"message": "phone"}, headers=headers)
+        assert second.status_code == 429
+        assert "Retry-After" in second.headers
+
+    def test_chat_ignores_unsigned_session_ids(self, client, monkeypatch):
+        """Rotating made-up session ids must not buy a fresh request budget."""
+        import main
+
+        limiter = RateLimiter(
+            store=InMemoryRateLimitStore(),
+            requests_per_minute=1,
+            burst=1,
+            token_budget=1000,
+            budget_window=3600,
+        )
+        monkeypatch.setattr(main, "rate_limiter", limiter)
+        monkeypatch.setattr(settings, "SESSION_SIGNING_KEY", "secret")
+        first = client.post("/chat", json={"message": "phone"}, headers={"X-Session-Id": "a"})
+        assert first.status_code == 200
+        # The unsigned id is replaced with a server-issued one
+        assert "." in first.headers["X-Session-Id"]
+        second = client.post("/chat", json={"message": "phone"}, headers={"X-Session-Id": "b"})
+        assert second.status_code == 429
+
+    def test_session_minting_capped_per_ip(self, client, monkeypatch):
+        """An IP should not get a fresh session (and budget) on every request."""
+        import main
+
+        monkeypatch.setattr(settings, "SESSION_SIGNING_KEY", "secret")
+        monkeypatch.setattr(settings, "RATE_LIMIT_SESSIONS_PER_IP_PER_HOUR", 2)
+        monkeypatch.setattr(main, "session_mints", build_session_mint_limiter(settings, InMemoryRateLimitStore()))
+        issued = [
+            client.post("/chat", json={"message": "phone"}).headers.get("X-Session-Id")
+            for _ in range(3)
+        ]
+        assert all(issued[:2]) and issued[2] is None
+
+    def test_chat_falls_back_to_knowledge_when_circuit_open(self, client, monkeypatch):
+        """Informational queries should get a canned answer while the breaker is open."""
+        import main
+
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        breaker.record_failure()
+        monkeypatch.setattr(main, "llm_breaker", breaker)
+        response = client.post("/chat", json={"message": "Tell me about Spending Insights"})
+        assert response.status_code == 200
+        data = response.json()
+        assert "Spending Insights" in data["response"]
+        assert data["tokens_used"] == 0
+
+    def test_chat_app_building_503_when_circuit_open(self, client, monkeypatch, no_templates):
+        """App-building turns needing the model should 503 while the breaker is open."""
+        import main
+
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        breaker.record_failure()
+        monkeypatch.setattr(main, "llm_breaker", breaker)
+        response = client.post("/chat", json={"message": "I want to build a gym app"})
+        assert response.status_code == 503
+        assert "Retry-After" in response.headers
+
+    def test_admission_rejection_releases_half_open_trial(self, client, monkeypatch, no_templates):
+        """A rejected half-open trial should leave the breaker able to try again."""
+        import main
+
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        saturated = AdmissionController(max_concurrency=0, max_queue=0, queue_timeout=1)
+        monkeypatch.setattr(main, "llm_breaker", breaker)
+        monkeypatch.setattr(main, "llm_admission", saturated)
+        response = client.post("/chat", json={"message": "I want to build a gym app"})
+        assert response.status_code == 503
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow()
+
+    def test_non_transient_error_does_not_trip_breaker(self, client, monkeypatch, no_templates):
+        """Errors caused by the request itself should not count as OpenRouter failures."""
+        import main
+
+        class BrokenAgent:
+            async def run(self, *args, **kwargs):
+                raise ValueError("bad prompt")
+
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        monkeypatch.setattr(main, "llm_breaker", breaker)
+        monkeypatch.setattr(main, "get_agent", lambda tier=None: BrokenAgent())
+        response = client.post("/chat", json={"message": "I want to build a gym app"})
+        assert response.status_code == 500
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_chat_fast_path_skips_model(self, client):
+        """Simple informational questions should be answered without the LLM."""
+        from core.metrics import metrics
+
+        before = metrics.counter("chat_branch_total", branch="fast_path")
+        response = client.post("/chat", json={"message": "What is Siphio?"})
+        assert response.status_code == 200
+        assert response.json()["tokens_used"] == 0
+        assert metrics.counter("chat_branch_total", branch="fast_path") == before + 1
+
+
+    def test_chat_pricing_question_uses_fast_path(self, client):
+        """Pricing questions fall outside the informational keywords but still skip the LLM."""
+        from core.metrics import metrics
+
+        before = metrics.counter("chat_branch_total", branch="fast_path")
+        response = client.post("/chat", json={"message": "How much does it cost?"})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["tokens_used"] == 0
+        assert "$5K" in data["response"]
+        assert metrics.counter("chat_branch_total", branch="fast_path") == before + 1
+
+    def test_chat_reuses_cached_opening_answer(self, client, monkeypatch):
+        """A repeated first-turn informational question should not call the model twice."""
+        import main
+
+        fake = FakeAgent("Spending Insights tracks your spending.")
+        monkeypatch.setattr(main, "get_agent", lambda tier=None: fake)
+        first = client.post("/chat", json={"message": "Tell me about Spending Insights"})
+        second = client.post("/chat", json={"message": "tell me about spending insights!"})
+        assert first.json()["tokens_used"] == 42
+        assert first.json()["cached_tokens"] == 24
+        assert second.json()["response"] == first.json()["response"]
+        assert second.json()["tokens_used"] == 0
+        assert fake.runs == 1
+
+    def test_chat_carries_app_state(self, client):
+        """Forced app-building turns should return state for the next turn."""
+        state = {"phase": "collecting_platform", "features": "track workouts"}
+        response = client.post("/chat", json={"message": "website", "app_state": state})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["handoff_ready"] is True
+        assert data["handoff_summary"] == "App for website - track workouts"
+        assert data["app_state"]["phase"] == "awaiting_confirmation"
+
+        response = client.post("/chat", json={"message": "yes", "app_state": data["app_state"]})
+        assert response.json()["response"] == "Great, I'll let the team know!"
+        assert response.json()["app_state"]["phase"] == "handed_off"
+
     def test_chat_validates_history_role(self, client):
         """Chat endpoint should validate history roles."""
         request = {
@@ -71,3 +398,456 @@ class TestChatEndpoint:
         }
         response = client.post("/chat", json=request)
         assert response.status_code == 422
+
+
+class TestTranscripts:
+    """Test that answered turns are queued for the conversations table."""
+
+    def test_chat_records_turn(self, client, monkeypatch, tmp_path):
+        """A /chat turn should be recorded with a hashed client id."""
+        import main
+        from features.transcripts import TranscriptSink
+
+        sink = TranscriptSink(
+            capacity=10, batch_size=10, flush_interval=60.0,
+            spool_dir=str(tmp_path), writer=lambda rows: None,
+        )
+        monkeypatch.setattr(main, "transcripts", sink)
+        response = client.post("/chat", json={"message": "How much does it cost?"})
+        assert response.status_code == 200
+
+        (row,) = sink._take_batch()
+        assert row["message"] == "How much does it cost?"
+        assert row["response"] == response.json()["response"]
+        assert row["transport"] == "http"
+        assert row["latency_ms"] >= 0
+        assert "testclient" not in row["client_id"]
+
+
+class TestPromptPrefix:
+    """Test that every model request starts with the same cacheable prefix."""
+
+    def _capture_agent(self, seen: list):
+        from pydantic_ai import Agent
+        from pydantic_ai.messages import ModelResponse, TextPart
+        from pydantic_ai.models.function import FunctionModel
+
+        def respond(messages, info):
+            seen.append(messages)
+            return ModelResponse(parts=[TextPart(content="Phone app or website?")])
+
+        return Agent(FunctionModel(respond), system_prompt=SYSTEM_PROMPT)
+
+    def test_follow_up_turns_keep_system_prompt(self, client, monkeypatch, no_templates):
+        """Turns with history should still lead with the system prompt."""
+        import main
+        from pydantic_ai.messages import SystemPromptPart
+
+        seen = []
+        monkeypatch.setattr(main, "get_agent", lambda tier=None: self._capture_agent(seen))
+        history = [
+            {"role": "user", "content": "I want to build a gym app"},
+            {"role": "assistant", "content": "Nice! What should it do?"},
+        ]
+        first = client.post("/chat", json={"message": "Tell me about Spending Insights"})
+        later = client.post("/chat", json={"message": "track workouts", "conversation_history": history})
+        assert first.status_code == later.status_code == 200
+
+        first_parts, later_parts = seen[0][0].parts, seen[1][0].parts
+        assert isinstance(first_parts[0], SystemPromptPart)
+        assert isinstance(later_parts[0], SystemPromptPart)
+        assert first_parts[0].content == later_parts[0].content == SYSTEM_PROMPT
+
+    def test_instructed_turn_answered_from_template(self, client, monkeypatch):
+        """App-building questions with fixed wording should not call the model."""
+        import main
+
+        fake = FakeAgent("unused")
+        monkeypatch.setattr(main, "get_agent", lambda tier=None: fake)
+        response = client.post("/chat", json={"message": "I want to build a gym app"})
+        data = response.json()
+        assert response.status_code == 200
+        assert "gym app" in data["response"]
+        assert data["tokens_used"] == 0
+        assert data["app_state"]["phase"] == "collecting_features"
+        assert fake.runs == 0
+
+    def test_instruction_trails_user_message(self, client, monkeypatch, no_templates):
+        """The per-turn instruction should follow the user's own text, not prefix it."""
+        import main
+
+        fake = FakeAgent("Phone app or website?")
+        monkeypatch.setattr(main, "get_agent", lambda tier=None: fake)
+        state = {"phase": "collecting_features", "app_type": "gym app"}
+        response = client.post("/chat", json={"message": "track workouts", "app_state": state})
+        assert response.status_code == 200
+        message, instruction = fake.prompts[0]
+        assert message == "track workouts"
+        assert instruction.startswith("[INSTRUCTION:")
+
+
+class TestKnowledgePrefetch:
+    """Test sending search results with informational turns."""
+
+    def test_results_sent_with_turn(self, client, monkeypatch):
+        """The model should get the search results and answer in one request."""
+        import main
+        from core.metrics import metrics
+
+        fake = FakeAgent("Spending Insights tracks your spending.")
+        monkeypatch.setattr(main, "get_agent", lambda tier=None: fake)
+        before = metrics.counter("llm_round_trips_saved_total")
+        response = client.post("/chat", json={"message": "Tell me about Spending Insights"})
+        message, context = fake.prompts[0]
+        assert message == "Tell me about Spending Insights"
+        assert context.startswith("[CONTEXT:") and "Spending Insights" in context
+        assert response.json()["tools_called"] == ["search_knowledge_base"]
+        assert metrics.counter("llm_round_trips_saved_total") == before + 1
+
+    def test_disabled_leaves_search_to_tool(self, client, monkeypatch):
+        """Without prefetch the model gets only the user's message."""
+        import main
+
+        fake = FakeAgent("ok")
+        monkeypatch.setattr(main, "get_agent", lambda tier=None: fake)
+        monkeypatch.setattr(settings, "KNOWLEDGE_PREFETCH_ENABLED", False)
+        client.post("/chat", json={"message": "Tell me about Spending Insights"})
+        assert fake.prompts == ["Tell me about Spending Insights"]
+
+
+class TestModelTiers:
+    """Test that each chat branch runs on the right model tier."""
+
+    def _record_tiers(self, monkeypatch) -> list:
+        import main
+
+        tiers = []
+
+        def get_agent(tier=None):
+            tiers.append(tier)
+            return FakeAgent("ok")
+
+        monkeypatch.setattr(main, "get_agent", get_agent)
+        return tiers
+
+    def test_instructed_turns_use_fast_tier(self, client, monkeypatch, no_templates):
+        """App-building questions dictated by an instruction should use the fast model."""
+        from core.agent import ModelTier
+
+        monkeypatch.setattr(settings, "OPENROUTER_FAST_MODEL", "cheap/model")
+        tiers = self._record_tiers(monkeypatch)
+        client.post("/chat", json={"message": "I want to build a gym app"})
+        assert tiers == [ModelTier.FAST]
+
+    def test_fast_tier_is_full_without_fast_model(self, client, monkeypatch, no_templates):
+        """Without a fast model, instructed turns should run (and be counted) as FULL."""
+        from core.agent import ModelTier
+        from core.metrics import metrics
+
+        monkeypatch.setattr(settings, "OPENROUTER_FAST_MODEL", "")
+        tiers = self._record_tiers(monkeypatch)
+        before = metrics.counter("llm_runs_total", tier="fast")
+        client.post("/chat", json={"message": "I want to build a gym app"})
+        assert tiers == [ModelTier.FULL]
+        assert metrics.counter("llm_runs_total", tier="fast") == before
+
+    def test_open_questions_use_full_tier(self, client, monkeypatch):
+        """Informational questions should use the full model."""
+        from core.agent import ModelTier
+        from core.metrics import metrics
+
+        tiers = self._record_tiers(monkeypatch)
+        before = metrics.counter("llm_tokens_total", tier="full")
+        client.post("/chat", json={"message": "Tell me about Spending Insights"})
+        assert tiers == [ModelTier.FULL]
+        assert metrics.counter("llm_tokens_total", tier="full") == before + 42
+
+
+class TestWebSocketChat:
+    """Test chat over /ws/chat with server-held context."""
+
+    def _streaming_agent(self, seen: list, chunks: list[str]):
+        from pydantic_ai import Agent
+        from pydantic_ai.models.function import FunctionModel
+
+        async def stream(messages, info):
+            seen.append(messages)
+            for chunk in chunks:
+                yield chunk
+
+        return Agent(FunctionModel(stream_function=stream), system_prompt=SYSTEM_PROMPT)
+
+    def test_streams_deltas_then_done(self, client, monkeypatch, no_templates):
+        """Model text should arrive as deltas followed by the full response."""
+        import main
+
+        seen = []
+        agent = self._streaming_agent(seen, ["A gym app, ", "nice! What should it do?"])
+        monkeypatch.setattr(main, "get_agent", lambda tier=None: agent)
+        with client.websocket_connect("/ws/chat") as ws:
+            ws.send_json({"message": "I want to build a gym app"})
+            events = []
+            while not events or events[-1]["type"] not in ("done", "error"):
+                events.append(ws.receive_json())
+        deltas = [e["text"] for e in events if e["type"] == "delta"]
+        assert "".join(deltas) == "A gym app, nice! What should it do?"
+        assert events[-1]["response"] == "A gym app, nice! What should it do?"
+        assert events[-1]["branch"] == "app_building_llm"
+
+    def test_context_is_held_between_turns(self, client, monkeypatch):
+        """Later turns should see earlier ones without the client resending them."""
+        import main
+
+        seen = []
+        agent = self._streaming_agent(seen, ["Spending Insights tracks spending."])
+        monkeypatch.setattr(main, "get_agent", lambda tier=None: agent)
+        with client.websocket_connect("/ws/chat") as ws:
+            ws.send_json({"message": "How much does it cost?"})
+            first = ws.receive_json()
+            ws.send_json({"message": "Tell me about Spending Insights"})
+            while (second := ws.receive_json())["type"] not in ("done", "error"):
+                pass
+
+        assert first["type"] == "done" and first["branch"] == "fast_path"
+        # System prompt + pricing turn + the new question
+        history = seen[0]
+        assert [m.kind for m in history] == ["request", "response", "request"]
+        assert history[0].parts[1].content == "How much does it cost?"
+        assert history[1].parts[0].content == first["response"]
+        assert second["response"] == "Spending Insights tracks spending."
+
+    def test_app_state_carried_on_server(self, client):
+        """The app-building state should advance without the client sending it."""
+        with client.websocket_connect("/ws/chat") as ws:
+            ws.send_json({"message": "I want to build a gym app"})
+            assert ws.receive_json()["app_state"]["phase"] == "collecting_features"
+            ws.send_json({"message": "track workouts and show how busy it is"})
+            assert ws.receive_json()["app_state"]["phase"] == "collecting_platform"
+            ws.send_json({"message": "phone app"})
+            done = ws.receive_json()
+            handoff = ws.receive_json()
+        assert done["handoff_ready"] is True
+        assert handoff == {"type": "handoff", "summary": done["handoff_summary"]}
+
+    def test_bad_turn_keeps_connection(self, client):
+        """Invalid messages should be reported without closing the socket."""
+        with client.websocket_connect("/ws/chat") as ws:
+            ws.send_json({"text": "wrong field"})
+            error = ws.receive_json()
+            ws.send_json({"message": "How much does it cost?"})
+            done = ws.receive_json()
+        assert error["type"] == "error" and error["status"] == 422
+        assert done["branch"] == "fast_path"
+
+    def test_non_json_frame_keeps_connection(self, client):
+        """A frame that isn't JSON should get a 422 error, not a dropped socket."""
+        with client.websocket_connect("/ws/chat") as ws:
+            ws.send_text("not json {")
+            error = ws.receive_json()
+            ws.send_bytes(b"\xff\x00")
+            binary_error = ws.receive_json()
+            ws.send_json({"message": "How much does it cost?"})
+            done = ws.receive_json()
+        assert error["type"] == "error" and error["status"] == 422
+        assert error["detail"][0]["type"] == "json_invalid"
+        assert binary_error["status"] == 422
+        assert done["branch"] == "fast_path"
+
+    def test_rate_limited_turn(self, client, monkeypatch):
+        """Turns over budget should get a 429 error event."""
+        import main
+
+        limiter = RateLimiter(
+            store=InMemoryRateLimitStore(),
+            requests_per_minute=1,
+            burst=1,
+            token_budget=1000,
+            budget_window=3600,
+        )
+        monkeypatch.setattr(main, "rate_limiter", limiter)
+        with client.websocket_connect("/ws/chat") as ws:
+            ws.send_json({"message": "How much does it cost?"})
+            assert ws.receive_json()["type"] == "done"
+            ws.send_json({"message": "How much does it cost?"})
+            error = ws.receive_json()
+        assert error["status"] == 429 and error["retry_after"] > 0
+
+
+class TestLeadIdempotency:
+    """Test Idempotency-Key on POST /lead."""
+
+    LEAD = {"name": "Jane Doe", "email": "jane@example.com"}
+
+    @pytest.fixture
+    def capture_calls(self, monkeypatch):
+        """Fresh idempotency store and a fake capture that counts calls."""
+        import main
+        from features.leads import LeadResult
+        from features.leads import capture
+        from features.leads.idempotency import build_idempotency_store
+
+        monkeypatch.setattr(main, "lead_idempotency", build_idempotency_store(settings))
+        calls = []
+
+        async def execute_capture(**kwargs):
+            calls.append(kwargs)
+            return LeadResult(success=True, reference_id=f"SIPH-0000000{len(calls)}", message="Saved")
+
+        monkeypatch.setattr(capture, "execute_capture", execute_capture)
+        return calls
+
+    def test_repeat_returns_original_response(self, client, capture_calls):
+        """A retried submission should get the first reference ID without a second capture."""
+        headers = {"Idempotency-Key": "form-1"}
+        first = client.post("/lead", json=self.LEAD, headers=headers)
+        second = client.post("/lead", json=self.LEAD, headers=headers)
+
+        assert first.json() == second.json()
+        assert second.headers["Idempotent-Replayed"] == "true"
+        assert "Idempotent-Replayed" not in first.headers
+        assert len(capture_calls) == 1
+
+    def test_key_reused_for_other_lead(self, client, capture_calls):
+        """The same key with a different body should be rejected."""
+        headers = {"Idempotency-Key": "form-1"}
+        client.post("/lead", json=self.LEAD, headers=headers)
+        response = client.post("/lead", json={**self.LEAD, "email": "other@example.com"}, headers=headers)
+
+        assert response.status_code == 422
+        assert len(capture_calls) == 1
+
+    def test_without_key_every_request_captures(self, client, capture_calls):
+        """Requests without a key should behave as before."""
+        client.post("/lead", json=self.LEAD)
+        client.post("/lead", json=self.LEAD)
+        assert len(capture_calls) == 2
+
+
+class TestLeadLookup:
+    """Test GET /lead/{reference_id}."""
+
+    def test_known_reference(self, client, monkeypatch):
+        """A known reference ID should return its status without contact details."""
+        from features.leads import LeadStatus
+        from features.leads import lookup
+
+        monkeypatch.setattr(lookup, "get_lead_status", lambda ref: LeadStatus(
+            reference_id="SIPH-1A2B3C4D", status="received", inquiry_type="other"
+        ))
+        response = client.get("/lead/SIPH-1A2B3C4D")
+        assert response.status_code == 200
+        assert response.json()["status"] == "received"
+        assert "email" not in response.json()
+
+    def test_unknown_reference(self, client, monkeypatch):
+        """Unknown or malformed reference IDs should 404."""
+        from features.leads import lookup
+
+        monkeypatch.setattr(lookup, "get_lead_status", lambda ref: None)
+        assert client.get("/lead/SIPH-00000000").status_code == 404
+
+
+class TestAdminEndpoints:
+    """Test the protected admin diagnostics endpoints."""
+
+    @pytest.fixture
+    def admin_key(self, monkeypatch):
+        """Configure an admin key for the duration of a test."""
+        monkeypatch.setattr(settings, "ADMIN_API_KEY", "test-admin-key")
+        return "test-admin-key"
+
+    def test_admin_disabled_without_key(self, client, monkeypatch):
+        """Admin endpoints should not exist when no key is configured."""
+        monkeypatch.setattr(settings, "ADMIN_API_KEY", "")
+        response = client.get("/admin/stalls")
+        assert response.status_code == 404
+
+    def test_admin_rejects_wrong_key(self, client, admin_key):
+        """Admin endpoints should reject an invalid key."""
+        response = client.get("/admin/stalls", headers={"X-Admin-Key": "wrong"})
+        assert response.status_code == 401
+
+    def test_list_leads_streams_jsonl(self, client, admin_key, monkeypatch):
+        """The lead listing should stream one JSON line per lead."""
+        from features.leads import lookup
+
+        pages = [
+            [{"id": "b", "created_at": "2026-10-02T00:00:00+00:00"}],
+            [],
+        ]
+        monkeypatch.setattr(lookup, "fetch_page", lambda size, since=None, before=None: pages.pop(0))
+        monkeypatch.setattr(settings, "LEAD_LIST_PAGE_SIZE", 1)
+
+        response = client.get("/admin/leads", headers={"X-Admin-Key": admin_key})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert [json.loads(line)["id"] for line in response.text.splitlines()] == ["b"]
+
+    def test_list_leads_needs_full_cursor(self, client, admin_key):
+        """A cursor needs both its created_at and id halves."""
+        response = client.get(
+            "/admin/leads",
+            params={"before_created_at": "2026-10-02T00:00:00Z"},
+            headers={"X-Admin-Key": admin_key},
+        )
+        assert response.status_code == 422
+
+    def test_profile_returns_collapsed_stacks(self, client, admin_key):
+        """Profile endpoint should return collapsed-stack text."""
+        response = client.get(
+            "/admin/profile",
+            params={"seconds": 0.2, "interval_ms": 2},
+            headers={"Authorization": f"Bearer {admin_key}"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        for line in response.text.splitlines():
+            assert line.rsplit(" ", 1)[1].isdigit()
+
+    def test_stalls_reports_monitor_state(self, client, admin_key):
+        """Stalls endpoint should report threshold and recorded stalls."""
+        with TestClient(app) as live_client:
+            response = live_client.get("/admin/stalls", headers={"X-Admin-Key": admin_key})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["enabled"] is True
+        assert data["threshold_ms"] == settings.LOOP_STALL_THRESHOLD_MS
+        assert isinstance(data["stalls"], list)
+
+
+class TestBatchEndpoint:
+    """Test the batch replay endpoint."""
+
+    def test_batch_requires_admin(self, client, monkeypatch):
+        """Batch endpoint should be hidden without an admin key."""
+        monkeypatch.setattr(settings, "ADMIN_API_KEY", "")
+        response = client.post("/chat/batch", content=b"")
+        assert response.status_code == 404
+
+    def test_batch_streams_jsonl(self, client, monkeypatch):
+        """Batch replay should stream one line per turn plus a summary."""
+        import json
+
+        monkeypatch.setattr(settings, "ADMIN_API_KEY", "k")
+        conversation = {
+            "id": "c1",
+            "messages": [
+                {"role": "user", "content": "What is Siphio?", "expected_branch": "fast_path"},
+                {"role": "assistant", "content": "We build AI-native apps."},
+                {"role": "user", "content": "phone"},
+            ],
+        }
+        response = client.post(
+            "/chat/batch",
+            content=json.dumps(conversation) + "\n",
+            headers={"X-Admin-Key": "k"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        records = [json.loads(line) for line in response.text.splitlines()]
+        turns = [r for r in records if r["type"] == "turn"]
+        assert turns[0]["branch"] == "fast_path"
+        assert turns[0]["branch_match"] is True
+        assert turns[1]["branch"] == "handoff_offer"
+        assert records[-1] == {**records[-1], "type": "conversation", "turns": 2}
@@ -0,0 +1,82 @@
+"""Tests for the production launcher."""
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from serve import bind_socket
+
+AGENT_DIR = Path(__file__).parent.parent
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(url: str, timeout: float = 30) -> httpx.Response:
+    # /ready stays 503 until the first background probe round has passed
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            response = httpx.get(url, timeout=1)
+            if response.status_code == 200 or time.monotonic() > deadline:
+                return response
+        except httpx.TransportError:
+            if time.monotonic() > deadline:
+                raise
+        time.sleep(0.1)
+
+
+class TestBindSocket:
+    """Test the shared listening socket."""
+
+    def test_socket_is_inheritable(self):
+        """Workers inherit the parent's socket across fork."""
+        sock = bind_socket("127.0.0.1", 0)
+        try:
+            assert sock.get_inheritable()
+            assert sock.getsockname()[1] > 0
+        finally:
+            sock.close()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="prefork needs os.fork")
+class TestServe:
+    """End-to-end launcher behaviour."""
+
+    def test_workers_serve_and_drain_on_sigterm(self):
+        """Workers should become ready, then exit cleanly on SIGTERM."""
+        port = _free_port()
+        env = {**os.environ, "OPENROUTER_API_KEY": os.environ.get("OPENROUTER_API_KEY", "x")}
+        proc = subprocess.Popen(
+            [sys.executable, "serve.py", "--workers", "2", "--host", "127.0.0.1", "--port", str(port)],
+            cwd=AGENT_DIR,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        )
+        try:
+            response = _wait_ready(f"http://127.0.0.1:{port}/ready")
+            assert response.status_code == 200
+            assert response.json() == {"status": "ready"}
+
+            proc.send_signal(signal.SIGTERM)
+            output, _ = proc.communicate(timeout=30)
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+
+        assert proc.returncode == 0
+        assert "2 workers" in output
+        assert "all workers stopped" in output
@@ -0,0 +1,64 @@
+"""Import-time budget for the agent process.
+
+Cold starts and scale-out pay for everything main imports. Heavy modules
+(pydantic-ai and the OpenAI SDK, postgrest, rapidfuzz) must be loaded
+lazily or in the lifespan hook, never at import time.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+AGENT_DIR = Path(__file__).parent.parent
+
+# Budget for what `import main` costs beyond FastAPI itself, as a multiple
+# of FastAPI's own import time in the same run, so slower machines scale
+# both sides. The app adds about 0.65x today; the eager agent build alone
+# used to add ~1.4s (about 3x).
+APP_IMPORT_BUDGET_RATIO = 1.0
+
+LAZY_MODULES = ("pydantic_ai", "openai", "postgrest", "rapidfuzz")
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "OPENROUTER_API_KEY": os.environ.get("OPENROUTER_API_KEY", "x")}
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=AGENT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _cumulative_us(importtime_log: str, module: str) -> int:
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|").split("|"))
+        if name == module:
+            return int(cumulative_us)
+    raise AssertionError(f"{module} not found in importtime output")
+
+
+class TestStartupImports:
+    """Guard the cost of importing the app."""
+
+    def test_heavy_modules_not_imported(self):
+        """Importing main must not pull in the model SDKs, database client or fuzzy matcher."""
+        result = _run(
+            "import sys, main; "
+            f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+        )
+        assert result.stdout.strip() == ""
+
+    def test_import_time_budget(self):
+        """`import main` should add at most APP_IMPORT_BUDGET_RATIO x FastAPI's import time."""
+        result = _run("import main", "-X", "importtime")
+        fastapi_ms = _cumulative_us(result.stderr, "fastapi") / 1000
+        app_ms = _cumulative_us(result.stderr, "main") / 1000 - fastapi_ms
+        assert app_ms < APP_IMPORT_BUDGET_RATIO * fastapi_ms, (
+            f"import main added {app_ms:.0f}ms on top of fastapi's {fastapi_ms:.0f}ms"
+        )
@@ -3,6 +3,26 @@ import type { ChatRequest, ChatResponse, ChatAPIResponse } from "@/types/chat";
 
 const AGENT_API_URL = process.env.AGENT_API_URL || "http://localhost:8000";
 
+// HttpOnly cookie holding the agent-signed session id
+const SESSION_COOKIE = "siphio_agent_session";
+
+/**
+ * Client IP as seen by the edge in front of this app.
+ *
+ * x-real-ip is set (and overwritten) by the hosting platform. Otherwise the
+ * rightmost x-forwarded-for entry is the one our own reverse proxy appended;
+ * anything to its left was supplied by the client and is not trusted.
+ */
+function clientIp(request: NextRequest): string | null {
+  const realIp = request.headers.get("x-real-ip")?.trim();
+  if (realIp) return realIp;
+  const hops = (request.headers.get("x-forwarded-for") ?? "")
+    .split(",")
+    .map((hop) => hop.trim())
+    .filter(Boolean);
+  return hops.length > 0 ? hops[hops.length - 1] : null;
+}
+
 export async function POST(request: NextRequest): Promise<NextResponse<ChatAPIResponse>> {
   try {
     const body: ChatRequest = await request.json();
@@ -22,15 +42,21 @@ export async function POST(request: NextRequest): Promise<NextResponse<ChatAPIRe
       );
     }
 
+    // Lets the agent rate-limit per visitor instead of per proxy
+    const headers: Record<string, string> = { "Content-Type": "application/json" };
+    const ip = clientIp(request);
+    if (ip) headers["X-Forwarded-For"] = ip;
+    const session = request.cookies.get(SESSION_COOKIE)?.value;
+    if (session) headers["X-Session-Id"] = session;
+
     // Forward request to Python agent
     const agentResponse = await fetch(`${AGENT_API_URL}/chat`, {
       method: "POST",
-      headers: {
-        "Content-Type": "application/json",
-      },
+      headers,
       body: JSON.stringify({
         message: body.message,
         conversation_history: body.conversation_history || [],
+        app_state: body.app_state ?? null,
       }),
     });
 
@@ -54,10 +80,25 @@ export async function POST(request: NextRequest): Promise<NextResponse<ChatAPIRe
 
     const data: ChatResponse = await agentResponse.json();
 
-    return NextResponse.json({
+    const response = NextResponse.json({
       success: true,
-      data,
+      // app_state goes back to the client to send with its next turn
+      data: { ...data, app_state: data.app_state ?? null },
     });
+
+    // The agent issues a signed session id to visitors without a valid one
+    const issuedSession = agentResponse.headers.get("x-session-id");
+    if (issuedSession) {
+      response.cookies.set(SESSION_COOKIE, issuedSession, {
+        httpOnly: true,
+        sameSite: "lax",
+        secure: process.env.NODE_ENV === "production",
+        maxAge: 24 * 60 * 60,
+        path: "/api",
+      });
+    }
+
+    return response;
   } catch (error) {
     console.error("Chat API error:", error);
 
@@ -37,12 +37,17 @@ export async function POST(request: NextRequest): Promise<NextResponse<LeadCaptu
       );
     }
 
-    // Forward to Python agent's lead capture
+    // Forward to Python agent's lead capture. The idempotency key lets the
+    // agent answer retried submissions without saving the lead twice.
+    const headers: Record<string, string> = { "Content-Type": "application/json" };
+    const idempotencyKey = request.headers.get("idempotency-key");
+    if (idempotencyKey) {
+      headers["Idempotency-Key"] = idempotencyKey;
+    }
+
     const agentResponse = await fetch(`${AGENT_API_URL}/lead`, {
       method: "POST",
-      headers: {
-        "Content-Type": "application/json",
-      },
+      headers,
       body: JSON.stringify({
         name: body.name.trim(),
         email: body.email.trim(),
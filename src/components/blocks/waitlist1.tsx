@@ -7,6 +7,7 @@ import { cn } from "@/lib/utils";
 import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
 import type {
+  AppBuildingState,
   MessageHistoryItem,
   ChatSession,
   ChatAPIResponse,
@@ -135,6 +136,8 @@ const Waitlist1 = ({ className }: Waitlist1Props) => {
   const [sessionId, setSessionId] = useState<string>("");
   const [tokensUsed, setTokensUsed] = useState(0);
   const [error, setError] = useState<string | null>(null);
+  // App-building state from the agent's last response, sent back with the next turn
+  const [appState, setAppState] = useState<AppBuildingState | null>(null);
 
   // Lead form state
   const [showLeadForm, setShowLeadForm] = useState(false);
@@ -146,6 +149,8 @@ const Waitlist1 = ({ className }: Waitlist1Props) => {
 
   // Refs for scrolling
   const chatContainerRef = useRef<HTMLDivElement>(null);
+  // One key per lead form, so double clicks and retries save a single lead
+  const leadIdempotencyKey = useRef<string | null>(null);
   const sectionRef = useRef<HTMLElement>(null);
 
   // Load session from localStorage on mount
@@ -160,6 +165,7 @@ const Waitlist1 = ({ className }: Waitlist1Props) => {
         if (sessionAge < maxAge) {
           setSessionId(session.session_id);
           setTokensUsed(session.tokens_used);
+          setAppState(session.app_state ?? null);
           setMessages(
             session.messages.map((msg) => ({
               role: msg.role === "assistant" ? "ai" : "user",
@@ -184,6 +190,7 @@ const Waitlist1 = ({ className }: Waitlist1Props) => {
       messages: toApiFormat(messages),
       tokens_used: tokensUsed,
       created_at: new Date().toISOString(),
+      app_state: appState,
     };
 
     try {
@@ -191,7 +198,7 @@ const Waitlist1 = ({ className }: Waitlist1Props) => {
     } catch (e) {
       console.error("Failed to save chat session:", e);
     }
-  }, [sessionId, messages, tokensUsed]);
+  }, [sessionId, messages, tokensUsed, appState]);
 
   // Auto-scroll to the bottom of chat container
   useEffect(() => {
@@ -263,6 +270,7 @@ const Waitlist1 = ({ className }: Waitlist1Props) => {
         body: JSON.stringify({
           message: userMessage,
           conversation_history: toApiFormat(newMessages.slice(0, -1)),
+          app_state: appState,
         }),
       });
 
@@ -274,6 +282,7 @@ const Waitlist1 = ({ className }: Waitlist1Props) => {
 
       setMessages([...newMessages, { role: "ai", content: result.data.response }]);
       setTokensUsed((prev) => prev + result.data!.tokens_used);
+      setAppState(result.data.app_state ?? null);
 
       // Check if agent is offering handoff
       if (result.data.handoff_ready && result.data.handoff_summary) {
@@ -287,7 +296,7 @@ const Waitlist1 = ({ className }: Waitlist1Props) => {
     } finally {
       setIsTyping(false);
     }
-  }, [inputValue, isTyping, messages, tokensUsed, awaitingHandoffResponse, pendingSummary]);
+  }, [inputValue, isTyping, messages, tokensUsed, appState, awaitingHandoffResponse, pendingSummary]);
 
   const handleKeyPress = (e: React.KeyboardEvent) => {
     if (e.key === "Enter" && !e.shiftKey) {
@@ -298,12 +307,16 @@ const Waitlist1 = ({ className }: Waitlist1Props) => {
 
   const handleLeadSubmit = async (data: LeadFormData) => {
     setIsSubmittingLead(true);
+    leadIdempotencyKey.current ??= crypto.randomUUID();
 
     try {
       // Call the lead capture endpoint
       const response = await fetch("/api/lead", {
         method: "POST",
-        headers: { "Content-Type": "application/json" },
+        headers: {
+          "Content-Type": "application/json",
+          "Idempotency-Key": leadIdempotencyKey.current,
+        },
         body: JSON.stringify({
           name: data.name,
           email: data.email,
@@ -327,6 +340,7 @@ const Waitlist1 = ({ className }: Waitlist1Props) => {
       // Reset form state
       setShowLeadForm(false);
       setPendingSummary(null);
+      leadIdempotencyKey.current = null;
     } catch (e) {
       console.error("Lead capture error:", e);
       setError(e instanceof Error ? e.message : "Failed to submit. Please try again.");
@@ -337,6 +351,7 @@ const Waitlist1 = ({ className }: Waitlist1Props) => {
 
   const handleLeadCancel = () => {
     setShowLeadForm(false);
+    leadIdempotencyKey.current = null;
     // Add a message saying they declined
     setMessages(prev => [...prev, {
       role: "ai",
@@ -348,6 +363,7 @@ const Waitlist1 = ({ className }: Waitlist1Props) => {
     localStorage.removeItem(STORAGE_KEY);
     setMessages([]);
     setTokensUsed(0);
+    setAppState(null);
     setSessionId(generateSessionId());
     setError(null);
     setShowLeadForm(false);
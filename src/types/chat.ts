@@ -8,9 +8,24 @@ export interface MessageHistoryItem {
   content: string;
 }
 
+// App-building progress; the agent returns it with each response and
+// reads it back on the next turn instead of re-deriving it from history
+export interface AppBuildingState {
+  phase:
+    | "collecting_type"
+    | "collecting_features"
+    | "collecting_platform"
+    | "awaiting_confirmation"
+    | "handed_off";
+  app_type: string;
+  features: string;
+  platform: string;
+}
+
 export interface ChatRequest {
   message: string;
   conversation_history: MessageHistoryItem[];
+  app_state?: AppBuildingState | null;
 }
 
 export interface ChatResponse {
@@ -21,6 +36,7 @@ export interface ChatResponse {
   // Handoff fields - when agent is ready to pass to team
   handoff_ready: boolean;
   handoff_summary: string | null;
+  app_state: AppBuildingState | null;
 }
 
 export interface ChatAPIResponse {
@@ -34,6 +50,7 @@ export interface ChatSession {
   messages: MessageHistoryItem[];
   tokens_used: number;
   created_at: string;
+  app_state?: AppBuildingState | null;
 }
 
 // Lead form data for handoff
@@ -0,0 +1,32 @@
+-- Create conversations table for chat transcripts (one row per turn)
+CREATE TABLE conversations (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    -- HMAC of the agent's rate-limit key (TRANSCRIPT_HASH_KEY); never a raw IP or session id
+    client_id TEXT NOT NULL,
+    conversation_id TEXT,
+    transport TEXT NOT NULL DEFAULT 'http' CHECK (transport IN ('http', 'ws')),
+    message TEXT NOT NULL,
+    response TEXT NOT NULL,
+    branch TEXT NOT NULL,
+    tools_called TEXT[] NOT NULL DEFAULT '{}',
+    tokens_used INTEGER NOT NULL DEFAULT 0,
+    cached_tokens INTEGER NOT NULL DEFAULT 0,
+    latency_ms DOUBLE PRECISION NOT NULL DEFAULT 0,
+    handoff_ready BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Enable Row Level Security
+ALTER TABLE conversations ENABLE ROW LEVEL SECURITY;
+
+-- Create policy for service role (agent backend)
+CREATE POLICY "Service role can do everything" ON conversations
+    FOR ALL
+    USING (true)
+    WITH CHECK (true);
+
+-- Index for reading one visitor's turns in order
+CREATE INDEX idx_conversations_client_created ON conversations (client_id, created_at DESC);
+
+-- Rows are append-only in time order, so a BRIN index covers time-range scans cheaply
+CREATE INDEX idx_conversations_created_brin ON conversations USING BRIN (created_at);
@@ -0,0 +1,19 @@
+-- Normalized email for duplicate checks. PostgREST can only filter on
+-- columns, so the lower(btrim(email)) expression is materialized as a
+-- generated column and indexed together with created_at.
+ALTER TABLE leads
+    ADD COLUMN email_normalized TEXT GENERATED ALWAYS AS (lower(btrim(email))) STORED;
+
+CREATE INDEX idx_leads_email_normalized_created ON leads (email_normalized, created_at DESC);
+
+-- Superseded by idx_leads_email_normalized_created
+DROP INDEX idx_leads_email_created;
+
+-- Leads are inserted in created_at order, so a BRIN index covers
+-- time-range scans (dedup window, archival) at a fraction of a B-tree's size
+CREATE INDEX idx_leads_created_brin ON leads USING BRIN (created_at);
+
+-- Reference ids are handed to users and must resolve to one lead. Rows
+-- from before reference_id existed are NULL and stay out of the index.
+DROP INDEX idx_leads_reference_id;
+CREATE UNIQUE INDEX idx_leads_reference_id ON leads (reference_id) WHERE reference_id IS NOT NULL;
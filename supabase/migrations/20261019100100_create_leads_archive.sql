@@ -0,0 +1,86 @@
+-- Archive for leads past the retention window, partitioned by month of
+-- created_at so old months can be detached or dropped without a scan.
+CREATE TABLE leads_archive (
+    id UUID NOT NULL,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    conversation_summary TEXT NOT NULL,
+    inquiry_type TEXT NOT NULL,
+    is_duplicate BOOLEAN DEFAULT FALSE,
+    reference_id TEXT,
+    created_at TIMESTAMPTZ NOT NULL,
+    archived_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+-- Enable Row Level Security
+ALTER TABLE leads_archive ENABLE ROW LEVEL SECURITY;
+
+-- Create policy for service role (agent backend)
+CREATE POLICY "Service role can do everything" ON leads_archive
+    FOR ALL
+    USING (true)
+    WITH CHECK (true);
+
+-- Reference lookups still work for archived leads
+CREATE INDEX idx_leads_archive_reference_id ON leads_archive (reference_id);
+
+-- Create the monthly partition holding p_month (idempotent)
+CREATE OR REPLACE FUNCTION ensure_leads_archive_partition(p_month TIMESTAMPTZ)
+RETURNS TEXT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    month_start TIMESTAMPTZ := date_trunc('month', p_month);
+    partition_name TEXT := 'leads_archive_' || to_char(month_start, 'YYYY_MM');
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF leads_archive FOR VALUES FROM (%L) TO (%L)',
+        partition_name, month_start, month_start + INTERVAL '1 month'
+    );
+    RETURN partition_name;
+END;
+$$;
+
+-- Move up to p_batch_size leads older than p_retention_days into the
+-- archive; returns the number moved. Call repeatedly until it returns 0.
+CREATE OR REPLACE FUNCTION archive_leads(p_retention_days INTEGER DEFAULT 365, p_batch_size INTEGER DEFAULT 5000)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    cutoff TIMESTAMPTZ := NOW() - make_interval(days => p_retention_days);
+    batch_month TIMESTAMPTZ;
+    moved INTEGER;
+BEGIN
+    CREATE TEMP TABLE archive_batch AS
+        SELECT id FROM leads
+        WHERE created_at < cutoff
+        ORDER BY created_at
+        LIMIT p_batch_size
+        FOR UPDATE SKIP LOCKED;
+
+    FOR batch_month IN
+        SELECT DISTINCT date_trunc('month', l.created_at)
+        FROM leads l JOIN archive_batch b ON b.id = l.id
+    LOOP
+        PERFORM ensure_leads_archive_partition(batch_month);
+    END LOOP;
+
+    WITH moved_rows AS (
+        DELETE FROM leads l
+        USING archive_batch b
+        WHERE l.id = b.id
+        RETURNING l.id, l.name, l.email, l.conversation_summary, l.inquiry_type,
+                  l.is_duplicate, l.reference_id, l.created_at
+    )
+    INSERT INTO leads_archive (id, name, email, conversation_summary, inquiry_type,
+                               is_duplicate, reference_id, created_at)
+    SELECT * FROM moved_rows;
+
+    GET DIAGNOSTICS moved = ROW_COUNT;
+    DROP TABLE archive_batch;
+    RETURN moved;
+END;
+$$;